@@ -204,7 +204,7 @@ AUTH_USER_MODEL = 'users.User'
 # Django REST Framework
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'platzigram_api.utils.jwt.CachedJWTAuthentication',
     )
 }
 
@@ -235,3 +235,39 @@ SIMPLE_JWT = {
     'SLIDING_TOKEN_LIFETIME': timedelta(minutes=5),
     'SLIDING_TOKEN_REFRESH_LIFETIME': timedelta(days=1),
 }
+
+
+# JWT revocation index
+# ------------------------------------------------------------------------------
+# Bloom filter of blacklisted tokens, see platzigram_api.utils.jwt
+JWT_REVOCATION_INDEX = {
+    'CAPACITY': 10000000,
+    'ERROR_RATE': 0.01,
+    'MAX_DELTAS': 1000,
+    'DELTA_TIMEOUT': 60 * 60 * 24,
+    'BACKGROUND_REBUILD': True,
+}
+
+# User cache
+# ------------------------------------------------------------------------------
+# Authenticated users, see platzigram_api.utils.cache
+USER_CACHE = {
+    'TIMEOUT': 60 * 60,
+    'LRU_SIZE': 10000,
+}
+
+# Follow graph cache
+# ------------------------------------------------------------------------------
+# Sets of followers and followings of the hot profiles, see platzigram_api.users.graph
+FOLLOW_GRAPH = {
+    'BACKEND': 'platzigram_api.users.graph.LocMemFollowGraphBackend',
+    'TIMEOUT': 60 * 60,
+    'LOAD_THRESHOLD': 1000,
+}
+
+# Response cache
+# ------------------------------------------------------------------------------
+# Rendered user and profile reads, see platzigram_api.utils.cache
+RESPONSE_CACHE = {
+    'TIMEOUT': 60 * 5,
+}
@@ -29,6 +29,21 @@ CACHES = {
     }
 }
 
+# Follow graph cache
+# ------------------------------------------------------------------------------
+FOLLOW_GRAPH = {
+    "BACKEND": "platzigram_api.users.graph.RedisFollowGraphBackend",
+    "TIMEOUT": env.int("FOLLOW_GRAPH_TIMEOUT", default=60 * 60),
+    "LOAD_THRESHOLD": env.int("FOLLOW_GRAPH_LOAD_THRESHOLD", default=1000),
+    "CACHE_ALIAS": "default",
+}
+
+# Response cache
+# ------------------------------------------------------------------------------
+RESPONSE_CACHE = {
+    "TIMEOUT": env.int("RESPONSE_CACHE_TIMEOUT", default=60 * 5),
+}
+
 # SECURITY
 # ------------------------------------------------------------------------------
 # https://docs.djangoproject.com/en/dev/ref/settings/#secure-proxy-ssl-header
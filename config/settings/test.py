@@ -56,5 +56,10 @@ EMAIL_HOST = "localhost"
 # https://docs.djangoproject.com/en/dev/ref/settings/#email-port
 EMAIL_PORT = 1025
 
+# JWT revocation index
+# ------------------------------------------------------------------------------
+JWT_REVOCATION_INDEX["CAPACITY"] = 10000  # noqa F405
+JWT_REVOCATION_INDEX["BACKGROUND_REBUILD"] = False  # noqa F405
+
 # Your stuff...
 # ------------------------------------------------------------------------------
@@ -13,3 +13,9 @@ class UserAppConfig(AppConfig):
 
     name = 'platzigram_api.users'
     verbose_name = 'Users'
+
+    def ready(self):
+        """Connects the receivers that live outside of the models modules."""
+
+        # Follow graph cache write through.
+        from platzigram_api.users import graph  # noqa F401
@@ -0,0 +1,575 @@
+"""Follow graph cache.
+
+Mirrors the followers and following sets of the profiles being read
+into the cache as sets of profile pks, so membership checks, counts
+and intersections are answered without touching the database.
+
+Sets are loaded from the database the first time they are needed
+and expire after FOLLOW_GRAPH['TIMEOUT'] seconds, so only hot
+profiles stay mirrored. Requests only load the sets of profiles with
+at least FOLLOW_GRAPH['LOAD_THRESHOLD'] members, smaller sets that
+are not mirrored are answered by a single indexed query instead. Profile.follow and Profile.unfollow write
+through to the sets that are already loaded once their transaction
+commits. Every write bumps the version of the set, and a load that
+sees the version change while it reads the database is discarded,
+so writes landing during a load are never lost.
+"""
+
+# Django
+from django.conf import settings
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+# Models
+from platzigram_api.users.models import Follow
+
+# Signals
+from django.dispatch import receiver
+from platzigram_api.users.signals import (
+    follows_created,
+    follows_deleted
+)
+
+# Utilities
+from redis.exceptions import RedisError
+import threading
+import time
+import uuid
+
+
+class RedisFollowGraphBackend:
+    """Stores the sets on the redis server of a django_redis cache.
+
+    Every set holds a sentinel member besides the profile pks,
+    so a loaded empty set still exists and a missing key always
+    means that the set is not mirrored. Redis errors are ignored
+    as the cache does, answering as if the set was not mirrored.
+    """
+
+    SENTINEL = '0'
+    LOAD_CHUNK_SIZE = 10000
+
+    # Bumps the version of a set and runs sadd or srem on it only if it
+    # is loaded, adding to a missing key would create a partial set.
+    WRITE_SCRIPT = """
+        redis.call('incr', KEYS[2])
+        redis.call('expire', KEYS[2], ARGV[1])
+        if redis.call('exists', KEYS[1]) == 1 then
+            return redis.call(ARGV[2], KEYS[1], unpack(ARGV, 3))
+        end
+        return 0
+    """
+
+    # Moves a loaded set in place only if no write bumped its version
+    # since the load started, otherwise the load is discarded.
+    SWAP_SCRIPT = """
+        if (redis.call('get', KEYS[3]) or '') == ARGV[1] then
+            redis.call('rename', KEYS[1], KEYS[2])
+            redis.call('expire', KEYS[2], ARGV[2])
+            return 1
+        end
+        redis.call('del', KEYS[1])
+        return 0
+    """
+
+    def __init__(self, cache_alias='default', key_prefix='follow-graph'):
+        """Sets the cache whose redis connection is used."""
+
+        self.cache_alias = cache_alias
+        self.key_prefix = key_prefix
+        self._write = None
+        self._swap = None
+
+    @property
+    def client(self):
+        """Returns the raw redis client of the cache."""
+
+        from django_redis import get_redis_connection
+
+        return get_redis_connection(self.cache_alias)
+
+    def make_key(self, key):
+        """Returns the redis key of a set."""
+
+        return f'{self.key_prefix}:{key}'
+
+    def make_version_key(self, key):
+        """Returns the redis key of the version of a set."""
+
+        return f'{self.key_prefix}:{key}:version'
+
+    def get_scripts(self, client) -> 'tuple':
+        """Returns the write and swap scripts, registering them the first time."""
+
+        if self._write is None:
+            self._write = client.register_script(self.WRITE_SCRIPT)
+            self._swap = client.register_script(self.SWAP_SCRIPT)
+
+        return self._write, self._swap
+
+    def load(self, key, members, timeout) -> 'None':
+        """Replaces a set with the given members.
+
+        Members are written to a temporary key in chunks, which
+        expires even if the load fails, and then swapped in only if
+        the set was not written meanwhile, so readers never see a
+        partially loaded or an outdated set.
+        """
+
+        version_key = self.make_version_key(key)
+        key = self.make_key(key)
+        loading_key = f'{key}:loading:{uuid.uuid4().hex}'
+
+        try:
+            client = self.client
+            _, swap = self.get_scripts(client)
+
+            version = client.get(version_key)
+            version = version.decode() if version is not None else ''
+
+            pipeline = client.pipeline()
+            pipeline.sadd(loading_key, self.SENTINEL)
+            pipeline.expire(loading_key, timeout)
+            pipeline.execute()
+
+            chunk = []
+            for member in members:
+                chunk.append(member)
+
+                if len(chunk) == self.LOAD_CHUNK_SIZE:
+                    client.sadd(loading_key, *chunk)
+                    chunk = []
+
+            if chunk:
+                client.sadd(loading_key, *chunk)
+
+            swap(keys=[loading_key, key, version_key], args=[version, timeout], client=client)
+        except RedisError:
+            pass
+
+    def write(self, command, members_by_key, timeout) -> 'None':
+        """Runs command with its members on every loaded set in a single round trip."""
+
+        try:
+            client = self.client
+            write, _ = self.get_scripts(client)
+
+            pipeline = client.pipeline(transaction=False)
+            for key, members in members_by_key.items():
+                if members:
+                    write(
+                        keys=[self.make_key(key), self.make_version_key(key)],
+                        args=[timeout, command, *members],
+                        client=pipeline
+                    )
+
+            pipeline.execute()
+        except RedisError:
+            pass
+
+    def add(self, members_by_key, timeout) -> 'None':
+        """Adds members to the sets that are loaded."""
+
+        self.write('sadd', members_by_key, timeout)
+
+    def remove(self, members_by_key, timeout) -> 'None':
+        """Removes members from the sets that are loaded."""
+
+        self.write('srem', members_by_key, timeout)
+
+    def is_member(self, key, member) -> 'bool':
+        """Returns if member is in the set or None if the set is not loaded."""
+
+        members = self.members_in(key, [member])
+
+        return None if members is None else member in members
+
+    def members_in(self, key, members) -> 'set':
+        """Returns which of members are in the set or None if the set is not loaded."""
+
+        key = self.make_key(key)
+        members = list(members)
+
+        try:
+            pipeline = self.client.pipeline()
+            pipeline.exists(key)
+            for member in members:
+                pipeline.sismember(key, member)
+            exists, *are_members = pipeline.execute()
+        except RedisError:
+            return None
+
+        if not exists:
+            return None
+
+        return {member for member, is_member in zip(members, are_members) if is_member}
+
+    def count(self, key) -> 'int':
+        """Returns the number of members of the set or None if it is not loaded."""
+
+        try:
+            count = self.client.scard(self.make_key(key))
+        except RedisError:
+            return None
+
+        return count - 1 if count else None
+
+    def intersection(self, key, other_key) -> 'set':
+        """Returns the members of both sets or None if any of them is not loaded."""
+
+        key = self.make_key(key)
+        other_key = self.make_key(other_key)
+
+        try:
+            pipeline = self.client.pipeline()
+            pipeline.exists(key)
+            pipeline.exists(other_key)
+            pipeline.sinter(key, other_key)
+            exists, other_exists, members = pipeline.execute()
+        except RedisError:
+            return None
+
+        if not (exists and other_exists):
+            return None
+
+        return {int(member) for member in members if member.decode() != self.SENTINEL}
+
+
+class LocMemFollowGraphBackend:
+    """Stores the sets on the memory of the current process.
+
+    Stand in for the redis backend on development and tests,
+    where the cache is not a redis server.
+    """
+
+    def __init__(self, **kwargs):
+        """Sets the storage of the sets."""
+
+        self._sets = {}
+        self._versions = {}
+        self._lock = threading.Lock()
+
+    def _get(self, key):
+        """Returns the set stored on key if it has not expired."""
+
+        members, expires_at = self._sets.get(key, (None, 0))
+
+        if members is not None and expires_at < time.time():
+            del self._sets[key]
+            return None
+
+        return members
+
+    def load(self, key, members, timeout) -> 'None':
+        """Replaces a set with the given members unless it was written meanwhile."""
+
+        with self._lock:
+            version = self._versions.get(key, 0)
+
+        members = {int(member) for member in members}
+
+        with self._lock:
+            if self._versions.get(key, 0) == version:
+                self._sets[key] = (members, time.time() + timeout)
+
+    def add(self, members_by_key, timeout) -> 'None':
+        """Adds members to the sets that are loaded."""
+
+        with self._lock:
+            for key, members in members_by_key.items():
+                self._versions[key] = self._versions.get(key, 0) + 1
+
+                loaded = self._get(key)
+                if loaded is not None:
+                    loaded.update(members)
+
+    def remove(self, members_by_key, timeout) -> 'None':
+        """Removes members from the sets that are loaded."""
+
+        with self._lock:
+            for key, members in members_by_key.items():
+                self._versions[key] = self._versions.get(key, 0) + 1
+
+                loaded = self._get(key)
+                if loaded is not None:
+                    loaded.difference_update(members)
+
+    def is_member(self, key, member) -> 'bool':
+        """Returns if member is in the set or None if the set is not loaded."""
+
+        with self._lock:
+            loaded = self._get(key)
+
+        return None if loaded is None else member in loaded
+
+    def members_in(self, key, members) -> 'set':
+        """Returns which of members are in the set or None if the set is not loaded."""
+
+        with self._lock:
+            loaded = self._get(key)
+
+        return None if loaded is None else loaded & set(members)
+
+    def count(self, key) -> 'int':
+        """Returns the number of members of the set or None if it is not loaded."""
+
+        with self._lock:
+            loaded = self._get(key)
+
+        return None if loaded is None else len(loaded)
+
+    def intersection(self, key, other_key) -> 'set':
+        """Returns the members of both sets or None if any of them is not loaded."""
+
+        with self._lock:
+            loaded = self._get(key)
+            other_loaded = self._get(other_key)
+
+        if loaded is None or other_loaded is None:
+            return None
+
+        return loaded & other_loaded
+
+    def clear(self) -> 'None':
+        """Drops every set."""
+
+        with self._lock:
+            self._sets.clear()
+            self._versions.clear()
+
+
+class FollowGraph:
+    """Follow graph served from the cache.
+
+    Answers questions about the follow edges loading the needed
+    sets from the database only when they are not mirrored.
+    """
+
+    def __init__(self, backend, timeout, load_threshold=0):
+        """Sets the backend where sets are stored, for how long and the size from which requests load them."""
+
+        self.backend = backend
+        self.timeout = timeout
+        self.load_threshold = load_threshold
+
+    @staticmethod
+    def followers_key(profile_pk):
+        """Returns the key of the set of profiles following a profile."""
+
+        return f'followers:{profile_pk}'
+
+    @staticmethod
+    def following_key(profile_pk):
+        """Returns the key of the set of profiles a profile follows."""
+
+        return f'following:{profile_pk}'
+
+    def load_followers(self, profile_pk) -> 'None':
+        """Mirrors the followers of a profile from the database."""
+
+        self.backend.load(
+            self.followers_key(profile_pk),
+            Follow.objects.filter(followee_id=profile_pk).order_by().values_list('follower_id', flat=True).iterator(),
+            self.timeout
+        )
+
+    def load_following(self, profile_pk) -> 'None':
+        """Mirrors the followings of a profile from the database."""
+
+        self.backend.load(
+            self.following_key(profile_pk),
+            Follow.objects.filter(follower_id=profile_pk).order_by().values_list('followee_id', flat=True).iterator(),
+            self.timeout
+        )
+
+    def is_following(self, follower, followee) -> 'bool':
+        """Returns if a profile follows another one.
+
+        If neither set is mirrored, the following set of follower or
+        the followers set of followee is loaded when it is big enough,
+        otherwise the edge is looked up in the database.
+        """
+
+        is_following = self.backend.is_member(self.following_key(follower.pk), followee.pk)
+
+        if is_following is None:
+            is_following = self.backend.is_member(self.followers_key(followee.pk), follower.pk)
+
+        if is_following is None and follower.following_count >= self.load_threshold:
+            self.load_following(follower.pk)
+            is_following = self.backend.is_member(self.following_key(follower.pk), followee.pk)
+
+        if is_following is None and followee.followers_count >= self.load_threshold:
+            self.load_followers(followee.pk)
+            is_following = self.backend.is_member(self.followers_key(followee.pk), follower.pk)
+
+        if is_following is None:
+            is_following = Follow.objects.filter(follower_id=follower.pk, followee_id=followee.pk).exists()
+
+        return is_following
+
+    def relationships(self, profile, other_pks) -> 'dict':
+        """Returns whether a profile follows and is followed by each one of other_pks."""
+
+        other_pks = set(other_pks)
+
+        following = self.members_in(
+            self.following_key(profile.pk),
+            other_pks,
+            self.load_following if profile.following_count >= self.load_threshold else None,
+            profile.pk
+        )
+        if following is None:
+            following = set(
+                Follow.objects.filter(
+                    follower_id=profile.pk,
+                    followee_id__in=other_pks
+                ).values_list('followee_id', flat=True)
+            )
+
+        followed_by = self.members_in(
+            self.followers_key(profile.pk),
+            other_pks,
+            self.load_followers if profile.followers_count >= self.load_threshold else None,
+            profile.pk
+        )
+        if followed_by is None:
+            followed_by = set(
+                Follow.objects.filter(
+                    followee_id=profile.pk,
+                    follower_id__in=other_pks
+                ).values_list('follower_id', flat=True)
+            )
+
+        return {
+            pk: {'following': pk in following, 'followed_by': pk in followed_by}
+            for pk in other_pks
+        }
+
+    def members_in(self, key, members, load, profile_pk) -> 'set':
+        """Returns which of members are in a set, loading it with load if given and it is not mirrored.
+
+        Returns None if the set is not mirrored after all.
+        """
+
+        if not members:
+            return set()
+
+        found = self.backend.members_in(key, members)
+
+        if found is None and load is not None:
+            load(profile_pk)
+            found = self.backend.members_in(key, members)
+
+        return found
+
+    def followers_count(self, profile_pk) -> 'int':
+        """Returns the number of profiles following a profile."""
+
+        count = self.backend.count(self.followers_key(profile_pk))
+
+        if count is None:
+            self.load_followers(profile_pk)
+            count = self.backend.count(self.followers_key(profile_pk))
+
+        if count is None:
+            count = Follow.objects.filter(followee_id=profile_pk).count()
+
+        return count
+
+    def following_count(self, profile_pk) -> 'int':
+        """Returns the number of profiles a profile follows."""
+
+        count = self.backend.count(self.following_key(profile_pk))
+
+        if count is None:
+            self.load_following(profile_pk)
+            count = self.backend.count(self.following_key(profile_pk))
+
+        if count is None:
+            count = Follow.objects.filter(follower_id=profile_pk).count()
+
+        return count
+
+    def followed_by_followings(self, viewer_pk, profile_pk) -> 'set':
+        """Returns the pks of the profiles followed by viewer that follow profile."""
+
+        following_key = self.following_key(viewer_pk)
+        followers_key = self.followers_key(profile_pk)
+
+        pks = self.backend.intersection(following_key, followers_key)
+
+        if pks is None:
+            if self.backend.count(following_key) is None:
+                self.load_following(viewer_pk)
+
+            if self.backend.count(followers_key) is None:
+                self.load_followers(profile_pk)
+
+            pks = self.backend.intersection(following_key, followers_key)
+
+        if pks is None:
+            pks = set(
+                Follow.objects.filter(
+                    followee_id=profile_pk,
+                    follower__follower_edges__follower_id=viewer_pk
+                ).values_list('follower_id', flat=True)
+            )
+
+        return pks
+
+    def add_edges(self, follower_pk, followee_pks) -> 'None':
+        """Writes new edges to the sets that are mirrored."""
+
+        members_by_key = {self.following_key(follower_pk): followee_pks}
+        for followee_pk in followee_pks:
+            members_by_key[self.followers_key(followee_pk)] = [follower_pk]
+
+        self.backend.add(members_by_key, self.timeout)
+
+    def remove_edges(self, follower_pk, followee_pks) -> 'None':
+        """Removes deleted edges from the sets that are mirrored."""
+
+        members_by_key = {self.following_key(follower_pk): followee_pks}
+        for followee_pk in followee_pks:
+            members_by_key[self.followers_key(followee_pk)] = [follower_pk]
+
+        self.backend.remove(members_by_key, self.timeout)
+
+
+def get_follow_graph() -> 'FollowGraph':
+    """Returns a follow graph using the backend set on FOLLOW_GRAPH settings."""
+
+    options = dict(settings.FOLLOW_GRAPH)
+    backend_class = import_string(options.pop('BACKEND'))
+    timeout = options.pop('TIMEOUT')
+    load_threshold = options.pop('LOAD_THRESHOLD', 0)
+
+    return FollowGraph(
+        backend_class(**{key.lower(): value for key, value in options.items()}),
+        timeout,
+        load_threshold
+    )
+
+
+follow_graph = get_follow_graph()
+
+
+@receiver(follows_created)
+def add_follow_graph_edges(sender, **kwargs):
+    """When a profile follows others, writes the new edges to the mirrored sets after commit."""
+
+    follower_pk = kwargs['follower'].pk
+    followee_pks = list(kwargs['followee_pks'])
+
+    transaction.on_commit(lambda: follow_graph.add_edges(follower_pk, followee_pks))
+
+
+@receiver(follows_deleted)
+def remove_follow_graph_edges(sender, **kwargs):
+    """When a profile unfollows others, removes the edges from the mirrored sets after commit."""
+
+    follower_pk = kwargs['follower'].pk
+    followee_pks = list(kwargs['followee_pks'])
+
+    transaction.on_commit(lambda: follow_graph.remove_edges(follower_pk, followee_pks))
@@ -0,0 +1,77 @@
+"""Backfill profiles command."""
+
+# Django
+from django.core.management.base import BaseCommand
+
+# Models
+from platzigram_api.users.models import (
+    Profile,
+    User
+)
+
+
+class Command(BaseCommand):
+    """Creates the profiles of the users that do not have one.
+
+    Users are walked by primary key batches, each batch costs a
+    SELECT for the users missing a profile and a single bulk
+    INSERT, conflicts with profiles created meanwhile are ignored.
+    """
+
+    help = 'Audits the users and creates the missing profiles in batches.'
+
+    def add_arguments(self, parser):
+        """Adds the command arguments."""
+
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of users audited per batch.'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only report the users missing a profile.'
+        )
+
+    def handle(self, *args, **options):
+        """Walks the users table by primary key ranges creating the missing profiles."""
+
+        batch_size = options['batch_size']
+
+        last_pk = 0
+        audited = 0
+        missing = 0
+
+        while True:
+            pks = list(
+                User.objects.filter(pk__gt=last_pk).order_by('pk').values_list('pk', flat=True)[:batch_size]
+            )
+            if not pks:
+                break
+
+            missing_pks = list(
+                User.objects.filter(
+                    pk__gte=pks[0],
+                    pk__lte=pks[-1],
+                    profile__isnull=True
+                ).values_list('pk', flat=True)
+            )
+
+            if missing_pks and not options['dry_run']:
+                Profile.objects.bulk_create(
+                    [Profile(user_id=pk) for pk in missing_pks],
+                    ignore_conflicts=True
+                )
+
+            audited += len(pks)
+            missing += len(missing_pks)
+            last_pk = pks[-1]
+
+            self.stdout.write(f'Audited {audited} users, {missing} without profile.')
+
+        if options['dry_run']:
+            self.stdout.write(self.style.WARNING(f'{missing} of {audited} users do not have a profile.'))
+        else:
+            self.stdout.write(self.style.SUCCESS(f'Created {missing} profiles for {audited} users.'))
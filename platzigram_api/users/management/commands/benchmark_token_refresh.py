@@ -0,0 +1,198 @@
+"""Benchmark token refresh command."""
+
+# Django
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+# Django REST Framework
+from rest_framework.test import APIRequestFactory
+
+# Django REST Framework Simple JWT
+from rest_framework_simplejwt import views as jwt_views
+
+# Models
+from platzigram_api.users.models import User
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken,
+    OutstandingToken
+)
+
+# Views
+from platzigram_api.users.views import TokenRefreshView
+
+# Utilities
+from platzigram_api.utils.jwt import (
+    RevocableRefreshToken,
+    revocation_index
+)
+from datetime import timedelta
+import statistics
+import time
+import uuid
+
+
+class Command(BaseCommand):
+    """Measures the latency of the refresh token endpoint.
+
+    --jtis synthetic tokens are inserted in batches on the outstanding
+    and blacklist tables and the revocation index is rebuilt from
+    them, then the refresh view is called with a valid token, once
+    going through the revocation index and once through the plain
+    simple jwt view, which queries the blacklist table on every
+    request. A refresh token is issued to --username for it.
+
+    The synthetic tokens are already expired, so they are deleted at
+    the end unless --keep is given, and prune_tokens deletes them if
+    the command is interrupted. Since they are written to the
+    configured database, the command refuses to run unless --jtis is
+    given or --database names that database.
+    """
+
+    DEFAULT_JTIS = 10000000
+
+    help = 'Measures the refresh token endpoint latency with a large revocation index.'
+
+    def add_arguments(self, parser):
+        """Adds the command arguments."""
+
+        parser.add_argument(
+            '--username',
+            required=True,
+            help='User the refresh token is issued to.'
+        )
+        parser.add_argument(
+            '--jtis',
+            type=int,
+            help=f'Number of synthetic blacklisted tokens inserted, {self.DEFAULT_JTIS} by default.'
+        )
+        parser.add_argument(
+            '--database',
+            help='Name of the configured database, required to insert the default number of tokens.'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=10000,
+            help='Number of synthetic tokens inserted or deleted per transaction.'
+        )
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=1000,
+            help='Number of refresh requests measured per view.'
+        )
+        parser.add_argument(
+            '--keep',
+            action='store_true',
+            help='Keep the synthetic tokens on the tables when done.'
+        )
+
+    def handle(self, *args, **options):
+        """Fills the tables, builds the index and measures both views."""
+
+        jtis = options['jtis']
+
+        if jtis is None:
+            if options['database'] != connection.settings_dict['NAME']:
+                raise CommandError(
+                    f'This inserts {self.DEFAULT_JTIS} tokens on the {connection.settings_dict["NAME"]} database, '
+                    'pass --jtis or confirm the database name with --database.'
+                )
+
+            jtis = self.DEFAULT_JTIS
+
+        try:
+            user = User.objects.get(username=options['username'])
+        except User.DoesNotExist:
+            raise CommandError(f'User {options["username"]} does not exist.')
+
+        token = str(RevocableRefreshToken.for_user(user))
+
+        prefix = f'benchmark-{uuid.uuid4().hex[:8]}-'
+
+        started_at = time.perf_counter()
+        self.insert_tokens(prefix, jtis, options['batch_size'])
+
+        self.stdout.write(
+            f'Inserted {jtis} blacklisted tokens in {time.perf_counter() - started_at:.1f}s.'
+        )
+
+        revocation_index.capacity = max(revocation_index.capacity, BlacklistedToken.objects.count())
+
+        started_at = time.perf_counter()
+        revocation_index.build()
+
+        self.stdout.write(
+            f'Built the revocation index in {time.perf_counter() - started_at:.1f}s '
+            f'({len(revocation_index.bloom.bits) / 2 ** 20:.1f} MiB).'
+        )
+
+        views = [
+            ('revocation index', TokenRefreshView.as_view()),
+            ('blacklist table', jwt_views.TokenRefreshView.as_view()),
+        ]
+
+        for name, view in views:
+            latencies = self.measure(view, token, options['requests'])
+
+            self.stdout.write(
+                f'{name}: mean {statistics.mean(latencies):.3f}ms, '
+                f'p50 {statistics.median(latencies):.3f}ms, '
+                f'p99 {latencies[int(len(latencies) * 0.99) - 1]:.3f}ms'
+            )
+
+        if not options['keep']:
+            self.delete_tokens(prefix, options['batch_size'])
+
+    @staticmethod
+    def insert_tokens(prefix, count, batch_size) -> 'None':
+        """Inserts count expired outstanding tokens whose jti starts with prefix and blacklists them."""
+
+        expires_at = timezone.now() - timedelta(days=1)
+
+        for offset in range(0, count, batch_size):
+            jtis = [f'{prefix}{number}' for number in range(offset, min(offset + batch_size, count))]
+
+            with transaction.atomic():
+                OutstandingToken.objects.bulk_create(
+                    OutstandingToken(jti=jti, token=jti, expires_at=expires_at) for jti in jtis
+                )
+                BlacklistedToken.objects.bulk_create(
+                    BlacklistedToken(token_id=pk)
+                    for pk in OutstandingToken.objects.filter(jti__in=jtis).values_list('pk', flat=True)
+                )
+
+    @staticmethod
+    def delete_tokens(prefix, batch_size) -> 'None':
+        """Deletes the synthetic tokens and their blacklist rows in batches."""
+
+        tokens = OutstandingToken.objects.filter(jti__startswith=prefix)
+
+        while True:
+            pks = list(tokens.order_by('pk').values_list('pk', flat=True)[:batch_size])
+            if not pks:
+                break
+
+            with transaction.atomic():
+                BlacklistedToken.objects.filter(token_id__in=pks).delete()
+                OutstandingToken.objects.filter(pk__in=pks).delete()
+
+    @staticmethod
+    def measure(view, token, requests) -> 'list':
+        """Returns the sorted latencies in milliseconds of refreshing token on view."""
+
+        factory = APIRequestFactory()
+        latencies = []
+
+        for _ in range(requests):
+            request = factory.post('/users/refresh-token/', {'refresh': token}, format='json')
+
+            started_at = time.perf_counter()
+            response = view(request)
+            latencies.append((time.perf_counter() - started_at) * 1000)
+
+            if response.status_code != 200:
+                raise CommandError(f'Refresh failed with status {response.status_code}.')
+
+        return sorted(latencies)
@@ -0,0 +1,79 @@
+"""Benchmark user serializer command."""
+
+# Django
+from django.core.management.base import BaseCommand
+
+# Models
+from platzigram_api.users.models import User
+
+# Serializers
+from platzigram_api.users.serializers import UserModelSerializer
+
+# Utilities
+from platzigram_api.utils.serializers import compile_read_serializer
+import time
+
+
+class Command(BaseCommand):
+    """Measures how many users per second each user serializer represents.
+
+    Users are built in memory, so only the serialization is measured:
+    the model serializer against the compiled read serializer, over
+    model instances and over values() dicts, for single objects and
+    for lists of --list-size users.
+    """
+
+    help = 'Measures the serializations per second of the user serializers.'
+
+    def add_arguments(self, parser):
+        """Adds the command arguments."""
+
+        parser.add_argument(
+            '--single',
+            type=int,
+            default=10000,
+            help='Number of single object serializations measured.'
+        )
+        parser.add_argument(
+            '--list-size',
+            type=int,
+            default=10000,
+            help='Number of users of the serialized list.'
+        )
+
+    def handle(self, *args, **options):
+        """Measures every serializer on single objects and on a list."""
+
+        users = [
+            User(
+                username=f'user{index}',
+                email=f'user{index}@platzigram.com',
+                first_name='Luis',
+                last_name='Perez',
+                phone_number='+1 4687897977854'
+            )
+            for index in range(max(options['single'], options['list_size']))
+        ]
+
+        represent = compile_read_serializer(UserModelSerializer)
+        represent_values = compile_read_serializer(UserModelSerializer, from_values=True)
+        rows = [{path: getattr(user, path) for path in represent_values.source_paths} for user in users]
+
+        single = options['single']
+        list_size = options['list_size']
+
+        benchmarks = [
+            ('model serializer, single', single, lambda: [UserModelSerializer(user).data for user in users[:single]]),
+            ('compiled, single', single, lambda: [represent(user) for user in users[:single]]),
+            ('compiled values, single', single, lambda: [represent_values(row) for row in rows[:single]]),
+            ('model serializer, list', list_size, lambda: UserModelSerializer(users[:list_size], many=True).data),
+            ('compiled, list', list_size, lambda: [represent(user) for user in users[:list_size]]),
+            ('compiled values, list', list_size, lambda: [represent_values(row) for row in rows[:list_size]]),
+        ]
+
+        for name, serializations, benchmark in benchmarks:
+            started_at = time.perf_counter()
+            benchmark()
+            elapsed = time.perf_counter() - started_at
+
+            self.stdout.write(f'{name}: {serializations / elapsed:,.0f} serializations/sec')
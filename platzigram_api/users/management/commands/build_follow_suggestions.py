@@ -0,0 +1,62 @@
+"""Build follow suggestions command."""
+
+# Django
+from django.core.management.base import BaseCommand
+
+# Models
+from platzigram_api.users.models import (
+    FollowSuggestion,
+    Profile
+)
+
+
+class Command(BaseCommand):
+    """Builds the follow suggestions of every profile from scratch.
+
+    Profiles are processed in primary key batches so the two hops
+    join only runs over the edges of a batch at a time, the
+    refresh_follow_suggestions worker keeps them fresh between runs.
+    """
+
+    help = 'Rebuilds the friends of friends follow suggestions of every profile in batches.'
+
+    def add_arguments(self, parser):
+        """Adds the command arguments."""
+
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Number of profiles whose suggestions are built at once.'
+        )
+        parser.add_argument(
+            '--top-k',
+            type=int,
+            default=FollowSuggestion.objects.TOP_K,
+            help='Number of suggestions stored per profile.'
+        )
+
+    def handle(self, *args, **options):
+        """Walks the profiles table by primary key rebuilding its suggestions."""
+
+        batch_size = options['batch_size']
+        top_k = options['top_k']
+
+        last_pk = 0
+        profiles = 0
+        suggestions = 0
+
+        while True:
+            pks = list(
+                Profile.objects.filter(pk__gt=last_pk).order_by('pk').values_list('pk', flat=True)[:batch_size]
+            )
+            if not pks:
+                break
+
+            suggestions += FollowSuggestion.objects.rebuild(pks, top_k)
+            profiles += len(pks)
+            last_pk = pks[-1]
+
+            self.stdout.write(f'Built the suggestions of {profiles} profiles.')
+
+        self.stdout.write(self.style.SUCCESS(f'Stored {suggestions} suggestions for {profiles} profiles.'))
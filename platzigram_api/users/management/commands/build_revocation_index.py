@@ -0,0 +1,35 @@
+"""Build revocation index command."""
+
+# Django
+from django.core.management.base import BaseCommand
+
+# Utilities
+from platzigram_api.utils.jwt import revocation_index
+import time
+
+
+class Command(BaseCommand):
+    """Builds the revocation index snapshot from the blacklist table.
+
+    The snapshot is published on the cache, where the web processes
+    load it instead of reading the table themselves. Running it after
+    deploys and from time to time keeps the snapshot fresh, otherwise
+    the first process to find it missing or too old builds it.
+    """
+
+    help = 'Builds the refresh token revocation index and publishes it on the cache.'
+
+    def handle(self, *args, **options):
+        """Builds and publishes the snapshot."""
+
+        started_at = time.perf_counter()
+        revocation_index.build()
+
+        if revocation_index.bloom is None:
+            self.stderr.write('The cache is unavailable, the snapshot was not published.')
+            return
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Published the revocation index at generation {revocation_index.generation} '
+            f'in {time.perf_counter() - started_at:.1f}s ({len(revocation_index.bloom.bits) / 2 ** 20:.1f} MiB).'
+        ))
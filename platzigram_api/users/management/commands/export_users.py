@@ -0,0 +1,73 @@
+"""Export users command."""
+
+# Django
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import (
+    parse_date,
+    parse_datetime
+)
+
+# Utilities
+from datetime import datetime, time
+
+# Services
+from platzigram_api.users.services import export_users
+
+
+class Command(BaseCommand):
+    """Writes every user with its profile as JSON lines.
+
+    Rows are streamed from a server side cursor straight to the
+    output, so memory stays flat whatever the size of the tables.
+    """
+
+    help = 'Exports the users and its profiles as JSON lines.'
+
+    def add_arguments(self, parser):
+        """Adds the command arguments."""
+
+        parser.add_argument(
+            '--output',
+            help='File the export is written to, stdout by default.'
+        )
+        parser.add_argument(
+            '--since',
+            help='Only export the users updated since this ISO 8601 date or date and time.'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=2000,
+            help='Number of rows fetched from the database at once.'
+        )
+
+    def handle(self, *args, **options):
+        """Streams the export to the output."""
+
+        since = options['since']
+
+        if since is not None:
+            since_date = parse_date(since)
+            since = parse_datetime(since) or (since_date and datetime.combine(since_date, time.min))
+
+            if since is None:
+                raise CommandError('--since must be an ISO 8601 date or date and time.')
+
+            if timezone.is_naive(since):
+                since = timezone.make_aware(since)
+
+        lines = export_users(since=since, chunk_size=options['chunk_size'])
+        exported = 0
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as output:
+                for line in lines:
+                    output.write(line)
+                    exported += 1
+        else:
+            for line in lines:
+                self.stdout.write(line, ending='')
+                exported += 1
+
+        self.stderr.write(self.style.SUCCESS(f'Exported {exported} users.'))
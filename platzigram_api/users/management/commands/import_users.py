@@ -0,0 +1,260 @@
+"""Import users command."""
+
+# Django
+from django.contrib.auth.hashers import make_password
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Q
+
+# Models
+from platzigram_api.users.models import (
+    Profile,
+    User
+)
+
+# Utilities
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+import csv
+import json
+import os
+import time
+
+
+def read_rows(path, input_format):
+    """Yields the rows of a CSV or JSON lines file as dicts."""
+
+    with open(path, newline='', encoding='utf-8') as input_file:
+        if input_format == 'csv':
+            yield from csv.DictReader(input_file)
+        else:
+            for line in input_file:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def chunked(rows, size):
+    """Yields lists of up to size rows."""
+
+    while True:
+        chunk = list(islice(rows, size))
+        if not chunk:
+            return
+
+        yield chunk
+
+
+class Command(BaseCommand):
+    """Imports users and its profiles from a CSV or JSON lines file.
+
+    The file is streamed and handled in chunks: each chunk is
+    validated against the model fields and with a single SELECT
+    for the taken usernames and emails, its passwords are hashed on a
+    process pool and its users and profiles are stored with one
+    bulk INSERT each, so the create_profile receiver never runs.
+    After every chunk the number of rows consumed is written to a
+    checkpoint file, which a failed run resumes from.
+    """
+
+    help = 'Imports users and its profiles from a CSV or JSON lines file in chunks.'
+
+    USER_FIELDS = ('username', 'email', 'first_name', 'last_name', 'phone_number')
+    PROFILE_FIELDS = ('website', 'biography')
+
+    def add_arguments(self, parser):
+        """Adds the command arguments."""
+
+        parser.add_argument(
+            'path',
+            help='CSV or JSON lines file with a row per user.'
+        )
+        parser.add_argument(
+            '--format',
+            choices=['csv', 'jsonl'],
+            help='Format of the file, guessed from its extension by default.'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of rows validated and inserted at once.'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=os.cpu_count(),
+            help='Number of processes hashing passwords, 0 hashes them on this process.'
+        )
+        parser.add_argument(
+            '--checkpoint',
+            help='File where the progress is stored, the path plus .checkpoint by default.'
+        )
+        parser.add_argument(
+            '--restart',
+            action='store_true',
+            help='Ignore the checkpoint and import the file from the start.'
+        )
+
+    def handle(self, *args, **options):
+        """Streams the file importing it chunk by chunk."""
+
+        path = options['path']
+        input_format = options['format'] or ('csv' if path.endswith('.csv') else 'jsonl')
+        checkpoint_path = options['checkpoint'] or f'{path}.checkpoint'
+
+        if not os.path.exists(path):
+            raise CommandError(f'File {path} does not exist.')
+
+        checkpoint = {'position': 0, 'created': 0, 'rejected': 0}
+        if not options['restart'] and os.path.exists(checkpoint_path):
+            with open(checkpoint_path) as checkpoint_file:
+                checkpoint = json.load(checkpoint_file)
+
+            self.stdout.write(f"Resuming after row {checkpoint['position']}.")
+
+        rows = islice(read_rows(path, input_format), checkpoint['position'], None)
+
+        executor = ProcessPoolExecutor(options['workers']) if options['workers'] else None
+        start = time.monotonic()
+        imported = 0
+
+        try:
+            for chunk in chunked(rows, options['batch_size']):
+                users, profiles = self.validate_chunk(chunk, checkpoint['position'])
+                self.hash_passwords(users, executor)
+
+                with transaction.atomic():
+                    self.insert_chunk(users, profiles)
+
+                checkpoint['position'] += len(chunk)
+                checkpoint['created'] += len(users)
+                checkpoint['rejected'] += len(chunk) - len(users)
+                self.save_checkpoint(checkpoint_path, checkpoint)
+
+                imported += len(chunk)
+                rate = int(imported / max(time.monotonic() - start, 1e-6))
+
+                self.stdout.write(
+                    f"Imported {checkpoint['created']} users, rejected {checkpoint['rejected']} "
+                    f'rows ({rate} rows/sec).'
+                )
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        if os.path.exists(checkpoint_path):
+            os.remove(checkpoint_path)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {checkpoint['created']} users, rejected {checkpoint['rejected']} rows."
+        ))
+
+    def validate_chunk(self, chunk, position) -> 'tuple':
+        """Returns the users and profiles of the valid rows of a chunk.
+
+        Rows with invalid fields or whose username or email are taken,
+        either on the database or by a previous row, are reported and
+        skipped. Users keep the plain password until they are hashed.
+        """
+
+        users = []
+        profiles = []
+        candidates = []
+
+        for number, row in enumerate(chunk, start=position + 1):
+            user = User(**{field: row.get(field) or '' for field in self.USER_FIELDS})
+            user.email = User.objects.normalize_email(user.email)
+            user.password = row.get('password') or None
+
+            profile = Profile(**{field: row.get(field) or '' for field in self.PROFILE_FIELDS})
+
+            try:
+                user.clean_fields(exclude=['password'])
+                profile.clean_fields(exclude=['user'])
+            except ValidationError as e:
+                self.reject(number, e.message_dict)
+                continue
+
+            candidates.append((number, user, profile))
+
+        taken_usernames = set()
+        taken_emails = set()
+
+        for username, email in User.objects.filter(
+            Q(username__in=[user.username for _, user, _ in candidates]) |
+            Q(email__in=[user.email for _, user, _ in candidates])
+        ).values_list('username', 'email'):
+            taken_usernames.add(username)
+            taken_emails.add(email)
+
+        for number, user, profile in candidates:
+            errors = {}
+
+            if user.username in taken_usernames:
+                errors['username'] = ['This field must be unique.']
+
+            if user.email in taken_emails:
+                errors['email'] = ['This field must be unique.']
+
+            if errors:
+                self.reject(number, errors)
+                continue
+
+            taken_usernames.add(user.username)
+            taken_emails.add(user.email)
+
+            users.append(user)
+            profiles.append(profile)
+
+        return users, profiles
+
+    @staticmethod
+    def hash_passwords(users, executor) -> 'None':
+        """Replaces the plain passwords of the users with its hashes."""
+
+        passwords = [user.password for user in users]
+
+        if executor is None:
+            hashes = map(make_password, passwords)
+        else:
+            hashes = executor.map(make_password, passwords, chunksize=max(1, len(passwords) // 16))
+
+        for user, password_hash in zip(users, hashes):
+            user.password = password_hash
+
+    @staticmethod
+    def insert_chunk(users, profiles) -> 'None':
+        """Inserts the users and then its profiles."""
+
+        User.objects.bulk_create(users)
+
+        # Only some backends set the pks on bulk_create.
+        if any(user.pk is None for user in users):
+            pks = dict(
+                User.objects.filter(
+                    username__in=[user.username for user in users]
+                ).values_list('username', 'pk')
+            )
+
+            for user in users:
+                user.pk = pks[user.username]
+
+        for user, profile in zip(users, profiles):
+            profile.user_id = user.pk
+
+        Profile.objects.bulk_create(profiles)
+
+    def reject(self, number, errors) -> 'None':
+        """Reports a row that is not imported."""
+
+        self.stderr.write(f'Row {number} rejected: {json.dumps(errors)}')
+
+    @staticmethod
+    def save_checkpoint(path, checkpoint) -> 'None':
+        """Replaces the checkpoint file, never leaving it half written."""
+
+        with open(f'{path}.tmp', 'w') as checkpoint_file:
+            json.dump(checkpoint, checkpoint_file)
+
+        os.replace(f'{path}.tmp', path)
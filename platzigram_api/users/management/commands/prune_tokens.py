@@ -0,0 +1,105 @@
+"""Prune tokens command."""
+
+# Django
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+# Models
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken,
+    OutstandingToken
+)
+
+# Utilities
+import time
+
+
+class Command(BaseCommand):
+    """Deletes the expired outstanding tokens and their blacklist rows.
+
+    The outstanding tokens table is walked by primary key and every
+    batch is deleted on its own short transaction, blacklist rows
+    first, so the command never holds long locks or runs one huge
+    DELETE and can be left running on a live database.
+    """
+
+    help = 'Deletes expired outstanding and blacklisted tokens in batches.'
+
+    def add_arguments(self, parser):
+        """Adds the command arguments."""
+
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of outstanding tokens deleted per transaction.'
+        )
+        parser.add_argument(
+            '--sleep',
+            type=float,
+            default=0.1,
+            help='Seconds to wait between batches.'
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep pruning tokens as they expire instead of exiting when done.'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=3600,
+            help='Seconds to wait between passes over the table when looping.'
+        )
+
+    def handle(self, *args, **options):
+        """Prunes the expired tokens, once or on every interval when looping."""
+
+        while True:
+            self.prune(options['batch_size'], options['sleep'])
+
+            if not options['loop']:
+                break
+
+            time.sleep(options['interval'])
+
+    def prune(self, batch_size, sleep) -> 'None':
+        """Walks the outstanding tokens that expired before now deleting them in batches."""
+
+        expired = OutstandingToken.objects.filter(expires_at__lt=timezone.now())
+
+        last_pk = 0
+        outstanding_deleted = blacklisted_deleted = 0
+        start = time.monotonic()
+
+        while True:
+            pks = list(
+                expired.filter(pk__gt=last_pk).order_by('pk').values_list('pk', flat=True)[:batch_size]
+            )
+            if not pks:
+                break
+
+            with transaction.atomic():
+                blacklisted_deleted += BlacklistedToken.objects.filter(token_id__in=pks).delete()[0]
+                outstanding_deleted += OutstandingToken.objects.filter(pk__in=pks).delete()[0]
+
+            last_pk = pks[-1]
+
+            self.stdout.write(
+                f'Deleted {outstanding_deleted} outstanding and {blacklisted_deleted} blacklisted tokens '
+                f'({self.rate(outstanding_deleted + blacklisted_deleted, start)} rows/sec).'
+            )
+
+            time.sleep(sleep)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Pruned {outstanding_deleted} outstanding and {blacklisted_deleted} blacklisted tokens '
+            f'({self.rate(outstanding_deleted + blacklisted_deleted, start)} rows/sec).'
+        ))
+
+    @staticmethod
+    def rate(rows, start) -> 'int':
+        """Returns the rows processed per second since start."""
+
+        return int(rows / max(time.monotonic() - start, 1e-6))
@@ -0,0 +1,67 @@
+"""Reconcile follow counters command."""
+
+# Django
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, OuterRef, Subquery, IntegerField
+from django.db.models.functions import Coalesce
+
+# Models
+from platzigram_api.users.models import (
+    Follow,
+    Profile
+)
+
+
+class Command(BaseCommand):
+    """Recomputes the denormalized followers and following counters of the profiles.
+
+    Profiles are processed in primary key batches, each batch being
+    a single UPDATE statement, so the command can be run on a live
+    database to repair counters that drifted.
+    """
+
+    help = 'Recomputes followers_count and following_count of every profile in batches.'
+
+    def add_arguments(self, parser):
+        """Adds the command arguments."""
+
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of profiles updated per statement.'
+        )
+
+    def handle(self, *args, **options):
+        """Walks the profiles table by primary key ranges recomputing its counters."""
+
+        batch_size = options['batch_size']
+
+        followers = Follow.objects.filter(
+            followee=OuterRef('pk')
+        ).order_by().values('followee').annotate(total=Count('pk')).values('total')
+
+        following = Follow.objects.filter(
+            follower=OuterRef('pk')
+        ).order_by().values('follower').annotate(total=Count('pk')).values('total')
+
+        last_pk = 0
+        reconciled = 0
+
+        while True:
+            pks = list(
+                Profile.objects.filter(pk__gt=last_pk).order_by('pk').values_list('pk', flat=True)[:batch_size]
+            )
+            if not pks:
+                break
+
+            with transaction.atomic():
+                reconciled += Profile.objects.filter(pk__gte=pks[0], pk__lte=pks[-1]).update(
+                    followers_count=Coalesce(Subquery(followers, output_field=IntegerField()), 0),
+                    following_count=Coalesce(Subquery(following, output_field=IntegerField()), 0),
+                )
+
+            last_pk = pks[-1]
+
+        self.stdout.write(self.style.SUCCESS(f'Reconciled the counters of {reconciled} profiles.'))
@@ -0,0 +1,84 @@
+"""Refresh follow suggestions command."""
+
+# Django
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+# Models
+from platzigram_api.users.models import (
+    FollowSuggestion,
+    FollowSuggestionChange
+)
+
+# Utilities
+import time
+
+
+class Command(BaseCommand):
+    """Rebuilds the follow suggestions affected by the queued follow changes.
+
+    Changes are taken in creation order in batches locked with SKIP
+    LOCKED, so several workers can run at once, and every affected
+    profile is rebuilt to its top K suggestions. This keeps the two
+    hops join out of the follow requests.
+    """
+
+    help = 'Rebuilds the follow suggestions affected by the queued follow changes in batches.'
+
+    def add_arguments(self, parser):
+        """Adds the command arguments."""
+
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=100,
+            help='Number of follow changes processed at once.'
+        )
+        parser.add_argument(
+            '--top-k',
+            type=int,
+            default=FollowSuggestion.objects.TOP_K,
+            help='Number of suggestions kept per profile.'
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep waiting for new changes instead of exiting when the queue is drained.'
+        )
+        parser.add_argument(
+            '--sleep',
+            type=float,
+            default=5,
+            help='Seconds to wait when the queue is drained before looking again when looping.'
+        )
+
+    def handle(self, *args, **options):
+        """Applies batches until the queue is drained."""
+
+        while True:
+            processed = self.refresh_batch(options['batch_size'], options['top_k'])
+
+            if processed:
+                self.stdout.write(f'Processed {processed} follow changes.')
+                continue
+
+            if not options['loop']:
+                break
+
+            time.sleep(options['sleep'])
+
+    def refresh_batch(self, batch_size, top_k) -> 'int':
+        """Rebuilds the suggestions of the oldest unlocked changes and deletes them, returning their number."""
+
+        with transaction.atomic():
+            changes = list(
+                FollowSuggestionChange.objects.select_for_update(skip_locked=True).order_by('pk')[:batch_size]
+            )
+
+            if not changes:
+                return 0
+
+            FollowSuggestion.objects.refresh({change.follower_id for change in changes}, top_k)
+            FollowSuggestionChange.objects.filter(pk__in=[change.pk for change in changes]).delete()
+
+        return len(changes)
@@ -0,0 +1,34 @@
+"""Response cache stats command."""
+
+# Django
+from django.core.management.base import BaseCommand
+
+# Utilities
+from platzigram_api.utils.cache import response_cache
+
+
+class Command(BaseCommand):
+    """Prints the hits, misses and hit ratio of the cached endpoints."""
+
+    help = 'Prints the response cache hits and misses per endpoint.'
+
+    ENDPOINTS = ['retrieve']
+
+    def add_arguments(self, parser):
+        """Adds the command arguments."""
+
+        parser.add_argument(
+            'endpoints',
+            nargs='*',
+            help='Endpoints to report, every cached endpoint by default.'
+        )
+
+    def handle(self, *args, **options):
+        """Prints a line per endpoint."""
+
+        for endpoint in options['endpoints'] or self.ENDPOINTS:
+            stats = response_cache.get_stats(endpoint)
+            total = stats['hits'] + stats['misses']
+            ratio = stats['hits'] / total if total else 0
+
+            self.stdout.write(f"{endpoint}: {stats['hits']} hits, {stats['misses']} misses ({ratio:.1%} hit ratio).")
@@ -0,0 +1,151 @@
+"""Send outbox emails command."""
+
+# Django
+from django.core.mail import get_connection
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+# Models
+from platzigram_api.users.models import OutboxEmail
+
+# Utilities
+from datetime import timedelta
+import time
+
+
+class Command(BaseCommand):
+    """Sends the pending emails of the outbox.
+
+    Emails are taken in batches locked with SKIP LOCKED, so several
+    workers can run at once, and every batch is sent over a single
+    mail connection. Failed emails are retried with an exponential
+    backoff until they run out of attempts.
+    """
+
+    help = 'Sends the pending emails of the outbox in batches.'
+
+    def add_arguments(self, parser):
+        """Adds the command arguments."""
+
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=100,
+            help='Number of emails sent over each connection.'
+        )
+        parser.add_argument(
+            '--max-attempts',
+            type=int,
+            default=5,
+            help='Number of attempts before an email is marked as failed.'
+        )
+        parser.add_argument(
+            '--backoff',
+            type=int,
+            default=60,
+            help='Seconds to wait before the first retry, doubled on each attempt.'
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep waiting for new emails instead of exiting when the outbox is drained.'
+        )
+        parser.add_argument(
+            '--sleep',
+            type=float,
+            default=5,
+            help='Seconds to wait when the outbox is drained before looking again when looping.'
+        )
+
+    def handle(self, *args, **options):
+        """Sends batches until the outbox is drained."""
+
+        while True:
+            sent, failed = self.send_batch(
+                options['batch_size'],
+                options['max_attempts'],
+                options['backoff']
+            )
+
+            if sent or failed:
+                self.stdout.write(f'Sent {sent} emails, {failed} failed.')
+                continue
+
+            if not options['loop']:
+                break
+
+            time.sleep(options['sleep'])
+
+    def send_batch(self, batch_size, max_attempts, backoff) -> 'tuple':
+        """Sends a batch of due emails over one connection and returns how many were sent and failed.
+
+        The messages are built before the rows are locked, so the
+        locks are only held while sending. If the connection can not
+        be opened every locked email counts as a failed attempt.
+        """
+
+        sent = failed = 0
+
+        due = OutboxEmail.objects.filter(
+            status=OutboxEmail.PENDING,
+            next_attempt_at__lte=timezone.now()
+        ).order_by('next_attempt_at')
+
+        messages = {email.pk: email.to_message() for email in due[:batch_size]}
+
+        if not messages:
+            return sent, failed
+
+        with transaction.atomic():
+            emails = list(due.select_for_update(skip_locked=True).filter(pk__in=list(messages)))
+
+            if not emails:
+                return sent, failed
+
+            for email in emails:
+                email.attempts += 1
+                email.updated = timezone.now()
+
+            connection = get_connection()
+
+            try:
+                connection.open()
+            except Exception as e:
+                for email in emails:
+                    failed += 1
+                    self.fail(email, e, max_attempts, backoff)
+            else:
+                try:
+                    for email in emails:
+                        try:
+                            connection.send_messages([messages[email.pk]])
+                        except Exception as e:
+                            failed += 1
+                            self.fail(email, e, max_attempts, backoff)
+                        else:
+                            sent += 1
+                            email.status = OutboxEmail.SENT
+                            email.sent_at = timezone.now()
+                finally:
+                    connection.close()
+
+            OutboxEmail.objects.bulk_update(
+                emails,
+                ['attempts', 'status', 'sent_at', 'next_attempt_at', 'last_error', 'updated']
+            )
+
+        return sent, failed
+
+    @staticmethod
+    def fail(email, error, max_attempts, backoff) -> 'None':
+        """Records a failed attempt, postponing the email or marking it as failed when out of attempts."""
+
+        email.last_error = str(error)
+
+        if email.attempts >= max_attempts:
+            email.status = OutboxEmail.FAILED
+        else:
+            email.next_attempt_at = timezone.now() + timedelta(
+                seconds=backoff * 2 ** (email.attempts - 1)
+            )
@@ -0,0 +1,46 @@
+# Generated by Django 2.2 on 2026-10-18 10:25
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, IntegerField
+from django.db.models.functions import Coalesce
+
+
+def populate_follow_counters(apps, schema_editor):
+    """Sets the counters of the existing profiles from the followers table."""
+
+    Profile = apps.get_model('users', 'Profile')
+    relation = Profile.followers.through
+
+    followers = relation.objects.filter(
+        from_profile=OuterRef('pk')
+    ).order_by().values('from_profile').annotate(total=Count('pk')).values('total')
+
+    following = relation.objects.filter(
+        to_profile=OuterRef('pk')
+    ).order_by().values('to_profile').annotate(total=Count('pk')).values('total')
+
+    Profile.objects.update(
+        followers_count=Coalesce(Subquery(followers, output_field=IntegerField()), 0),
+        following_count=Coalesce(Subquery(following, output_field=IntegerField()), 0),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0003_user_is_email_verified'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='profile',
+            name='followers_count',
+            field=models.PositiveIntegerField(default=0, help_text='Denormalized number of profiles following this one.'),
+        ),
+        migrations.AddField(
+            model_name='profile',
+            name='following_count',
+            field=models.PositiveIntegerField(default=0, help_text='Denormalized number of profiles this one follows.'),
+        ),
+        migrations.RunPython(populate_follow_counters, migrations.RunPython.noop),
+    ]
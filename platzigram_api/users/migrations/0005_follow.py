@@ -0,0 +1,105 @@
+# Generated by Django 2.2 on 2026-10-18 10:27
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+BATCH_SIZE = 5000
+
+
+def copy_edges_to_follow(apps, schema_editor):
+    """Copies the rows of the auto generated followers table into Follow in batches.
+
+    On the old table from_profile is the followed profile and
+    to_profile is the follower.
+    """
+
+    Profile = apps.get_model('users', 'Profile')
+    Follow = apps.get_model('users', 'Follow')
+    relation = Profile.followers.through
+
+    last_pk = 0
+
+    while True:
+        edges = list(
+            relation.objects.filter(pk__gt=last_pk).order_by('pk').values_list(
+                'pk', 'from_profile_id', 'to_profile_id'
+            )[:BATCH_SIZE]
+        )
+        if not edges:
+            break
+
+        Follow.objects.bulk_create([
+            Follow(followee_id=followee_id, follower_id=follower_id)
+            for _, followee_id, follower_id in edges
+        ])
+
+        last_pk = edges[-1][0]
+
+
+def copy_edges_from_follow(apps, schema_editor):
+    """Copies the Follow rows back into the auto generated followers table in batches."""
+
+    Profile = apps.get_model('users', 'Profile')
+    Follow = apps.get_model('users', 'Follow')
+    relation = Profile.followers.through
+
+    last_pk = 0
+
+    while True:
+        edges = list(
+            Follow.objects.filter(pk__gt=last_pk).order_by('pk').values_list(
+                'pk', 'followee_id', 'follower_id'
+            )[:BATCH_SIZE]
+        )
+        if not edges:
+            break
+
+        relation.objects.bulk_create([
+            relation(from_profile_id=followee_id, to_profile_id=follower_id)
+            for _, followee_id, follower_id in edges
+        ])
+
+        last_pk = edges[-1][0]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0004_profile_follow_counters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Follow',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created', models.DateTimeField(auto_now_add=True)),
+                ('updated', models.DateTimeField(auto_now=True)),
+                ('followee', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='follower_edges', to='users.Profile')),
+                ('follower', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='following_edges', to='users.Profile')),
+            ],
+            options={
+                'ordering': ['-created', '-updated'],
+                'abstract': False,
+                'unique_together': {('follower', 'followee')},
+            },
+        ),
+        migrations.AddIndex(
+            model_name='follow',
+            index=models.Index(fields=['followee', 'created'], name='users_follo_followe_1a0374_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='follow',
+            index=models.Index(fields=['follower', 'created'], name='users_follo_followe_98a6e9_idx'),
+        ),
+        migrations.RunPython(copy_edges_to_follow, copy_edges_from_follow),
+        migrations.RemoveField(
+            model_name='profile',
+            name='followers',
+        ),
+        migrations.AddField(
+            model_name='profile',
+            name='followers',
+            field=models.ManyToManyField(related_name='following', through='users.Follow', to='users.Profile'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 2.2 on 2026-10-18 10:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0007_outboxemail'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='token_version',
+            field=models.PositiveIntegerField(default=0, help_text='Embedded on the issued tokens, increasing it revokes every token of the user.'),
+        ),
+    ]
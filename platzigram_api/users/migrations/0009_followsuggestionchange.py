@@ -0,0 +1,27 @@
+# Generated by Django 2.2 on 2026-10-18 11:14
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0008_user_token_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FollowSuggestionChange',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created', models.DateTimeField(auto_now_add=True)),
+                ('updated', models.DateTimeField(auto_now=True)),
+                ('follower', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='users.Profile')),
+            ],
+            options={
+                'ordering': ['-created', '-updated'],
+                'abstract': False,
+            },
+        ),
+    ]
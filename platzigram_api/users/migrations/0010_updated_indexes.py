@@ -0,0 +1,21 @@
+# Generated by Django 2.2 on 2026-10-18 11:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0009_followsuggestionchange'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='profile',
+            index=models.Index(fields=['updated'], name='users_profi_updated_4b31a7_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['updated'], name='users_user_updated_2d0b54_idx'),
+        ),
+    ]
@@ -1,3 +1,6 @@
 """Users app models."""
 from .users import User
 from .profiles import Profile
+from .follows import Follow
+from .suggestions import FollowSuggestion, FollowSuggestionChange
+from .emails import OutboxEmail
@@ -0,0 +1,104 @@
+"""Outbox email model."""
+
+# Django
+from django.db import models
+from django.core.mail import EmailMultiAlternatives
+from django.utils import timezone
+
+# Models
+from platzigram_api.utils.models import PlatzigramBaseAbstractModel
+
+
+class OutboxEmailManager(models.Manager):
+    """Outbox email manager."""
+
+    def enqueue(self, message) -> 'OutboxEmail':
+        """Stores an email message on the outbox so a worker sends it later.
+
+        The row is written on the current transaction, so the
+        email is only sent if the transaction commits.
+        """
+
+        html_body = ''
+
+        for content, mimetype in getattr(message, 'alternatives', []):
+            if mimetype == 'text/html':
+                html_body = content
+
+        return self.create(
+            subject=message.subject,
+            body=message.body,
+            html_body=html_body,
+            from_email=message.from_email,
+            recipients=','.join(message.to)
+        )
+
+
+class OutboxEmail(PlatzigramBaseAbstractModel):
+    """Outbox email model.
+
+    Email waiting to be sent by the send_outbox_emails worker,
+    failed attempts are retried with an exponential backoff.
+    """
+
+    PENDING = 'pending'
+    SENT = 'sent'
+    FAILED = 'failed'
+
+    STATUS_CHOICES = (
+        (PENDING, 'Pending'),
+        (SENT, 'Sent'),
+        (FAILED, 'Failed'),
+    )
+
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    html_body = models.TextField(blank=True)
+
+    from_email = models.CharField(max_length=255)
+    recipients = models.TextField(
+        help_text='Comma separated list of recipients.'
+    )
+
+    status = models.CharField(
+        max_length=10,
+        choices=STATUS_CHOICES,
+        default=PENDING
+    )
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(
+        default=timezone.now,
+        help_text='The email will not be sent before this date.'
+    )
+    sent_at = models.DateTimeField(blank=True, null=True)
+    last_error = models.TextField(blank=True)
+
+    objects = OutboxEmailManager()
+
+    class Meta(PlatzigramBaseAbstractModel.Meta):
+        """Metadata class."""
+
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at']),
+        ]
+
+    def __str__(self) -> 'str':
+        """Returns the string representation of an outbox email."""
+
+        return f"Email {self.subject} to {self.recipients}"
+
+    def to_message(self, connection=None) -> 'EmailMultiAlternatives':
+        """Returns the email message to be sent through the given connection."""
+
+        message = EmailMultiAlternatives(
+            self.subject,
+            self.body,
+            self.from_email,
+            self.recipients.split(','),
+            connection=connection
+        )
+
+        if self.html_body:
+            message.attach_alternative(self.html_body, 'text/html')
+
+        return message
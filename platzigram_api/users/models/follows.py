@@ -0,0 +1,150 @@
+"""Follow model."""
+
+# Django
+from django.db import models, connections
+from django.utils import timezone
+
+# Models
+from platzigram_api.utils.models import PlatzigramBaseAbstractModel
+
+
+class FollowManager(models.Manager):
+    """Follow manager.
+
+    Provides single statement writes of follow edges which
+    report the edges they actually changed.
+    """
+
+    def create_if_missing(self, follower, followee) -> 'bool':
+        """Inserts the edge with an INSERT ... ON CONFLICT DO NOTHING statement.
+
+        Repeating it is harmless and it never raises on concurrent
+        inserts of the same edge. Returns if the edge was inserted.
+        """
+
+        return bool(self.create_many_if_missing(follower, [followee.pk]))
+
+    def create_many_if_missing(self, follower, followee_pks) -> 'set':
+        """Inserts the edges from follower with one INSERT ... ON CONFLICT DO NOTHING RETURNING statement.
+
+        Returns the pks of the followees whose edge was inserted by
+        this statement, edges that existed or were inserted by a
+        concurrent statement are left out.
+        """
+
+        followee_pks = list(followee_pks)
+        if not followee_pks:
+            return set()
+
+        connection = connections[self.db]
+        quote_name = connection.ops.quote_name
+        now = connection.ops.adapt_datetimefield_value(timezone.now())
+
+        columns = ', '.join(
+            quote_name(column) for column in ['created', 'updated', 'follower_id', 'followee_id']
+        )
+        conflict_columns = ', '.join(
+            quote_name(column) for column in ['follower_id', 'followee_id']
+        )
+        values = ', '.join(['(%s, %s, %s, %s)'] * len(followee_pks))
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'INSERT INTO {quote_name(self.model._meta.db_table)} ({columns}) '
+                f'VALUES {values} ON CONFLICT ({conflict_columns}) DO NOTHING '
+                f'RETURNING {quote_name("followee_id")}',
+                [value for followee_pk in followee_pks for value in (now, now, follower.pk, followee_pk)]
+            )
+
+            return {followee_pk for followee_pk, in cursor.fetchall()}
+
+    def delete_many(self, follower, followee_pks) -> 'set':
+        """Deletes the edges from follower with one DELETE ... RETURNING statement.
+
+        Returns the pks of the followees whose edge was deleted by
+        this statement, edges deleted by a concurrent statement are
+        left out.
+        """
+
+        followee_pks = list(followee_pks)
+        if not followee_pks:
+            return set()
+
+        connection = connections[self.db]
+        quote_name = connection.ops.quote_name
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {quote_name(self.model._meta.db_table)} '
+                f'WHERE {quote_name("follower_id")} = %s '
+                f'AND {quote_name("followee_id")} IN ({", ".join(["%s"] * len(followee_pks))}) '
+                f'RETURNING {quote_name("followee_id")}',
+                [follower.pk, *followee_pks]
+            )
+
+            return {followee_pk for followee_pk, in cursor.fetchall()}
+
+    def delete_profile_edges(self, profile) -> 'tuple':
+        """Deletes every edge of a profile with one DELETE ... RETURNING statement per side.
+
+        Returns the pks of the profiles it followed and the pks of the
+        profiles that followed it.
+        """
+
+        return (
+            self._delete_returning('follower_id', profile.pk, 'followee_id'),
+            self._delete_returning('followee_id', profile.pk, 'follower_id')
+        )
+
+    def _delete_returning(self, column, pk, returning_column) -> 'set':
+        """Deletes the edges whose column is pk and returns the values of their returning_column."""
+
+        connection = connections[self.db]
+        quote_name = connection.ops.quote_name
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {quote_name(self.model._meta.db_table)} '
+                f'WHERE {quote_name(column)} = %s '
+                f'RETURNING {quote_name(returning_column)}',
+                [pk]
+            )
+
+            return {other_pk for other_pk, in cursor.fetchall()}
+
+
+class Follow(PlatzigramBaseAbstractModel):
+    """Follow model.
+
+    Intermediary model of the Profile followers relation,
+    each row means that follower follows followee since
+    the date it was created.
+    """
+
+    follower = models.ForeignKey(
+        'users.Profile',
+        on_delete=models.CASCADE,
+        related_name='following_edges'
+    )
+    followee = models.ForeignKey(
+        'users.Profile',
+        on_delete=models.CASCADE,
+        related_name='follower_edges'
+    )
+
+    objects = FollowManager()
+
+    class Meta(PlatzigramBaseAbstractModel.Meta):
+        """Metadata class."""
+
+        unique_together = ('follower', 'followee')
+
+        indexes = [
+            models.Index(fields=['followee', 'created']),
+            models.Index(fields=['follower', 'created']),
+        ]
+
+    def __str__(self) -> 'str':
+        """Returns the string representation of a follow."""
+
+        return f"Profile {self.follower_id} follows Profile {self.followee_id}"
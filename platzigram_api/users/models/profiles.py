@@ -1,10 +1,27 @@
 """Profile model."""
 
 # Django
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F, Case, When
+from django.utils import timezone
 
 # Models
-from .users import User
+from .users import (
+    User,
+    invalidate_responses
+)
+from .follows import Follow
+
+# Signals
+from django.dispatch import receiver
+from django.db.models.signals import (
+    post_save,
+    pre_delete
+)
+from platzigram_api.users.signals import (
+    follows_created,
+    follows_deleted
+)
 from platzigram_api.utils.models import PlatzigramBaseAbstractModel
 
 
@@ -18,6 +35,10 @@ class Profile(PlatzigramBaseAbstractModel):
         Phone Number
         Picture
         Followers
+
+    Followers and followings totals are denormalized on
+    followers_count and following_count so they can be read
+    without counting the followers table.
     """
 
     user = models.OneToOneField(
@@ -42,22 +63,190 @@ class Profile(PlatzigramBaseAbstractModel):
     followers = models.ManyToManyField(
         'self',
         related_name='following',
-        symmetrical=False
+        symmetrical=False,
+        through='Follow',
+        through_fields=('followee', 'follower')
+    )
+
+    followers_count = models.PositiveIntegerField(
+        default=0,
+        help_text='Denormalized number of profiles following this one.'
+    )
+    following_count = models.PositiveIntegerField(
+        default=0,
+        help_text='Denormalized number of profiles this one follows.'
     )
 
+    # Max number of profiles whose counters are shifted by one statement
+    # when the edges of a deleted profile are discounted.
+    COUNTER_BATCH_SIZE = 5000
+
+    class Meta(PlatzigramBaseAbstractModel.Meta):
+        """Metadata class."""
+
+        indexes = [
+            models.Index(fields=['updated']),
+        ]
+
     def __str__(self) -> 'str':
         """Returns the string representation of a profile."""
 
         return f"Profile of User {self.user.username}"
 
-    def follow(self, profile) -> 'None':
-        """Function that allows this profile to follow another one."""
+    def follow(self, profile) -> 'bool':
+        """Function that allows this profile to follow another one.
+
+        The edge is inserted with a single idempotent statement and the
+        counters of both profiles are updated on the same transaction
+        only when the edge did not exist before.
+        Returns if the edge was created.
+        """
+
+        with transaction.atomic():
+            created = Follow.objects.create_if_missing(
+                follower=self,
+                followee=profile
+            )
+
+            if created:
+                self.shift_follow_counters([profile.pk], 1)
+                follows_created.send(sender=Profile, follower=self, followee_pks={profile.pk})
+
+        return created
+
+    def unfollow(self, profile) -> 'bool':
+        """Function that allows this profile to unfollow another one.
+
+        Returns if an edge was deleted.
+        """
+
+        with transaction.atomic():
+            deleted, _ = Follow.objects.filter(
+                follower=self,
+                followee=profile
+            ).delete()
+
+            if deleted:
+                self.shift_follow_counters([profile.pk], -1)
+                follows_deleted.send(sender=Profile, follower=self, followee_pks={profile.pk})
+
+        return bool(deleted)
+
+    def follow_many(self, profile_pks) -> 'set':
+        """Function that allows this profile to follow several profiles at once.
+
+        Edges are inserted with one INSERT ignoring conflicts that
+        returns the edges it inserted, and only those are counted by
+        the one statement updating the counters.
+        Returns the pks of the newly followed profiles.
+        """
+
+        profile_pks = set(profile_pks) - {self.pk}
+
+        with transaction.atomic():
+            new_pks = Follow.objects.create_many_if_missing(self, profile_pks)
+
+            if new_pks:
+                self.shift_follow_counters(new_pks, 1)
+                follows_created.send(sender=Profile, follower=self, followee_pks=new_pks)
+
+        return new_pks
+
+    def unfollow_many(self, profile_pks) -> 'set':
+        """Function that allows this profile to unfollow several profiles at once.
+
+        Edges are deleted with one DELETE that returns the edges it
+        deleted, and only those are counted.
+        Returns the pks of the profiles that were unfollowed.
+        """
+
+        with transaction.atomic():
+            followed_pks = Follow.objects.delete_many(self, set(profile_pks))
+
+            if followed_pks:
+                self.shift_follow_counters(followed_pks, -1)
+                follows_deleted.send(sender=Profile, follower=self, followee_pks=followed_pks)
+
+        return followed_pks
+
+    def relationships(self, usernames) -> 'dict':
+        """Returns the relationship between this profile and the profiles of the given usernames.
+
+        The usernames are resolved by a single query and the
+        relationships are answered by the follow graph, which takes
+        a query per set that is not mirrored. The result maps each
+        username to whether this profile follows it and whether it
+        follows this profile.
+        """
+
+        # The follow graph module imports the models, so it can't be imported at the top.
+        from platzigram_api.users.graph import follow_graph
+
+        profile_pks = dict(
+            Profile.objects.filter(user__username__in=set(usernames)).values_list('user__username', 'pk')
+        )
+
+        relationships = follow_graph.relationships(self, profile_pks.values())
+
+        return {
+            username: relationships.get(profile_pks.get(username), {'following': False, 'followed_by': False})
+            for username in set(usernames)
+        }
+
+    def shift_follow_counters(self, profile_pks, delta) -> 'None':
+        """Adds delta to the followers count of the given profiles and to the following count of this one per profile.
+
+        Every row is updated by the same statement so concurrent
+        follows between two profiles always lock them together.
+        The updated date of every row is bumped too, as the counters
+        are exported and represented with the profile.
+        """
+
+        profile_pks = list(profile_pks)
+
+        Profile.objects.filter(pk__in=[self.pk] + profile_pks).update(
+            following_count=Case(
+                When(pk=self.pk, then=F('following_count') + delta * len(profile_pks)),
+                default=F('following_count')
+            ),
+            followers_count=Case(
+                When(pk__in=profile_pks, then=F('followers_count') + delta),
+                default=F('followers_count')
+            ),
+            updated=timezone.now()
+        )
+
+
+@receiver(pre_delete, sender=Profile)
+def discount_deleted_profile_edges(sender, **kwargs):
+    """When a profile is deleted, deletes its follow edges discounting them from the profiles on the other side.
+
+    The cascade would delete the edges without touching the counters of
+    the other side. Each side is deleted by one statement that returns
+    the other profiles, whose counters are then shifted in batches.
+    No follows_deleted is sent: the suggestions of the profile cascade
+    away and the rest are fixed by the batch build, and mirrored follow
+    graph sets expire.
+    """
+
+    profile = kwargs['instance']
+    followee_pks, follower_pks = Follow.objects.delete_profile_edges(profile)
+
+    now = timezone.now()
+
+    for pks, counter in [(followee_pks, 'followers_count'), (follower_pks, 'following_count')]:
+        pks = list(pks)
+
+        for start in range(0, len(pks), Profile.COUNTER_BATCH_SIZE):
+            Profile.objects.filter(pk__in=pks[start:start + Profile.COUNTER_BATCH_SIZE]).update(
+                **{counter: F(counter) - 1},
+                updated=now
+            )
+
 
-        self.following.add(profile)
-        profile.followers.add(self)
+@receiver(post_save, sender=Profile)
+def invalidate_profile_responses(sender, **kwargs):
+    """When a profile changes, replaces the version of the cached responses of its user."""
 
-    def unfollow(self, profile) -> 'None':
-        """Function that allows this profile to unfollow another one."""
+    invalidate_responses([kwargs['instance'].user.username])
 
-        self.following.remove(profile)
-        profile.followers.remove(profile)
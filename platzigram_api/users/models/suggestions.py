@@ -0,0 +1,179 @@
+"""Follow suggestion model."""
+
+# Django
+from django.db import models, transaction
+from django.db.models import Count
+
+# Models
+from platzigram_api.utils.models import PlatzigramBaseAbstractModel
+from .follows import Follow
+
+# Signals
+from django.dispatch import receiver
+from platzigram_api.users.signals import (
+    follows_created,
+    follows_deleted
+)
+
+# Utilities
+from collections import defaultdict
+import heapq
+
+
+class FollowSuggestionManager(models.Manager):
+    """Follow suggestion manager.
+
+    Keeps the precomputed suggestions up to date, both with the
+    full batch build and with the rebuilds made by the
+    refresh_follow_suggestions worker for the queued follow changes.
+    """
+
+    # Number of suggestions kept per profile.
+    TOP_K = 50
+
+    # Max number of followers of a changed profile whose suggestions
+    # are rebuilt, the newest followers are kept. The rest are fixed
+    # by the batch build.
+    FANOUT_LIMIT = 1000
+
+    # Number of profiles whose suggestions are rebuilt at once.
+    REBUILD_BATCH_SIZE = 500
+
+    def rebuild(self, profile_pks, top_k) -> 'int':
+        """Replaces the suggestions of the given profiles with its top_k friends of friends.
+
+        The score of a candidate is the number of profiles followed by
+        the profile that follow the candidate. Returns the number of
+        suggestions stored.
+        """
+
+        profile_pks = list(profile_pks)
+
+        followed = defaultdict(set)
+        for follower_pk, followee_pk in Follow.objects.filter(
+            follower_id__in=profile_pks
+        ).order_by().values_list('follower_id', 'followee_id'):
+            followed[follower_pk].add(followee_pk)
+
+        # Edges B -> C where B is followed by one of the profiles A.
+        two_hops = Follow.objects.filter(
+            follower__follower_edges__follower_id__in=profile_pks
+        ).order_by().values_list(
+            'follower__follower_edges__follower_id', 'followee_id'
+        ).annotate(score=Count('pk'))
+
+        candidates = defaultdict(list)
+        for profile_pk, candidate_pk, score in two_hops:
+            if candidate_pk != profile_pk and candidate_pk not in followed[profile_pk]:
+                candidates[profile_pk].append((score, candidate_pk))
+
+        suggestions = [
+            self.model(profile_id=profile_pk, candidate_id=candidate_pk, score=score)
+            for profile_pk, scores in candidates.items()
+            for score, candidate_pk in heapq.nlargest(top_k, scores)
+        ]
+
+        with transaction.atomic():
+            self.filter(profile_id__in=profile_pks).delete()
+            self.bulk_create(suggestions)
+
+        return len(suggestions)
+
+    def refresh(self, follower_pks, top_k) -> 'int':
+        """Rebuilds the suggestions affected by the followings of follower_pks changing.
+
+        Those are the suggestions of the given profiles, whose
+        first hop changed, and of their followers, whose second hop
+        changed. Returns the number of suggestions stored.
+        """
+
+        follower_pks = set(follower_pks)
+
+        profile_pks = set(follower_pks)
+        for follower_pk in follower_pks:
+            profile_pks.update(
+                Follow.objects.filter(
+                    followee_id=follower_pk
+                ).order_by('-created').values_list('follower_id', flat=True)[:self.FANOUT_LIMIT]
+            )
+
+        profile_pks = sorted(profile_pks)
+
+        return sum(
+            self.rebuild(profile_pks[start:start + self.REBUILD_BATCH_SIZE], top_k)
+            for start in range(0, len(profile_pks), self.REBUILD_BATCH_SIZE)
+        )
+
+
+class FollowSuggestion(PlatzigramBaseAbstractModel):
+    """Follow suggestion model.
+
+    Precomputed candidate for a profile to follow, scored by
+    the number of mutual connections between them.
+    """
+
+    profile = models.ForeignKey(
+        'users.Profile',
+        on_delete=models.CASCADE,
+        related_name='suggestions'
+    )
+    candidate = models.ForeignKey(
+        'users.Profile',
+        on_delete=models.CASCADE,
+        related_name='+'
+    )
+
+    score = models.IntegerField(
+        default=0,
+        help_text='Number of profiles followed by profile that follow the candidate.'
+    )
+
+    objects = FollowSuggestionManager()
+
+    class Meta(PlatzigramBaseAbstractModel.Meta):
+        """Metadata class."""
+
+        unique_together = ('profile', 'candidate')
+
+        indexes = [
+            models.Index(fields=['profile', '-score']),
+        ]
+
+    def __str__(self) -> 'str':
+        """Returns the string representation of a follow suggestion."""
+
+        return f"Profile {self.candidate_id} suggested to Profile {self.profile_id}"
+
+
+class FollowSuggestionChange(PlatzigramBaseAbstractModel):
+    """Follow suggestion change model.
+
+    Queued on the transaction that changed the followings of a
+    profile, so the refresh_follow_suggestions worker rebuilds the
+    suggestions it affects outside of the request.
+    """
+
+    follower = models.ForeignKey(
+        'users.Profile',
+        on_delete=models.CASCADE,
+        related_name='+'
+    )
+
+    def __str__(self) -> 'str':
+        """Returns the string representation of a follow suggestion change."""
+
+        return f"Profile {self.follower_id} followings changed"
+
+
+@receiver(follows_created)
+def add_follow_suggestions(sender, **kwargs):
+    """When a profile follows others, queues the rebuild of the suggestions reached through them."""
+
+    FollowSuggestionChange.objects.create(follower=kwargs['follower'])
+
+
+@receiver(follows_deleted)
+def remove_follow_suggestions(sender, **kwargs):
+    """When a profile unfollows others, queues the rebuild of the suggestions reached through them."""
+
+    FollowSuggestionChange.objects.create(follower=kwargs['follower'])
@@ -10,7 +10,14 @@ from django.contrib.auth.models import AbstractUser
 
 # Signals
 from django.dispatch import receiver
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete
+
+# Utilities
+from django.db import transaction
+from platzigram_api.utils.cache import (
+    response_cache,
+    user_cache
+)
 
 
 class User(PlatzigramBaseAbstractModel, AbstractUser):
@@ -18,6 +25,8 @@ class User(PlatzigramBaseAbstractModel, AbstractUser):
 
     Extends the fields with:
         Phone Number
+        Email verification
+        Token version
     """
 
     PHONE_REGEX_VALIDATOR = RegexValidator(
@@ -45,16 +54,101 @@ class User(PlatzigramBaseAbstractModel, AbstractUser):
         help_text='Set to true when a user has verified its email.'
     )
 
+    token_version = models.PositiveIntegerField(
+        default=0,
+        help_text='Embedded on the issued tokens, increasing it revokes every token of the user.'
+    )
+
     REQUIRED_FIELDS = ['email', 'phone_number', 'first_name', 'last_name']
 
+    class Meta(PlatzigramBaseAbstractModel.Meta):
+        """Metadata class."""
+
+        indexes = [
+            models.Index(fields=['updated']),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Keeps the username the user was loaded with, so a rename can invalidate the old one."""
+
+        instance = super(User, cls).from_db(db, field_names, values)
+        instance._loaded_username = instance.__dict__.get('username')
+
+        return instance
+
+    def get_profile(self):
+        """Returns the profile of the user, creating it if it is missing.
+
+        Profiles are only created along with its user, users stored
+        without going through save may not have one yet.
+        """
+
+        # I import profile here cause i can't import it right in the top.
+        from .profiles import Profile
+
+        try:
+            return self.profile
+        except Profile.DoesNotExist:
+            profile, _ = Profile.objects.get_or_create(user=self)
+
+        return profile
+
 
 @receiver(post_save, sender=User)
 def create_profile(sender, **kwargs):
-    """When a user is created, creates a profile related to that user."""
+    """When a user is created, creates a profile related to that user.
+
+    Later saves of the user do not touch the profile.
+    """
 
     # I import profile here cause i can't import it right in the top.
     from .profiles import Profile
 
+    if kwargs['created']:
+        Profile.objects.create(user=kwargs['instance'])
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user(sender, **kwargs):
+    """When a user changes, replaces its cached version.
+
+    It is done right away and again after commit, so a request that
+    read the old row before the commit can not keep it cached.
+    """
+
+    pk = kwargs['instance'].pk
+
+    user_cache.invalidate(pk)
+    transaction.on_commit(lambda: user_cache.invalidate(pk))
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_responses(sender, **kwargs):
+    """When a user changes, replaces the version of its cached responses.
+
+    The username it was loaded with is invalidated too, in case the
+    user was renamed. It is done right away and again after commit.
+    """
+
     user = kwargs['instance']
+    usernames = {user.username, getattr(user, '_loaded_username', None)} - {None}
+
+    invalidate_responses(usernames)
+
+
+def invalidate_responses(usernames) -> 'None':
+    """Replaces the version of the cached responses of the given usernames now and after commit."""
+
+    usernames = list(usernames)
+
+    for username in usernames:
+        response_cache.invalidate(username)
+
+    def invalidate_on_commit():
+        for username in usernames:
+            response_cache.invalidate(username)
 
-    Profile.objects.get_or_create(user=user)
+    transaction.on_commit(invalidate_on_commit)
@@ -5,3 +5,19 @@ from .users import (
     UserSignupSerializer,
     VerifyUserSerializer
 )
+from .profiles import (
+    ProfileSummarySerializer,
+    ProfileBatchSerializer
+)
+from .follows import (
+    FollowerSerializer,
+    FollowingSerializer,
+    BulkFollowSerializer,
+    RelationshipsSerializer,
+    FollowSuggestionSerializer
+)
+from .tokens import (
+    TokenObtainPairSerializer,
+    TokenRefreshSerializer
+)
+from .exports import UserExportSerializer
@@ -0,0 +1,22 @@
+"""Exports related Serializers."""
+
+# Django REST Framework
+from rest_framework import serializers
+
+# Services
+from platzigram_api.users.services import export_users
+
+
+class UserExportSerializer(serializers.Serializer):
+    """User Export Serializer.
+
+    Handles the options of an export of the users
+    and its profiles as JSON lines.
+    """
+
+    since = serializers.DateTimeField(required=False)
+
+    def save(self):
+        """Returns a generator of the exported JSON lines."""
+
+        return export_users(since=self.validated_data.get('since'))
@@ -0,0 +1,139 @@
+"""Follow model related Serializers."""
+
+# Django REST Framework
+from rest_framework import serializers
+
+# Models
+from platzigram_api.users.models import (
+    Follow,
+    FollowSuggestion,
+    Profile
+)
+
+# Serializers
+from .profiles import ProfileSummarySerializer
+
+
+class FollowerSerializer(serializers.ModelSerializer):
+    """Follower Serializer.
+
+    Represents a follow edge from the followed profile
+    point of view, so it shows who is following.
+    """
+
+    profile = ProfileSummarySerializer(source='follower', read_only=True)
+
+    class Meta:
+        """Metadata class."""
+
+        model = Follow
+
+        fields = ('profile', 'created')
+
+        read_only_fields = fields
+
+
+class FollowingSerializer(serializers.ModelSerializer):
+    """Following Serializer.
+
+    Represents a follow edge from the follower
+    point of view, so it shows who is being followed.
+    """
+
+    profile = ProfileSummarySerializer(source='followee', read_only=True)
+
+    class Meta:
+        """Metadata class."""
+
+        model = Follow
+
+        fields = ('profile', 'created')
+
+        read_only_fields = fields
+
+
+class BulkFollowSerializer(serializers.Serializer):
+    """Bulk Follow Serializer.
+
+    Handles following or unfollowing several users at once,
+    resolving every username with a single query.
+    """
+
+    usernames = serializers.ListField(
+        child=serializers.CharField(max_length=150),
+        min_length=1,
+        max_length=200
+    )
+
+    def save(self, unfollow=False):
+        """Follows or unfollows the given users and returns the result for each one of them."""
+
+        profile = self.context['request'].user.get_profile()
+        usernames = self.validated_data['usernames']
+
+        profile_pks = dict(
+            Profile.objects.filter(
+                user__username__in=usernames
+            ).values_list('user__username', 'pk')
+        )
+
+        if unfollow:
+            changed_pks = profile.unfollow_many(profile_pks.values())
+            changed, unchanged = 'unfollowed', 'not_following'
+        else:
+            changed_pks = profile.follow_many(profile_pks.values())
+            changed, unchanged = 'followed', 'already_following'
+
+        results = {}
+
+        for username in usernames:
+            pk = profile_pks.get(username)
+
+            if pk is None:
+                results[username] = 'not_found'
+            elif pk == profile.pk:
+                results[username] = 'self'
+            else:
+                results[username] = changed if pk in changed_pks else unchanged
+
+        return results
+
+
+class RelationshipsSerializer(serializers.Serializer):
+    """Relationships Serializer.
+
+    Handles looking up the relationship between the requesting
+    user and up to 100 users through the follow graph.
+    """
+
+    usernames = serializers.ListField(
+        child=serializers.CharField(max_length=150),
+        min_length=1,
+        max_length=100
+    )
+
+    def save(self):
+        """Returns the relationship between the requesting user and every given user."""
+
+        profile = self.context['request'].user.get_profile()
+
+        return profile.relationships(self.validated_data['usernames'])
+
+
+class FollowSuggestionSerializer(serializers.ModelSerializer):
+    """Follow Suggestion Serializer.
+
+    Represents a suggested profile and the number
+    of mutual connections it has.
+    """
+
+    profile = ProfileSummarySerializer(source='candidate', read_only=True)
+
+    class Meta:
+        """Metadata class."""
+
+        model = FollowSuggestion
+
+        fields = ('profile', 'score')
+
+        read_only_fields = fields
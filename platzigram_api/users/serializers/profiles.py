@@ -0,0 +1,98 @@
+"""Profile model related Serializers."""
+
+# Django REST Framework
+from rest_framework import serializers
+
+# Models
+from platzigram_api.users.models import (
+    Profile,
+    User
+)
+
+# Utilities
+from platzigram_api.utils.serializers import (
+    SparseFieldsMixin,
+    compile_read_serializer
+)
+
+
+class ProfileSummarySerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    """Profile Summary Serializer.
+
+    Public card of a profile and its user, used
+    wherever a list of profiles is shown. Limited
+    to the fields on the context if there are.
+    """
+
+    username = serializers.CharField(source='user.username', read_only=True)
+    first_name = serializers.CharField(source='user.first_name', read_only=True)
+    last_name = serializers.CharField(source='user.last_name', read_only=True)
+
+    class Meta:
+        """Metadata class."""
+
+        model = Profile
+
+        fields = (
+            'username', 'first_name', 'last_name',
+            'picture', 'website', 'biography',
+            'followers_count', 'following_count'
+        )
+
+        read_only_fields = fields
+
+
+class ProfileBatchSerializer(serializers.Serializer):
+    """Profile Batch Serializer.
+
+    Handles looking up the profile cards of up to 100
+    users in a single query, limited to the fields on
+    the context if there are. Users without a profile
+    yet get the card of a new one.
+    """
+
+    usernames = serializers.ListField(
+        child=serializers.CharField(max_length=150),
+        min_length=1,
+        max_length=100
+    )
+
+    def save(self):
+        """Returns the card of every found user keyed by username and the usernames not found."""
+
+        usernames = self.validated_data['usernames']
+        represent = compile_read_serializer(
+            ProfileSummarySerializer,
+            fields=self.context.get('fields'),
+            from_values=True
+        )
+
+        # The users are queried, so the profile is LEFT OUTER JOINed.
+        user_paths = {
+            path: path[len('user__'):] if path.startswith('user__') else f'profile__{path}'
+            for path in represent.source_paths
+        }
+        defaults = {
+            path: Profile._meta.get_field(path).get_default()
+            for path in represent.source_paths
+            if not path.startswith('user__')
+        }
+
+        rows = User.objects.filter(
+            username__in=usernames
+        ).order_by().values('username', 'profile__id', *set(user_paths.values()))
+
+        request = self.context.get('request')
+        results = {}
+
+        for row in rows:
+            values = {path: row[user_path] for path, user_path in user_paths.items()}
+            if row['profile__id'] is None:
+                values.update(defaults)
+
+            results[row['username']] = represent(values, request)
+
+        return {
+            'results': results,
+            'missing': [username for username in dict.fromkeys(usernames) if username not in results]
+        }
@@ -0,0 +1,49 @@
+"""JWT related Serializers."""
+
+# Django REST Framework Simple JWT
+from rest_framework_simplejwt import serializers as jwt_serializers
+from rest_framework_simplejwt.settings import api_settings
+
+# Utilities
+from platzigram_api.utils.jwt import RevocableRefreshToken
+
+
+class TokenObtainPairSerializer(jwt_serializers.TokenObtainPairSerializer):
+    """Token Obtain Pair Serializer.
+
+    Same as the simple jwt one but the issued tokens
+    carry the token version of the user.
+    """
+
+    @classmethod
+    def get_token(cls, user):
+        """Returns a refresh token for the user."""
+
+        return RevocableRefreshToken.for_user(user)
+
+
+class TokenRefreshSerializer(jwt_serializers.TokenRefreshSerializer):
+    """Token Refresh Serializer.
+
+    Same as the simple jwt one but the refresh token blacklist
+    is checked through the revocation index and its token
+    version is checked.
+    """
+
+    def validate(self, attrs):
+        """Returns a new access token if the refresh token is valid."""
+
+        refresh = RevocableRefreshToken(attrs['refresh'])
+
+        data = {'access': str(refresh.access_token)}
+
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            if api_settings.BLACKLIST_AFTER_ROTATION:
+                refresh.blacklist()
+
+            refresh.set_jti()
+            refresh.set_exp()
+
+            data['refresh'] = str(refresh)
+
+        return data
@@ -6,27 +6,39 @@ from django.conf import settings
 from django.template.loader import render_to_string
 from django.core.mail import EmailMultiAlternatives
 from django.contrib.auth import authenticate
+from django.core.cache import cache
+from django.db import transaction
 
 # Django REST Framework
 from rest_framework import serializers
+from rest_framework.settings import api_settings as drf_settings
 
 # Django REST Framework Simple JWT
-from rest_framework_simplejwt.tokens import (
-    UntypedToken,
-    RefreshToken
+from rest_framework_simplejwt.tokens import UntypedToken
+from rest_framework_simplejwt.settings import api_settings
+from platzigram_api.utils.jwt import (
+    RevocableRefreshToken,
+    blacklist_token
 )
 
 # Models
-from platzigram_api.users.models import User
+from platzigram_api.users.models import (
+    OutboxEmail,
+    User
+)
+from platzigram_api.users.models.users import invalidate_responses
 
 # Validators
-from rest_framework.validators import UniqueValidator
 from django.core.validators import RegexValidator
 
+# Services
+from platzigram_api.users.services import signup_user
+
 # Utilities
 from django.utils import timezone
 from datetime import timedelta
-from platzigram_api.utils.jwt import blacklist_token
+from platzigram_api.utils.cache import user_cache
+import hashlib
 
 # JWT
 import jwt
@@ -38,19 +50,25 @@ from rest_framework_simplejwt.exceptions import TokenError
 class UserModelSerializer(serializers.ModelSerializer):
     """User Model Serializer"""
 
-    password = serializers.CharField(required=False)
+    password = serializers.CharField(
+        required=False,
+        write_only=True
+    )
 
     new_password = serializers.CharField(
         min_length=8,
-        required=False
+        required=False,
+        write_only=True
     )
     new_password_confirmation = serializers.CharField(
         min_length=8,
-        required=False
+        required=False,
+        write_only=True
     )
 
     refresh_token = serializers.CharField(
-        required=False
+        required=False,
+        write_only=True
     )
 
     class Meta:
@@ -76,24 +94,25 @@ class UserModelSerializer(serializers.ModelSerializer):
         """Validates that refresh token:
 
         Is valid to the given user.
+
+        Returns the parsed token, so it is decoded and
+        verified only once on the whole request.
         """
 
         try:
-            RefreshToken(refresh_token)
+            token = RevocableRefreshToken(refresh_token)
         except TokenError as e:
             raise serializers.ValidationError(e)
 
         except Exception as e:
             raise serializers.ValidationError(e)
 
-        payload = jwt.decode(refresh_token, settings.SIMPLE_JWT['SIGNING_KEY'], algorithms=['HS256'])
-
         request = self.context['request']
 
-        if payload.get('user_id', False) != request.user.id:
+        if token.payload.get(api_settings.USER_ID_CLAIM, False) != request.user.id:
             raise serializers.ValidationError('The given refresh token is not valid for this user.')
 
-        return refresh_token
+        return token
 
     def validate(self, data):
         """Validates password fields."""
@@ -116,10 +135,6 @@ class UserModelSerializer(serializers.ModelSerializer):
             if not new_password_confirmation:
                 raise serializers.ValidationError('You must provide the confirmation of your new password.')
 
-            refresh_token = data.get('refresh_token', False)
-            if not refresh_token:
-                raise serializers.ValidationError('You must provide your refresh token.')
-
             # Checks if the password is valid.
 
             username = self.context['request'].user.username
@@ -142,36 +157,31 @@ class UserModelSerializer(serializers.ModelSerializer):
     def update(self, instance, validated_data):
         """Extends the normal functionality to:
 
-        Change password of the user if is trying to change it.
+        Change password of the user if is trying to change it,
+        revoking all its tokens. The refresh token is no longer
+        required for it, but a presented one is still blacklisted.
         """
 
+        # Already parsed token, it is not an user field.
+        refresh_token = validated_data.pop('refresh_token', None)
+
         if self.is_user_changing_password(validated_data):
 
             new_password = validated_data['new_password']
 
+            # Increasing the token version revokes every
+            # token issued to the user, on every device.
             instance.set_password(new_password)
+            instance.token_version += 1
             instance.save()
 
-            token = validated_data['refresh_token']
-
-            if token:
-                blacklist_token(token)
+            if refresh_token is not None:
+                blacklist_token(refresh_token)
 
             validated_data.pop('new_password')
 
         return super(UserModelSerializer, self).update(instance, validated_data)
 
-    def to_representation(self, instance):
-        """Returns the normal representation only excluding the password."""
-
-        representation_data = super(UserModelSerializer, self).to_representation(instance)
-        representation_data.pop('password')
-
-        if 'refresh_token' in representation_data:
-            representation_data.pop('refresh_token')
-
-        return representation_data
-
     @staticmethod
     def is_user_changing_password(data):
         """Returns if an user is trying to change its password."""
@@ -187,24 +197,12 @@ class UserSignupSerializer(serializers.Serializer):
 
     username = serializers.CharField(
         min_length=2,
-        max_length=150,
-        validators=[
-            UniqueValidator(
-                User.objects.all()
-            )
-        ]
+        max_length=150
     )
 
     email = serializers.EmailField(
         min_length=6,
-        max_length=1000,
-        validators=[
-            UniqueValidator(
-                User.objects.all(
-
-                )
-            )
-        ]
+        max_length=1000
     )
 
     password = serializers.CharField(
@@ -252,17 +250,20 @@ class UserSignupSerializer(serializers.Serializer):
         return data
 
     def create(self, validated_data):
-        """Handles the user creation."""
+        """Handles the user creation.
 
-        user = User.objects.create_user(
-            **validated_data
-        )
-        self.send_confirmation_email(user)
+        The user and its confirmation email are stored on the
+        same transaction, uniqueness is checked by the database.
+        """
 
-        return user
+        return signup_user(validated_data, self.send_confirmation_email)
 
     def send_confirmation_email(self, user):
-        """Handles sending a confirmation email to the recently created user."""
+        """Handles sending a confirmation email to the recently created user.
+
+        The email is stored on the outbox within the signup transaction
+        and sent later by the send_outbox_emails worker.
+        """
 
         verification_token = self.generate_verification_token(user)
         subject = f'Welcome @{user.username}! Verify your account to start using Platzigram'
@@ -279,7 +280,8 @@ class UserSignupSerializer(serializers.Serializer):
         )
         msg = EmailMultiAlternatives(subject, content, from_email, [user.email])
         msg.attach_alternative(content, 'text/html')
-        msg.send()
+
+        OutboxEmail.objects.enqueue(msg)
 
     @staticmethod
     def generate_verification_token(user):
@@ -307,8 +309,13 @@ class VerifyUserSerializer(serializers.Serializer):
 
     Manages validating the JWT and if it's valid
     will make the user verified :D.
+
+    Consumed tokens are remembered on the cache until they
+    expire, so replayed links are rejected without a query.
     """
 
+    CONSUMED_TOKEN_KEY = 'email-verification-consumed:{}'
+
     token = serializers.CharField(max_length=10**10)
 
     def validate_token(self, token):
@@ -326,34 +333,65 @@ class VerifyUserSerializer(serializers.Serializer):
         ):
             raise serializers.ValidationError('Token is not valid.')
 
+        if cache.get(self.get_consumed_token_key(token)):
+            raise serializers.ValidationError('Token has already been used.')
+
         self.context['username'] = payload['user']
+        self.context['expiration'] = payload['exp']
 
         return token
 
-    def validate(self, data):
-        """Handles validating the User is not verified yet."""
+    def save(self):
+        """Handles making the user verified.
 
-        username = self.context['username']
+        It is a single conditional UPDATE, so concurrent verifications
+        of the same user can not both succeed, and the user is only
+        read back when it was verified.
+        """
 
-        try:
-            user = User.objects.get(username=username)
-        except User.DoesNotExist:
-            raise serializers.ValidationError('You\'re trying to verify a user who no longer exists.')
+        username = self.context['username']
 
-        if user.is_email_verified:
-            raise serializers.ValidationError('User is already verified.')
+        verified = User.objects.filter(
+            username=username,
+            is_email_verified=False
+        ).update(
+            is_email_verified=True,
+            updated=timezone.now()
+        )
 
-        self.context['user'] = user
-        return data
+        if not verified:
+            # Same 400 body validate() gave, errors go under the non field errors key.
+            if not User.objects.filter(username=username).exists():
+                raise serializers.ValidationError({
+                    drf_settings.NON_FIELD_ERRORS_KEY: ['You\'re trying to verify a user who no longer exists.']
+                })
 
-    def save(self):
-        """Handles making the user verified."""
+            self.consume_token()
+            raise serializers.ValidationError({
+                drf_settings.NON_FIELD_ERRORS_KEY: ['User is already verified.']
+            })
 
-        username = self.context['user']
+        self.consume_token()
 
         user = User.objects.get(username=username)
 
-        user.is_email_verified = True
-        user.save()
+        # The UPDATE does not send post_save, so the cached user and responses are replaced here.
+        user_cache.invalidate(user.pk)
+        transaction.on_commit(lambda: user_cache.invalidate(user.pk))
+        invalidate_responses([username])
 
         return user
+
+    def consume_token(self):
+        """Remembers the token as consumed until it expires."""
+
+        timeout = self.context['expiration'] - int(timezone.now().timestamp())
+
+        if timeout > 0:
+            cache.set(self.get_consumed_token_key(self.validated_data['token']), True, timeout)
+
+    @classmethod
+    def get_consumed_token_key(cls, token):
+        """Returns the cache key that marks a token as consumed."""
+
+        return cls.CONSUMED_TOKEN_KEY.format(hashlib.sha256(token.encode()).hexdigest())
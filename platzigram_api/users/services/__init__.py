@@ -0,0 +1,4 @@
+"""Users app services."""
+
+from .signup import signup_user
+from .exports import export_users
@@ -0,0 +1,51 @@
+"""Exports service."""
+
+# Django
+from django.core.serializers.json import DjangoJSONEncoder
+
+# Models
+from platzigram_api.users.models import (
+    Profile,
+    User
+)
+
+
+USER_EXPORT_FIELDS = (
+    'id', 'username', 'email', 'first_name', 'last_name', 'phone_number',
+    'is_email_verified', 'is_active', 'date_joined', 'created', 'updated'
+)
+
+PROFILE_EXPORT_FIELDS = (
+    'website', 'biography', 'picture', 'followers_count', 'following_count', 'created', 'updated'
+)
+
+
+def export_users(since=None, chunk_size=2000):
+    """Yields every user with its profile as a JSON line.
+
+    Rows are read as plain values through a server side cursor,
+    chunk_size at a time, so memory stays flat whatever the size
+    of the tables. If since is given only the users or profiles
+    updated since then are exported, each side is looked up on
+    its own updated index and the pks are merged with a UNION.
+    """
+
+    queryset = User.objects.order_by('pk')
+
+    if since is not None:
+        updated_pks = User.objects.filter(updated__gte=since).order_by().values('pk').union(
+            Profile.objects.filter(updated__gte=since).order_by().values('user_id')
+        )
+        queryset = queryset.filter(pk__in=updated_pks)
+
+    profile_fields = [f'profile__{field}' for field in PROFILE_EXPORT_FIELDS]
+    encoder = DjangoJSONEncoder()
+
+    for row in queryset.values_list(*USER_EXPORT_FIELDS, *profile_fields).iterator(chunk_size=chunk_size):
+        user = dict(zip(USER_EXPORT_FIELDS, row))
+        profile = row[len(USER_EXPORT_FIELDS):]
+
+        # Users without profile get their profile fields as null.
+        user['profile'] = dict(zip(PROFILE_EXPORT_FIELDS, profile)) if profile[-1] is not None else None
+
+        yield encoder.encode(user) + '\n'
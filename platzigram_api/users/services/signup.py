@@ -0,0 +1,61 @@
+"""Signup service."""
+
+# Django
+from django.db import (
+    IntegrityError,
+    transaction
+)
+from django.db.models import Q
+
+# Django REST Framework
+from rest_framework.exceptions import ValidationError
+
+# Models
+from platzigram_api.users.models import User
+
+
+UNIQUE_ERROR_MESSAGE = 'This field must be unique.'
+
+
+def signup_user(fields, send_confirmation_email) -> 'User':
+    """Creates an user and its confirmation email relying on the unique constraints of the database.
+
+    Nothing is checked up front, the INSERTs run on a single savepoint
+    and if the user breaks the unique username or email constraint a
+    single SELECT finds which one, raising the same validation errors
+    the serializer unique validators did.
+    """
+
+    try:
+        with transaction.atomic():
+            user = User.objects.create_user(**fields)
+            send_confirmation_email(user)
+    except IntegrityError:
+        errors = get_unique_errors(
+            User.normalize_username(fields['username']),
+            User.objects.normalize_email(fields['email'])
+        )
+
+        if not errors:
+            raise
+
+        raise ValidationError(errors)
+
+    return user
+
+
+def get_unique_errors(username, email) -> 'dict':
+    """Returns the validation errors of the username and email already taken."""
+
+    errors = {}
+
+    for taken_username, taken_email in User.objects.filter(
+        Q(username=username) | Q(email=email)
+    ).values_list('username', 'email'):
+        if taken_username == username:
+            errors['username'] = [UNIQUE_ERROR_MESSAGE]
+
+        if taken_email == email:
+            errors['email'] = [UNIQUE_ERROR_MESSAGE]
+
+    return errors
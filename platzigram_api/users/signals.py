@@ -0,0 +1,16 @@
+"""Users app signals.
+
+Sent by the Profile model whenever follow edges change, so other
+parts of the api can keep derived data up to date.
+"""
+
+# Django
+from django.dispatch import Signal
+
+# Sent after a profile followed other profiles, followee_pks are only
+# the profiles that were not being followed before.
+follows_created = Signal(providing_args=['follower', 'followee_pks'])
+
+# Sent after a profile unfollowed other profiles, followee_pks are only
+# the profiles that were being followed before.
+follows_deleted = Signal(providing_args=['follower', 'followee_pks'])
@@ -0,0 +1,105 @@
+"""Tests related to the export endpoint of the user model viewset."""
+
+# Django
+from django.shortcuts import reverse
+from django.utils import timezone
+
+# Django REST Framework
+from rest_framework.test import APITestCase
+
+# Models
+from platzigram_api.users.models import (
+    Profile,
+    User
+)
+
+# Utilities
+from datetime import timedelta
+import json
+
+
+class UserExportTestCase(APITestCase):
+    """Tests related to the users export endpoint."""
+
+    def setUp(self) -> None:
+        """Creates an admin and some users."""
+
+        self.admin = User.objects.create_superuser(
+            username='admin',
+            password='admin1234',
+            email='admin@gmail.com'
+        )
+
+        for username in ['cheke', 'hermabody', 'luis']:
+            User.objects.create_user(
+                username=username,
+                password='luis1234',
+                email=f'{username}@gmail.com'
+            )
+
+        self.url = reverse('users:users-export')
+
+    def get_export(self, **params) -> 'list':
+        """Returns the exported users."""
+
+        response = self.client.get(self.url, params)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+
+        return [json.loads(line) for line in b''.join(response.streaming_content).decode().splitlines()]
+
+    def test_only_admins_can_export(self) -> None:
+        """Checks that users that are not admins can not export."""
+
+        self.client.force_authenticate(User.objects.get(username='luis'))
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 403)
+
+    def test_every_user_is_exported(self) -> None:
+        """Checks that every user is exported along with its profile."""
+
+        self.client.force_authenticate(self.admin)
+
+        users = self.get_export()
+
+        self.assertEqual([user['username'] for user in users], ['admin', 'cheke', 'hermabody', 'luis'])
+        self.assertEqual(users[0]['profile']['followers_count'], 0)
+        self.assertNotIn('password', users[0])
+
+    def test_incremental_export(self) -> None:
+        """Checks that only the users or profiles updated since the given date are exported."""
+
+        self.client.force_authenticate(self.admin)
+
+        since = timezone.now()
+        past = since - timedelta(days=1)
+
+        User.objects.update(updated=past)
+        Profile.objects.update(updated=past)
+        User.objects.filter(username='cheke').update(updated=since)
+        Profile.objects.filter(user__username='luis').update(updated=since)
+
+        users = self.get_export(since=since.isoformat())
+
+        self.assertEqual([user['username'] for user in users], ['cheke', 'luis'])
+
+    def test_incremental_export_includes_follow_counter_changes(self) -> None:
+        """Checks that following an user exports both profiles whose counters changed."""
+
+        self.client.force_authenticate(self.admin)
+
+        since = timezone.now()
+        past = since - timedelta(days=1)
+
+        User.objects.update(updated=past)
+        Profile.objects.update(updated=past)
+
+        Profile.objects.get(user__username='cheke').follow(Profile.objects.get(user__username='luis'))
+
+        users = self.get_export(since=since.isoformat())
+
+        self.assertEqual([user['username'] for user in users], ['cheke', 'luis'])
+        self.assertEqual(users[1]['profile']['followers_count'], 1)
@@ -0,0 +1,490 @@
+"""Tests related to the follow endpoints of the user model viewset."""
+
+# Django
+from django.db import connection
+from django.shortcuts import reverse
+from django.test.utils import CaptureQueriesContext
+
+# Django REST Framework
+from rest_framework.test import APITestCase
+
+# Models
+from platzigram_api.users.models import (
+    Follow,
+    Profile,
+    User
+)
+
+# Follow graph
+from platzigram_api.users.graph import follow_graph
+
+
+class FollowListsTestCase(APITestCase):
+    """Tests related to the followers and following lists endpoints."""
+
+    def setUp(self) -> None:
+        """Creates an user followed by some others and logs it in."""
+
+        self.user = User.objects.create_user(
+            username='luis',
+            password='luis1234',
+            email='luis@gmail.com'
+        )
+        self.profile = self.user.profile
+
+        self.followers = []
+
+        for index in range(5):
+            follower = User.objects.create_user(
+                username=f'follower{index}',
+                password='luis1234',
+                email=f'follower{index}@gmail.com'
+            ).profile
+            follower.follow(self.profile)
+            self.followers.append(follower)
+
+        self.profile.follow(self.followers[0])
+
+        login_response = self.client.post(
+            reverse('users:users-login'),
+            data={
+                'username': 'luis',
+                'password': 'luis1234'
+            }
+        ).json()
+
+        self.http_authorization = f'JWT {login_response["access"]}'
+
+    def test_followers_are_listed_newest_first(self):
+        """Checks that the followers list shows every follower, newest first."""
+
+        response = self.client.get(
+            reverse('users:users-followers', args=['luis']),
+            HTTP_AUTHORIZATION=self.http_authorization
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [result['profile']['username'] for result in response.json()['results']],
+            ['follower4', 'follower3', 'follower2', 'follower1', 'follower0']
+        )
+
+    def test_followers_are_paginated_with_a_cursor(self):
+        """Checks that following the next links walks all the followers without repeating any."""
+
+        url = reverse('users:users-followers', args=['luis']) + '?page_size=2'
+        usernames = []
+
+        while url:
+            response = self.client.get(url, HTTP_AUTHORIZATION=self.http_authorization).json()
+            self.assertLessEqual(len(response['results']), 2)
+
+            usernames += [result['profile']['username'] for result in response['results']]
+            url = response['next']
+
+        self.assertEqual(
+            usernames,
+            ['follower4', 'follower3', 'follower2', 'follower1', 'follower0']
+        )
+
+    def test_followers_sparse_fields(self):
+        """Checks that only the requested profile fields are represented and read."""
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(
+                reverse('users:users-followers', args=['luis']) + '?fields=username,picture',
+                HTTP_AUTHORIZATION=self.http_authorization
+            )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json()['results'][0]['profile'],
+            {'username': 'follower4', 'picture': None}
+        )
+
+        list_query = next(query['sql'] for query in queries if 'users_follow' in query['sql'])
+        self.assertNotIn('biography', list_query)
+        self.assertNotIn('first_name', list_query)
+
+    def test_unknown_sparse_fields_are_rejected(self):
+        """Checks that fields outside the whitelist return 400."""
+
+        response = self.client.get(
+            reverse('users:users-followers', args=['luis']) + '?fields=username,email',
+            HTTP_AUTHORIZATION=self.http_authorization
+        )
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_following_list(self):
+        """Checks that the following list shows the followed profiles."""
+
+        response = self.client.get(
+            reverse('users:users-following', args=['luis']),
+            HTTP_AUTHORIZATION=self.http_authorization
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [result['profile']['username'] for result in response.json()['results']],
+            ['follower0']
+        )
+
+    def test_lists_of_unknown_user(self):
+        """Checks that listing followers of an user that does not exist returns 404."""
+
+        response = self.client.get(
+            reverse('users:users-followers', args=['nobody']),
+            HTTP_AUTHORIZATION=self.http_authorization
+        )
+
+        self.assertEqual(response.status_code, 404)
+
+
+class FollowEndpointTestCase(APITestCase):
+    """Tests related to the follow and unfollow endpoint."""
+
+    def setUp(self) -> None:
+        """Creates two users and logs in the first one."""
+
+        # Sets mirrored by other tests may belong to profiles with the same pks.
+        follow_graph.backend.clear()
+
+        self.profile = User.objects.create_user(
+            username='luis',
+            password='luis1234',
+            email='luis@gmail.com'
+        ).profile
+        self.other_profile = User.objects.create_user(
+            username='pablo',
+            password='pablo1234',
+            email='pablo@gmail.com'
+        ).profile
+
+        login_response = self.client.post(
+            reverse('users:users-login'),
+            data={
+                'username': 'luis',
+                'password': 'luis1234'
+            }
+        ).json()
+
+        self.http_authorization = f'JWT {login_response["access"]}'
+        self.url = reverse('users:users-follow', args=['pablo'])
+
+    def test_follow_is_idempotent(self):
+        """Checks that following twice creates a single edge and counts it once."""
+
+        first_response = self.client.post(self.url, HTTP_AUTHORIZATION=self.http_authorization)
+        second_response = self.client.post(self.url, HTTP_AUTHORIZATION=self.http_authorization)
+
+        self.assertEqual(first_response.status_code, 201)
+        self.assertEqual(second_response.status_code, 200)
+        self.assertEqual(
+            second_response.json(),
+            {'username': 'pablo', 'is_following': True, 'followed_by': False}
+        )
+        self.assertEqual(Follow.objects.filter(follower=self.profile, followee=self.other_profile).count(), 1)
+
+        self.other_profile.refresh_from_db()
+        self.assertEqual(self.other_profile.followers_count, 1)
+
+    def test_follow_answers_if_the_user_follows_back(self):
+        """Checks that following an user that already follows the requesting one says so."""
+
+        self.other_profile.follow(self.profile)
+
+        response = self.client.post(self.url, HTTP_AUTHORIZATION=self.http_authorization)
+
+        self.assertTrue(response.json()['followed_by'])
+
+    def test_unfollow_is_idempotent(self):
+        """Checks that unfollowing twice deletes the edge and discounts it once."""
+
+        self.profile.follow(self.other_profile)
+
+        first_response = self.client.delete(self.url, HTTP_AUTHORIZATION=self.http_authorization)
+        second_response = self.client.delete(self.url, HTTP_AUTHORIZATION=self.http_authorization)
+
+        self.assertEqual(first_response.status_code, 204)
+        self.assertEqual(second_response.status_code, 204)
+        self.assertFalse(Follow.objects.filter(follower=self.profile, followee=self.other_profile).exists())
+
+        self.other_profile.refresh_from_db()
+        self.assertEqual(self.other_profile.followers_count, 0)
+
+    def test_can_not_follow_yourself(self):
+        """Checks that an user can not follow itself."""
+
+        response = self.client.post(
+            reverse('users:users-follow', args=['luis']),
+            HTTP_AUTHORIZATION=self.http_authorization
+        )
+
+        self.assertEqual(response.status_code, 400)
+
+
+class BulkFollowEndpointTestCase(APITestCase):
+    """Tests related to the bulk follow endpoint."""
+
+    def setUp(self) -> None:
+        """Creates an user with some suggested accounts and logs it in."""
+
+        self.profile = User.objects.create_user(
+            username='luis',
+            password='luis1234',
+            email='luis@gmail.com'
+        ).profile
+
+        self.suggested_profiles = [
+            User.objects.create_user(
+                username=f'suggested{index}',
+                password='luis1234',
+                email=f'suggested{index}@gmail.com'
+            ).profile
+            for index in range(3)
+        ]
+        self.profile.follow(self.suggested_profiles[0])
+
+        login_response = self.client.post(
+            reverse('users:users-login'),
+            data={
+                'username': 'luis',
+                'password': 'luis1234'
+            }
+        ).json()
+
+        self.http_authorization = f'JWT {login_response["access"]}'
+        self.url = reverse('users:users-bulk-follow')
+
+    def test_bulk_follow(self):
+        """Checks that bulk follow reports each target and keeps the counters right."""
+
+        response = self.client.post(
+            self.url,
+            data={'usernames': ['suggested0', 'suggested1', 'suggested2', 'nobody', 'luis']},
+            format='json',
+            HTTP_AUTHORIZATION=self.http_authorization
+        )
+
+        self.assertEqual(
+            response.json()['results'],
+            {
+                'suggested0': 'already_following',
+                'suggested1': 'followed',
+                'suggested2': 'followed',
+                'nobody': 'not_found',
+                'luis': 'self',
+            }
+        )
+
+        self.profile.refresh_from_db()
+        self.assertEqual(self.profile.following_count, 3)
+        self.assertEqual(Follow.objects.filter(follower=self.profile).count(), 3)
+
+        for profile in self.suggested_profiles:
+            profile.refresh_from_db()
+            self.assertEqual(profile.followers_count, 1)
+
+    def test_bulk_unfollow(self):
+        """Checks that bulk unfollow reports each target and keeps the counters right."""
+
+        response = self.client.delete(
+            self.url,
+            data={'usernames': ['suggested0', 'suggested1']},
+            format='json',
+            HTTP_AUTHORIZATION=self.http_authorization
+        )
+
+        self.assertEqual(
+            response.json()['results'],
+            {
+                'suggested0': 'unfollowed',
+                'suggested1': 'not_following',
+            }
+        )
+
+        self.profile.refresh_from_db()
+        self.assertEqual(self.profile.following_count, 0)
+        self.assertFalse(Follow.objects.filter(follower=self.profile).exists())
+
+
+class RelationshipsEndpointTestCase(APITestCase):
+    """Tests related to the relationships endpoint."""
+
+    def setUp(self) -> None:
+        """Creates some users related to the requesting one and logs it in."""
+
+        # Sets mirrored by other tests may belong to profiles with the same pks.
+        follow_graph.backend.clear()
+
+        self.profile = User.objects.create_user(
+            username='luis',
+            password='luis1234',
+            email='luis@gmail.com'
+        ).profile
+
+        profiles = {
+            username: User.objects.create_user(
+                username=username,
+                password='luis1234',
+                email=f'{username}@gmail.com'
+            ).profile
+            for username in ['pablo', 'eli', 'cheke']
+        }
+
+        self.profile.follow(profiles['pablo'])
+        self.profile.follow(profiles['eli'])
+        profiles['eli'].follow(self.profile)
+        profiles['cheke'].follow(self.profile)
+        profiles['cheke'].follow(profiles['pablo'])
+
+        login_response = self.client.post(
+            reverse('users:users-login'),
+            data={
+                'username': 'luis',
+                'password': 'luis1234'
+            }
+        ).json()
+
+        self.http_authorization = f'JWT {login_response["access"]}'
+
+    def test_relationships(self):
+        """Checks that once the follow graph is loaded every requested user gets its relationship in a single query."""
+
+        load_threshold = follow_graph.load_threshold
+        follow_graph.load_threshold = 0
+        self.addCleanup(setattr, follow_graph, 'load_threshold', load_threshold)
+
+        profile = Profile.objects.get(user__username='luis')
+        profile.relationships(['pablo'])
+
+        with self.assertNumQueries(1):
+            relationships = profile.relationships(['pablo', 'eli', 'cheke', 'nobody'])
+
+        self.assertEqual(
+            relationships,
+            {
+                'pablo': {'following': True, 'followed_by': False},
+                'eli': {'following': True, 'followed_by': True},
+                'cheke': {'following': False, 'followed_by': True},
+                'nobody': {'following': False, 'followed_by': False},
+            }
+        )
+
+    def test_relationships_of_small_profiles(self):
+        """Checks that a profile below the load threshold takes a query per set and does not load them."""
+
+        profile = Profile.objects.get(user__username='luis')
+
+        with self.assertNumQueries(3):
+            relationships = profile.relationships(['pablo', 'eli', 'cheke'])
+
+        self.assertEqual(
+            relationships,
+            {
+                'pablo': {'following': True, 'followed_by': False},
+                'eli': {'following': True, 'followed_by': True},
+                'cheke': {'following': False, 'followed_by': True},
+            }
+        )
+        self.assertIsNone(follow_graph.backend.count(follow_graph.following_key(profile.pk)))
+
+    def test_relationships_endpoint(self):
+        """Checks that the endpoint answers the relationships of the given usernames."""
+
+        response = self.client.get(
+            reverse('users:users-relationships') + '?usernames=pablo,cheke',
+            HTTP_AUTHORIZATION=self.http_authorization
+        )
+
+        self.assertEqual(
+            response.json(),
+            {
+                'pablo': {'following': True, 'followed_by': False},
+                'cheke': {'following': False, 'followed_by': True},
+            }
+        )
+
+
+class ProfileBatchTestCase(APITestCase):
+    """Tests related to the batch endpoint."""
+
+    def setUp(self) -> None:
+        """Creates some users and logs one of them in."""
+
+        for username in ['cheke', 'hermabody', 'luis']:
+            User.objects.create_user(
+                username=username,
+                password='luis1234',
+                email=f'{username}@gmail.com',
+                first_name=username.title()
+            )
+
+        login_response = self.client.post(
+            reverse('users:users-login'),
+            data={
+                'username': 'luis',
+                'password': 'luis1234'
+            }
+        ).json()
+
+        self.http_authorization = f'JWT {login_response["access"]}'
+        self.url = reverse('users:users-batch')
+
+    def test_profiles_are_returned_by_username(self):
+        """Checks that found users are keyed by username and the rest reported as missing."""
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(
+                f'{self.url}?usernames=cheke,nobody,hermabody',
+                HTTP_AUTHORIZATION=self.http_authorization
+            )
+
+        self.assertEqual(response.status_code, 200)
+
+        data = response.json()
+        self.assertEqual(set(data['results']), {'cheke', 'hermabody'})
+        self.assertEqual(data['results']['cheke']['first_name'], 'Cheke')
+        self.assertEqual(data['results']['cheke']['followers_count'], 0)
+        self.assertEqual(data['missing'], ['nobody'])
+        self.assertEqual(len([query for query in queries if 'users_profile' in query['sql']]), 1)
+
+    def test_users_without_profile_are_found(self):
+        """Checks that users whose profile is not created yet get the card of a new profile."""
+
+        User.objects.bulk_create([User(username='pablo', email='pablo@gmail.com', first_name='Pablo')])
+
+        response = self.client.get(
+            f'{self.url}?usernames=pablo,cheke',
+            HTTP_AUTHORIZATION=self.http_authorization
+        )
+
+        data = response.json()
+        self.assertEqual(data['missing'], [])
+        self.assertEqual(data['results']['pablo']['first_name'], 'Pablo')
+        self.assertEqual(data['results']['pablo']['followers_count'], 0)
+        self.assertEqual(data['results']['pablo']['biography'], '')
+        self.assertIsNone(data['results']['pablo']['picture'])
+
+    def test_batch_sparse_fields(self):
+        """Checks that the batch endpoint honors the requested fields."""
+
+        response = self.client.get(
+            f'{self.url}?usernames=cheke&fields=username',
+            HTTP_AUTHORIZATION=self.http_authorization
+        )
+
+        self.assertEqual(response.json()['results'], {'cheke': {'username': 'cheke'}})
+
+    def test_batch_size_is_limited(self):
+        """Checks that more than 100 usernames are rejected."""
+
+        usernames = ','.join(f'user{index}' for index in range(101))
+
+        response = self.client.get(
+            f'{self.url}?usernames={usernames}',
+            HTTP_AUTHORIZATION=self.http_authorization
+        )
+
+        self.assertEqual(response.status_code, 400)
@@ -10,9 +10,22 @@ from django.urls import (
 # Django REST Framework
 from rest_framework.test import (
     APITestCase,
+    APIRequestFactory,
     URLPatternsTestCase
 )
 
+# Authentication
+from platzigram_api.utils.jwt import (
+    CachedJWTAuthentication,
+    RevocableRefreshToken
+)
+
+# Models
+from platzigram_api.users.models import User
+
+# Utilities
+from unittest import mock
+
 # Views
 from .dummie_views import AuthenticationRequiredDummieView
 
@@ -71,6 +84,35 @@ class UserLoginTestCase(APITestCase, URLPatternsTestCase):
         )
         self.assertEqual(response.status_code, 200)
 
+    def test_authenticated_user_is_read_from_the_cache(self):
+        """Checks that once an user authenticated its next requests do not query the database."""
+
+        request = APIRequestFactory().get('/', HTTP_AUTHORIZATION=f'JWT {self.token}')
+        authentication = CachedJWTAuthentication()
+
+        authentication.authenticate(request)
+
+        with self.assertNumQueries(0):
+            user, _ = authentication.authenticate(request)
+
+        self.assertEqual(user.username, self.username)
+
+    def test_cached_user_is_invalidated_when_saved(self):
+        """Checks that saving an user makes the authentication read the new data."""
+
+        request = APIRequestFactory().get('/', HTTP_AUTHORIZATION=f'JWT {self.token}')
+        authentication = CachedJWTAuthentication()
+
+        authentication.authenticate(request)
+
+        user = User.objects.get(username=self.username)
+        user.first_name = 'Pablo'
+        user.save()
+
+        user, _ = authentication.authenticate(request)
+
+        self.assertEqual(user.first_name, 'Pablo')
+
     def test_refresh_token_is_no_longer_valid_when_password_is_changed(self):
         """Checks if an authentication token is no longer valid when the user password is changed."""
 
@@ -96,3 +138,69 @@ class UserLoginTestCase(APITestCase, URLPatternsTestCase):
         )
 
         self.assertEqual(response.status_code, 401)
+
+    def test_tokens_are_no_longer_valid_when_password_is_changed(self):
+        """Checks if the tokens of every device are no longer valid when the user password is changed."""
+
+        other_device_response = self.client.post(
+            self.url,
+            data={
+                'username': self.username,
+                'password': self.password
+            },
+            format='json'
+        ).json()
+
+        new_password = 'holaxd1234'
+
+        self.client.patch(
+            reverse('users:users-detail', args=[self.username]),
+            data={
+                'password': self.password,
+                'new_password': new_password,
+                'new_password_confirmation': new_password,
+                'refresh_token': self.refresh_token
+            },
+            HTTP_AUTHORIZATION=f'JWT {self.token}',
+            format='json'
+        )
+
+        response = self.client.get(
+            reverse('is_authenticated'),
+            HTTP_AUTHORIZATION=f"JWT {other_device_response['access']}"
+        )
+        self.assertEqual(response.status_code, 401)
+
+        response = self.client.post(
+            reverse('users:users-refresh-token'),
+            data={
+                "refresh": other_device_response['refresh']
+            }
+        )
+        self.assertEqual(response.status_code, 401)
+
+    def test_refresh_token_is_verified_once_when_password_is_changed(self):
+        """Checks that the refresh token sent to change the password is decoded and verified a single time."""
+
+        new_password = 'holaxd1234'
+
+        with mock.patch.object(
+            RevocableRefreshToken,
+            'verify',
+            autospec=True,
+            side_effect=RevocableRefreshToken.verify
+        ) as verify:
+            response = self.client.patch(
+                reverse('users:users-detail', args=[self.username]),
+                data={
+                    'password': self.password,
+                    'new_password': new_password,
+                    'new_password_confirmation': new_password,
+                    'refresh_token': self.refresh_token
+                },
+                HTTP_AUTHORIZATION=f'JWT {self.token}',
+                format='json'
+            )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(verify.call_count, 1)
@@ -1,7 +1,9 @@
 """Tests related to test the RUD of User Model"""
 
 # Django
+from django.db import connection
 from django.shortcuts import reverse
+from django.test.utils import CaptureQueriesContext
 from django.contrib.auth import authenticate
 
 # Django REST Framework
@@ -13,6 +15,9 @@ from platzigram_api.users.models import (
     User
 )
 
+# Utilities
+from platzigram_api.utils.cache import response_cache
+
 
 class UserModelCRUDTestCase(APITestCase):
     """Tests related to the RUD of the user model."""
@@ -77,6 +82,28 @@ class UserModelCRUDTestCase(APITestCase):
             }
         )
 
+    def test_read_user_sparse_fields(self):
+        """Tests retrieve endpoint only represents and reads the requested fields."""
+
+        url = f'{self.url}?fields=username,email'
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, HTTP_AUTHORIZATION=self.http_authorization)
+
+        self.assertEqual(response.json(), {'username': self.username, 'email': self.user_data['email']})
+        retrieve_query = next(
+            query['sql'] for query in queries
+            if '"users_user"."updated"' in query['sql'] and '"users_user"."password"' not in query['sql']
+        )
+        self.assertNotIn('phone_number', retrieve_query)
+        self.assertNotIn('users_profile', retrieve_query)
+
+        response = self.client.get(self.url, HTTP_AUTHORIZATION=self.http_authorization)
+        self.assertIn('phone_number', response.json())
+
+        response = self.client.get(f'{self.url}?fields=password', HTTP_AUTHORIZATION=self.http_authorization)
+        self.assertEqual(response.status_code, 400)
+
     def test_update_user(self):
         """Tests full update endpoint of the user model."""
 
@@ -150,6 +177,30 @@ class UserModelCRUDTestCase(APITestCase):
             )
         )
 
+    def test_change_password_without_refresh_token(self):
+        """Tests that the refresh token is not required to change the password and old tokens are revoked."""
+
+        response = self.client.patch(
+            self.url,
+            data={
+                'password': self.user_data['password'],
+                'new_password': 'pablo123456',
+                'new_password_confirmation': 'pablo123456'
+            },
+            format='json',
+            HTTP_AUTHORIZATION=self.http_authorization
+        )
+
+        self.assertEqual(response.status_code, 200)
+
+        response = self.client.post(
+            reverse('users:users-refresh-token'),
+            data={'refresh': self.refresh_token},
+            format='json'
+        )
+
+        self.assertEqual(response.status_code, 401)
+
     def test_delete_user(self):
         """Tests delete endpoint of the user model."""
 
@@ -170,3 +221,144 @@ class UserModelCRUDTestCase(APITestCase):
         self.assertFalse(
             Profile.objects.filter(pk=profile_pk).exists()
         )
+
+    def test_read_user_not_modified(self):
+        """Tests retrieve endpoint answers conditional requests with 304 until the user changes."""
+
+        response = self.client.get(self.url, HTTP_AUTHORIZATION=self.http_authorization)
+        etag = response['ETag']
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('Last-Modified', response)
+
+        # Authentication reads the user from the cache and the validators
+        # come from the response cache, only the request savepoint runs.
+        with self.assertNumQueries(2):
+            response = self.client.get(
+                self.url,
+                HTTP_AUTHORIZATION=self.http_authorization,
+                HTTP_IF_NONE_MATCH=etag
+            )
+
+        self.assertEqual(response.status_code, 304)
+
+        response = self.client.get(
+            self.url,
+            HTTP_AUTHORIZATION=self.http_authorization,
+            HTTP_IF_MODIFIED_SINCE=response['Last-Modified']
+        )
+        self.assertEqual(response.status_code, 304)
+
+        user = User.objects.get(username=self.username)
+        user.first_name = 'Pablo'
+        user.save()
+
+        response = self.client.get(
+            self.url,
+            HTTP_AUTHORIZATION=self.http_authorization,
+            HTTP_IF_NONE_MATCH=etag
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_read_user_etag_ignores_follows(self):
+        """Tests retrieve endpoint keeps the ETag when the user is followed, as the body has no profile fields."""
+
+        response = self.client.get(self.url, HTTP_AUTHORIZATION=self.http_authorization)
+        etag = response['ETag']
+
+        follower = User.objects.create_user(
+            username='pablo',
+            password='pablo1234',
+            email='pablo@gmail.com'
+        )
+        follower.profile.follow(Profile.objects.get(user__username=self.username))
+
+        # Skips the response cache, so the validators are read again.
+        response_cache.invalidate(self.username)
+
+        response = self.client.get(
+            self.url,
+            HTTP_AUTHORIZATION=self.http_authorization,
+            HTTP_IF_NONE_MATCH=etag
+        )
+
+        self.assertEqual(response.status_code, 304)
+
+    def test_read_user_is_served_from_the_response_cache(self):
+        """Tests retrieve endpoint caches its response until the user or its profile change."""
+
+        stats = response_cache.get_stats('retrieve')
+
+        response = self.client.get(self.url, HTTP_AUTHORIZATION=self.http_authorization)
+
+        with self.assertNumQueries(2):
+            cached_response = self.client.get(self.url, HTTP_AUTHORIZATION=self.http_authorization)
+
+        self.assertEqual(cached_response.status_code, 200)
+        self.assertEqual(cached_response.json(), response.json())
+        self.assertEqual(cached_response['ETag'], response['ETag'])
+        self.assertEqual(
+            response_cache.get_stats('retrieve'),
+            {'hits': stats['hits'] + 1, 'misses': stats['misses'] + 1}
+        )
+
+        user = User.objects.get(username=self.username)
+        user.first_name = 'Pablo'
+        user.save()
+
+        response = self.client.get(self.url, HTTP_AUTHORIZATION=self.http_authorization)
+        self.assertEqual(response.json()['first_name'], 'Pablo')
+
+        user.username = 'pablo'
+        user.save()
+
+        response = self.client.get(self.url, HTTP_AUTHORIZATION=self.http_authorization)
+        self.assertEqual(response.status_code, 404)
+
+    def test_read_me(self):
+        """Tests me endpoint returns the requesting user without querying it again."""
+
+        url = reverse('users:users-me')
+
+        self.client.get(url, HTTP_AUTHORIZATION=self.http_authorization)
+
+        # Only the request savepoint runs, the user comes from the authentication.
+        with self.assertNumQueries(2):
+            response = self.client.get(url, HTTP_AUTHORIZATION=self.http_authorization)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json(),
+            self.client.get(self.url, HTTP_AUTHORIZATION=self.http_authorization).json()
+        )
+
+        response = self.client.get(f'{url}?fields=username', HTTP_AUTHORIZATION=self.http_authorization)
+        self.assertEqual(response.json(), {'username': self.username})
+
+    def test_update_me(self):
+        """Tests me endpoint updates the requesting user."""
+
+        url = reverse('users:users-me')
+
+        response = self.client.patch(
+            url,
+            data={'first_name': 'Pablo'},
+            format='json',
+            HTTP_AUTHORIZATION=self.http_authorization
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['first_name'], 'Pablo')
+        self.assertEqual(User.objects.get(username=self.username).first_name, 'Pablo')
+
+        response = self.client.get(url, HTTP_AUTHORIZATION=self.http_authorization)
+        self.assertEqual(response.json()['first_name'], 'Pablo')
+
+    def test_me_requires_authentication(self):
+        """Tests me endpoint is not available to anonymous users."""
+
+        response = self.client.get(reverse('users:users-me'))
+
+        self.assertEqual(response.status_code, 401)
@@ -74,3 +74,36 @@ class SignupUserTest(APITestCase):
             User.objects.get(username=username),
             user
         )
+
+    def test_signup_query_budget(self):
+        """Test that the user, its profile and its confirmation email are created within the query budget."""
+
+        user_data = dict(self.user_data, username='pablo', email='pablo@gmail.com')
+
+        # Request and signup savepoints and the user, profile and outbox INSERTs.
+        with self.assertNumQueries(7):
+            response = self.client.post(self.url, data=user_data, format='json')
+
+        self.assertEqual(response.status_code, 201)
+
+    def test_taken_username_and_email_are_rejected(self):
+        """Test that signing up with a taken username or email returns the unique validation errors."""
+
+        response = self.client.post(
+            self.url,
+            data=dict(self.user_data, email='pablo@gmail.com'),
+            format='json'
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {'username': ['This field must be unique.']})
+
+        response = self.client.post(
+            self.url,
+            data=dict(self.user_data, username='pablo'),
+            format='json'
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {'email': ['This field must be unique.']})
+        self.assertEqual(User.objects.count(), 1)
@@ -1,6 +1,7 @@
 """Api tests related to the verification functionality on API."""
 
 # Django
+from django.core.cache import cache
 from django.shortcuts import reverse
 
 # Django REST Framework
@@ -10,7 +11,10 @@ from rest_framework.test import APITestCase
 from platzigram_api.users.models import User
 
 # Serializers
-from platzigram_api.users.serializers import UserSignupSerializer
+from platzigram_api.users.serializers import (
+    UserSignupSerializer,
+    VerifyUserSerializer
+)
 
 
 class UserVerificationTest(APITestCase):
@@ -19,6 +23,9 @@ class UserVerificationTest(APITestCase):
     def setUp(self) -> None:
         """Sets up everything related to this test case class."""
 
+        # Tokens issued on the same second are equal, forgets the ones consumed by other tests.
+        cache.clear()
+
         self.user_data = {
             'username': 'luis',
             'email': 'luis@gmail.com',
@@ -55,3 +62,65 @@ class UserVerificationTest(APITestCase):
         user = User.objects.get(username=self.username)
 
         self.assertTrue(user.is_email_verified)
+
+    def test_user_verification_replaces_the_cached_user_response(self):
+        """Check that the cached response of the user is not served once it is verified."""
+
+        self.client.force_authenticate(user=self.user)
+        url = reverse('users:users-detail', args=[self.username])
+
+        self.assertFalse(self.client.get(url).json()['is_email_verified'])
+
+        self.client.post(
+            reverse('users:users-verify'),
+            data={'token': UserSignupSerializer.generate_verification_token(self.user)},
+            format='json'
+        )
+
+        self.assertTrue(self.client.get(url).json()['is_email_verified'])
+
+    def test_user_verification_is_a_conditional_update(self):
+        """Check that verifying an user costs its conditional UPDATE and reading it back."""
+
+        serializer = VerifyUserSerializer(
+            data={'token': UserSignupSerializer.generate_verification_token(self.user)}
+        )
+
+        with self.assertNumQueries(0):
+            self.assertTrue(serializer.is_valid())
+
+        with self.assertNumQueries(2):
+            user = serializer.save()
+
+        self.assertTrue(user.is_email_verified)
+
+    def test_replayed_token_is_rejected_without_queries(self):
+        """Check that a token can not be used twice and the second attempt does not query the database."""
+
+        url = reverse('users:users-verify')
+        verification_token = UserSignupSerializer.generate_verification_token(self.user)
+
+        response = self.client.post(url, data={'token': verification_token}, format='json')
+        self.assertEqual(response.status_code, 200)
+
+        serializer = VerifyUserSerializer(data={'token': verification_token})
+
+        with self.assertNumQueries(0):
+            self.assertFalse(serializer.is_valid())
+
+        response = self.client.post(url, data={'token': verification_token}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_verified_user_can_not_be_verified_again(self):
+        """Check that a new token for an already verified user is rejected."""
+
+        User.objects.filter(pk=self.user.pk).update(is_email_verified=True)
+
+        response = self.client.post(
+            reverse('users:users-verify'),
+            data={'token': UserSignupSerializer.generate_verification_token(self.user)},
+            format='json'
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {'non_field_errors': ['User is already verified.']})
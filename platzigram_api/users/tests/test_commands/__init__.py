@@ -0,0 +1 @@
+"""Tests related to the management commands of users app."""
@@ -0,0 +1,48 @@
+"""Backfill profiles command related tests."""
+
+# Django
+from django.test import TestCase
+from django.core.management import call_command
+
+# Utilities
+from io import StringIO
+
+# Models
+from platzigram_api.users.models import (
+    User,
+    Profile
+)
+
+
+class BackfillProfilesTestCase(TestCase):
+    """Tests that the backfill command creates the missing profiles."""
+
+    def setUp(self) -> None:
+        """Creates three users and deletes the profile of two of them."""
+
+        for username in ['cheke', 'hermabody', 'luis']:
+            User.objects.create_user(
+                username=username,
+                password='idkskere',
+                email=f'{username}@fake.com'
+            )
+
+        Profile.objects.exclude(user__username='luis').delete()
+
+    def test_dry_run_does_not_create_profiles(self) -> None:
+        """Checks that a dry run only reports the missing profiles."""
+
+        out = StringIO()
+
+        call_command('backfill_profiles', dry_run=True, stdout=out)
+
+        self.assertEqual(Profile.objects.count(), 1)
+        self.assertIn('2 of 3 users do not have a profile.', out.getvalue())
+
+    def test_missing_profiles_are_created(self) -> None:
+        """Checks that every user ends up with a profile."""
+
+        call_command('backfill_profiles', batch_size=2, stdout=StringIO())
+
+        self.assertFalse(User.objects.filter(profile__isnull=True).exists())
+        self.assertEqual(Profile.objects.count(), 3)
@@ -0,0 +1,44 @@
+"""Benchmark token refresh command related tests."""
+
+# Django
+from django.test import TestCase
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+# Utilities
+from io import StringIO
+
+# Models
+from platzigram_api.users.models import User
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+
+
+class BenchmarkTokenRefreshTestCase(TestCase):
+    """Tests that the benchmark only fills a database it was told about."""
+
+    def setUp(self) -> None:
+        """Creates the user the benchmark issues its token to."""
+
+        User.objects.create_user(
+            username='luis',
+            password='luis1234',
+            email='luis@gmail.com'
+        )
+
+    def test_default_size_requires_the_database_name(self) -> None:
+        """Checks that without --jtis the command refuses to run unless the database is confirmed."""
+
+        with self.assertRaises(CommandError):
+            call_command('benchmark_token_refresh', username='luis', stdout=StringIO())
+
+        with self.assertRaises(CommandError):
+            call_command('benchmark_token_refresh', username='luis', database='production', stdout=StringIO())
+
+        self.assertFalse(OutstandingToken.objects.exists())
+
+    def test_explicit_size(self) -> None:
+        """Checks that the command runs with an explicit --jtis and deletes its tokens."""
+
+        call_command('benchmark_token_refresh', username='luis', jtis=10, requests=2, stdout=StringIO())
+
+        self.assertFalse(OutstandingToken.objects.filter(jti__startswith='benchmark-').exists())
@@ -0,0 +1,73 @@
+"""Import users command related tests."""
+
+# Django
+from django.test import TestCase
+from django.core.management import call_command
+from django.contrib.auth import authenticate
+
+# Utilities
+from io import StringIO
+import json
+import os
+import tempfile
+
+# Models
+from platzigram_api.users.models import (
+    Profile,
+    User
+)
+
+
+class ImportUsersTestCase(TestCase):
+    """Tests that the import command creates users and profiles in chunks."""
+
+    def setUp(self) -> None:
+        """Creates an user and a file with users to import."""
+
+        User.objects.create_user(
+            username='luis',
+            password='luis1234',
+            email='luis@gmail.com'
+        )
+
+        rows = [
+            {'username': 'cheke', 'email': 'cheke@fake.com', 'password': 'cheke1234', 'website': 'https://cheke.com'},
+            {'username': 'luis', 'email': 'other@fake.com', 'password': 'luis1234'},
+            {'username': 'hermabody', 'email': 'not an email', 'password': 'herma1234'},
+            {'username': 'hermabody', 'email': 'hermabody@fake.com', 'password': 'herma1234'},
+            {'username': 'pablo', 'email': 'hermabody@fake.com', 'password': 'pablo1234'},
+        ]
+
+        directory = tempfile.mkdtemp()
+        self.path = os.path.join(directory, 'users.jsonl')
+
+        with open(self.path, 'w') as users_file:
+            users_file.writelines(json.dumps(row) + '\n' for row in rows)
+
+    def test_valid_rows_are_imported(self) -> None:
+        """Checks that only the valid and not taken rows are imported along with its profiles."""
+
+        call_command('import_users', self.path, batch_size=2, workers=0, stdout=StringIO(), stderr=StringIO())
+
+        self.assertEqual(
+            set(User.objects.values_list('username', flat=True)),
+            {'luis', 'cheke', 'hermabody'}
+        )
+        self.assertEqual(Profile.objects.get(user__username='cheke').website, 'https://cheke.com')
+        self.assertEqual(Profile.objects.count(), 3)
+        self.assertIsNotNone(authenticate(username='cheke', password='cheke1234'))
+        self.assertFalse(os.path.exists(f'{self.path}.checkpoint'))
+
+    def test_import_resumes_from_the_checkpoint(self) -> None:
+        """Checks that the rows before the checkpoint are not read again."""
+
+        with open(f'{self.path}.checkpoint', 'w') as checkpoint_file:
+            json.dump({'position': 3, 'created': 1, 'rejected': 2}, checkpoint_file)
+
+        out = StringIO()
+
+        call_command('import_users', self.path, batch_size=2, workers=0, stdout=out, stderr=StringIO())
+
+        self.assertFalse(User.objects.filter(username='cheke').exists())
+        self.assertTrue(User.objects.filter(username='hermabody').exists())
+        self.assertIn('Imported 2 users, rejected 3 rows.', out.getvalue())
@@ -0,0 +1,54 @@
+"""Prune tokens command related tests."""
+
+# Django
+from django.test import TestCase
+from django.core.management import call_command
+from django.utils import timezone
+
+# Utilities
+from datetime import timedelta
+from io import StringIO
+
+# Models
+from platzigram_api.users.models import User
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken,
+    OutstandingToken
+)
+
+
+class PruneTokensTestCase(TestCase):
+    """Tests that the prune command only deletes expired tokens."""
+
+    def setUp(self) -> None:
+        """Creates expired, blacklisted and still valid tokens."""
+
+        user = User.objects.create_user(
+            username='luis',
+            password='luis1234',
+            email='luis@gmail.com'
+        )
+
+        now = timezone.now()
+
+        for jti in ['expired-1', 'expired-2', 'expired-3', 'valid']:
+            OutstandingToken.objects.create(
+                user=user,
+                jti=jti,
+                token=jti,
+                expires_at=now + timedelta(days=1 if jti == 'valid' else -1)
+            )
+
+        for jti in ['expired-1', 'valid']:
+            BlacklistedToken.objects.create(token=OutstandingToken.objects.get(jti=jti))
+
+    def test_expired_tokens_are_deleted(self) -> None:
+        """Checks that expired tokens and their blacklist rows are deleted in batches."""
+
+        out = StringIO()
+
+        call_command('prune_tokens', batch_size=2, sleep=0, stdout=out)
+
+        self.assertEqual(list(OutstandingToken.objects.values_list('jti', flat=True)), ['valid'])
+        self.assertEqual(list(BlacklistedToken.objects.values_list('token__jti', flat=True)), ['valid'])
+        self.assertIn('Pruned 3 outstanding and 1 blacklisted tokens', out.getvalue())
@@ -0,0 +1,58 @@
+"""Reconcile follow counters command related tests."""
+
+# Django
+from django.test import TestCase
+from django.core.management import call_command
+
+# Utilities
+from io import StringIO
+
+# Models
+from platzigram_api.users.models import (
+    User,
+    Profile
+)
+
+
+class ReconcileFollowCountersTestCase(TestCase):
+    """Tests that the reconcile command repairs counters that drifted."""
+
+    def setUp(self) -> None:
+        """Creates three profiles following each other."""
+
+        self.profiles = []
+
+        for username in ['cheke', 'hermabody', 'luis']:
+            user = User.objects.create_user(
+                username=username,
+                password='idkskere',
+                email=f'{username}@fake.com'
+            )
+            self.profiles.append(user.profile)
+
+        cheke, hermabody, luis = self.profiles
+
+        cheke.follow(hermabody)
+        cheke.follow(luis)
+        luis.follow(hermabody)
+
+    def test_drifted_counters_are_repaired(self) -> None:
+        """Checks that wrong counters are replaced by the real totals."""
+
+        Profile.objects.update(followers_count=10, following_count=10)
+
+        call_command('reconcile_follow_counters', batch_size=2, stdout=StringIO())
+
+        counters = {
+            profile.user.username: (profile.followers_count, profile.following_count)
+            for profile in Profile.objects.select_related('user')
+        }
+
+        self.assertEqual(
+            counters,
+            {
+                'cheke': (0, 2),
+                'hermabody': (2, 0),
+                'luis': (1, 1),
+            }
+        )
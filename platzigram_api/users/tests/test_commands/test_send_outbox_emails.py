@@ -0,0 +1,83 @@
+"""Send outbox emails command related tests."""
+
+# Django
+from django.test import TestCase
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+from django.shortcuts import reverse
+
+# Utilities
+from io import StringIO
+from unittest import mock
+
+# Models
+from platzigram_api.users.models import OutboxEmail
+
+
+class SendOutboxEmailsTestCase(TestCase):
+    """Tests that the signup email goes through the outbox."""
+
+    def setUp(self) -> None:
+        """Signs up an user."""
+
+        self.client.post(
+            reverse('users:users-signup'),
+            data={
+                'username': 'luis',
+                'email': 'luis@gmail.com',
+                'password': 'luis1234',
+                'password_confirmation': 'luis1234',
+                'first_name': 'Luis',
+                'last_name': 'Perez',
+                'phone_number': '+1 4687897977854'
+            },
+            content_type='application/json'
+        )
+
+    def test_signup_only_enqueues_the_email(self) -> None:
+        """Checks that signing up stores the email on the outbox without sending it."""
+
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(OutboxEmail.objects.filter(status=OutboxEmail.PENDING).count(), 1)
+
+    def test_outbox_is_drained(self) -> None:
+        """Checks that the command sends the pending emails."""
+
+        call_command('send_outbox_emails', stdout=StringIO())
+
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ['luis@gmail.com'])
+        self.assertEqual(mail.outbox[0].alternatives[0][1], 'text/html')
+        self.assertEqual(OutboxEmail.objects.get().status, OutboxEmail.SENT)
+
+    def test_failed_emails_are_retried_later(self) -> None:
+        """Checks that a failed email is postponed and finally marked as failed."""
+
+        with mock.patch.object(EmailBackend, 'send_messages', side_effect=ConnectionError('Unreachable')):
+            call_command('send_outbox_emails', stdout=StringIO())
+
+            email = OutboxEmail.objects.get()
+            self.assertEqual(email.status, OutboxEmail.PENDING)
+            self.assertEqual(email.attempts, 1)
+            self.assertEqual(email.last_error, 'Unreachable')
+
+            OutboxEmail.objects.update(next_attempt_at=email.created)
+            call_command('send_outbox_emails', max_attempts=2, stdout=StringIO())
+
+        self.assertEqual(OutboxEmail.objects.get().status, OutboxEmail.FAILED)
+        self.assertEqual(len(mail.outbox), 0)
+
+    def test_connection_failures_count_as_failed_attempts(self) -> None:
+        """Checks that when the connection can not be opened the emails are postponed."""
+
+        with mock.patch.object(EmailBackend, 'open', side_effect=ConnectionError('Refused')):
+            out = StringIO()
+            call_command('send_outbox_emails', stdout=out)
+
+        email = OutboxEmail.objects.get()
+        self.assertEqual(email.status, OutboxEmail.PENDING)
+        self.assertEqual(email.attempts, 1)
+        self.assertEqual(email.last_error, 'Refused')
+        self.assertGreater(email.next_attempt_at, email.created)
+        self.assertIn('Sent 0 emails, 1 failed.', out.getvalue())
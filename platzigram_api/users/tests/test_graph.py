@@ -0,0 +1,241 @@
+"""Follow graph cache related tests."""
+
+# Django
+from django.test import (
+    SimpleTestCase,
+    TransactionTestCase,
+    override_settings
+)
+
+# Models
+from platzigram_api.users.models import User
+
+# Follow graph
+from platzigram_api.users.graph import (
+    RedisFollowGraphBackend,
+    follow_graph
+)
+
+# Utilities
+from redis import Redis
+from redis.exceptions import RedisError
+import os
+import unittest
+import uuid
+
+REDIS_URL = os.environ.get('REDIS_URL', 'redis://localhost:6379/0')
+
+
+def redis_is_available() -> 'bool':
+    """Returns if the redis server of REDIS_URL answers."""
+
+    try:
+        return Redis.from_url(REDIS_URL, socket_connect_timeout=0.5).ping()
+    except RedisError:
+        return False
+
+
+class FollowGraphTestCase(TransactionTestCase):
+    """Tests that the follow graph answers from the mirrored sets and stays up to date."""
+
+    def setUp(self) -> None:
+        """Creates some profiles following each other."""
+
+        follow_graph.backend.clear()
+
+        # Mirror the sets of these small profiles too.
+        load_threshold = follow_graph.load_threshold
+        follow_graph.load_threshold = 0
+        self.addCleanup(setattr, follow_graph, 'load_threshold', load_threshold)
+
+        self.profiles = {
+            username: User.objects.create_user(
+                username=username,
+                password='idkskere',
+                email=f'{username}@fake.com'
+            ).profile
+            for username in ['cheke', 'eli', 'luis', 'pablo']
+        }
+
+        self.profiles['cheke'].follow(self.profiles['eli'])
+        self.profiles['cheke'].follow(self.profiles['luis'])
+        self.profiles['eli'].follow(self.profiles['pablo'])
+        self.profiles['luis'].follow(self.profiles['pablo'])
+
+    def test_reads_are_served_without_queries_once_loaded(self) -> None:
+        """Checks that once the sets are loaded the graph is answered without queries."""
+
+        cheke, eli, luis, pablo = (self.profiles[username] for username in ['cheke', 'eli', 'luis', 'pablo'])
+
+        self.assertEqual(follow_graph.followed_by_followings(cheke.pk, pablo.pk), {eli.pk, luis.pk})
+
+        with self.assertNumQueries(0):
+            self.assertTrue(follow_graph.is_following(cheke, eli))
+            self.assertFalse(follow_graph.is_following(cheke, pablo))
+            self.assertEqual(follow_graph.following_count(cheke.pk), 2)
+            self.assertEqual(follow_graph.followers_count(pablo.pk), 2)
+            self.assertEqual(follow_graph.followed_by_followings(cheke.pk, pablo.pk), {eli.pk, luis.pk})
+
+    def test_follows_write_through(self) -> None:
+        """Checks that following and unfollowing update the loaded sets."""
+
+        cheke, eli, pablo = (self.profiles[username] for username in ['cheke', 'eli', 'pablo'])
+
+        self.assertEqual(follow_graph.following_count(cheke.pk), 2)
+        self.assertEqual(follow_graph.followers_count(pablo.pk), 2)
+
+        cheke.follow(pablo)
+        eli.unfollow(pablo)
+
+        with self.assertNumQueries(0):
+            self.assertTrue(follow_graph.is_following(cheke, pablo))
+            self.assertEqual(follow_graph.following_count(cheke.pk), 3)
+            self.assertEqual(follow_graph.followers_count(pablo.pk), 2)
+
+    def test_writes_during_a_load_discard_it(self) -> None:
+        """Checks that a set written while it is loaded is not mirrored with the members read before the write."""
+
+        cheke, pablo = self.profiles['cheke'], self.profiles['pablo']
+        key = follow_graph.following_key(cheke.pk)
+
+        def members():
+            yield self.profiles['eli'].pk
+            follow_graph.add_edges(cheke.pk, [pablo.pk])
+            yield self.profiles['luis'].pk
+
+        follow_graph.backend.load(key, members(), follow_graph.timeout)
+
+        self.assertIsNone(follow_graph.backend.count(key))
+
+    def test_relationships(self) -> None:
+        """Checks that the relationships are answered from the mirrored sets once loaded."""
+
+        cheke, eli, pablo = (self.profiles[username] for username in ['cheke', 'eli', 'pablo'])
+        eli.follow(cheke)
+
+        follow_graph.relationships(cheke, [eli.pk])
+
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                follow_graph.relationships(cheke, [eli.pk, pablo.pk]),
+                {
+                    eli.pk: {'following': True, 'followed_by': True},
+                    pablo.pk: {'following': False, 'followed_by': False},
+                }
+            )
+
+    def test_small_sets_are_not_loaded_by_reads(self) -> None:
+        """Checks that the sets of profiles below the load threshold are answered by the database."""
+
+        cheke, eli, pablo = (self.profiles[username] for username in ['cheke', 'eli', 'pablo'])
+        follow_graph.load_threshold = 1000
+
+        with self.assertNumQueries(1):
+            self.assertTrue(follow_graph.is_following(cheke, eli))
+
+        with self.assertNumQueries(2):
+            self.assertEqual(
+                follow_graph.relationships(cheke, [eli.pk, pablo.pk]),
+                {
+                    eli.pk: {'following': True, 'followed_by': False},
+                    pablo.pk: {'following': False, 'followed_by': False},
+                }
+            )
+
+        self.assertIsNone(follow_graph.backend.count(follow_graph.following_key(cheke.pk)))
+        self.assertIsNone(follow_graph.backend.count(follow_graph.followers_key(cheke.pk)))
+        self.assertIsNone(follow_graph.backend.count(follow_graph.followers_key(eli.pk)))
+
+
+@unittest.skipUnless(redis_is_available(), f'No redis server answers on {REDIS_URL}.')
+@override_settings(CACHES={
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': '',
+    },
+    'follow-graph': {
+        'BACKEND': 'django_redis.cache.RedisCache',
+        'LOCATION': REDIS_URL,
+    },
+})
+class RedisFollowGraphBackendTestCase(SimpleTestCase):
+    """Tests the follow graph redis backend against the server of REDIS_URL."""
+
+    def setUp(self) -> None:
+        """Creates a backend whose keys do not collide with other runs."""
+
+        self.backend = RedisFollowGraphBackend(
+            cache_alias='follow-graph',
+            key_prefix=f'follow-graph-test-{uuid.uuid4().hex}'
+        )
+
+    def tearDown(self) -> None:
+        """Deletes the keys written by the test."""
+
+        client = self.backend.client
+        keys = list(client.scan_iter(f'{self.backend.key_prefix}:*'))
+
+        if keys:
+            client.delete(*keys)
+
+    def test_loaded_sets_are_answered(self) -> None:
+        """Checks membership, counts and intersections of loaded sets, empty ones included."""
+
+        self.backend.load('a', [1, 2, 3], 60)
+        self.backend.load('b', [2, 3, 4], 60)
+        self.backend.load('empty', [], 60)
+
+        self.assertTrue(self.backend.is_member('a', 1))
+        self.assertFalse(self.backend.is_member('a', 4))
+        self.assertEqual(self.backend.members_in('a', [1, 4]), {1})
+        self.assertEqual(self.backend.count('a'), 3)
+        self.assertEqual(self.backend.count('empty'), 0)
+        self.assertEqual(self.backend.intersection('a', 'b'), {2, 3})
+
+        self.assertIsNone(self.backend.is_member('missing', 1))
+        self.assertIsNone(self.backend.count('missing'))
+        self.assertIsNone(self.backend.intersection('a', 'missing'))
+
+    def test_writes_only_reach_loaded_sets(self) -> None:
+        """Checks that writes to several sets go to the loaded ones and never create partial sets."""
+
+        self.backend.load('a', [1], 60)
+        self.backend.load('b', [1], 60)
+
+        self.backend.add({'a': [2, 3], 'b': [2], 'missing': [2]}, 60)
+        self.backend.remove({'a': [1]}, 60)
+
+        self.assertEqual(self.backend.members_in('a', [1, 2, 3]), {2, 3})
+        self.assertEqual(self.backend.members_in('b', [1, 2]), {1, 2})
+        self.assertIsNone(self.backend.count('missing'))
+
+    def test_writes_during_a_load_discard_it(self) -> None:
+        """Checks that a set written while it is loaded is not swapped in."""
+
+        self.backend.load('a', [1], 60)
+
+        def members():
+            yield 1
+            self.backend.remove({'a': [1]}, 60)
+            yield 2
+
+        self.backend.load('a', members(), 60)
+
+        self.assertEqual(self.backend.members_in('a', [1, 2]), set())
+        self.assertEqual(list(self.backend.client.scan_iter(f'{self.backend.key_prefix}:a:loading:*')), [])
+
+    def test_failed_loads_expire(self) -> None:
+        """Checks that the temporary key of a load that fails expires."""
+
+        def members():
+            yield 1
+            raise RedisError('Connection lost.')
+
+        self.backend.load('a', members(), 60)
+
+        client = self.backend.client
+        loading_keys = list(client.scan_iter(f'{self.backend.key_prefix}:a:loading:*'))
+
+        self.assertIsNone(self.backend.count('a'))
+        self.assertEqual(len(loading_keys), 1)
+        self.assertGreater(client.ttl(loading_keys[0]), 0)
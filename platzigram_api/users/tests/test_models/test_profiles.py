@@ -1,11 +1,14 @@
 """Profile Model related tests."""
 
 # Django
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 
 # Models
 from platzigram_api.users.models import (
-    User
+    User,
+    Follow
 )
 
 
@@ -120,3 +123,96 @@ class ProfileModelTestCase(TestCase):
             self.profile.followers.all(
             )
         )
+
+    def test_following_updates_the_counters(self) -> None:
+        """Test that following an user increments the counters of both profiles only once."""
+
+        self.profile.follow(self.profile2)
+        self.profile.follow(self.profile2)
+
+        self.profile.refresh_from_db()
+        self.profile2.refresh_from_db()
+
+        self.assertEqual(self.profile.following_count, 1)
+        self.assertEqual(self.profile.followers_count, 0)
+        self.assertEqual(self.profile2.followers_count, 1)
+        self.assertEqual(self.profile2.following_count, 0)
+
+    def test_unfollowing_updates_the_counters(self) -> None:
+        """Test that unfollowing an user decrements the counters of both profiles only once."""
+
+        self.profile.follow(self.profile2)
+        self.profile.unfollow(self.profile2)
+        self.profile.unfollow(self.profile2)
+
+        self.profile.refresh_from_db()
+        self.profile2.refresh_from_db()
+
+        self.assertEqual(self.profile.following_count, 0)
+        self.assertEqual(self.profile2.followers_count, 0)
+
+    def test_following_records_the_follow_edge(self) -> None:
+        """Test that following an user stores a Follow edge with its creation date."""
+
+        self.profile.follow(self.profile2)
+
+        follow = Follow.objects.get(follower=self.profile, followee=self.profile2)
+
+        self.assertIsNotNone(follow.created)
+        self.assertEqual(list(self.profile2.follower_edges.all()), [follow])
+        self.assertEqual(list(self.profile.following_edges.all()), [follow])
+
+    def test_bulk_follows_only_count_the_changed_edges(self) -> None:
+        """Test that following and unfollowing in bulk only counts the edges each statement changed."""
+
+        user3 = User.objects.create_user(
+            username='luis',
+            password='idkskere',
+            email='luis@fake.com'
+        )
+
+        self.profile.follow(self.profile2)
+
+        self.assertEqual(self.profile.follow_many([self.profile2.pk, user3.profile.pk]), {user3.profile.pk})
+        self.assertEqual(
+            self.profile.unfollow_many([self.profile2.pk, user3.profile.pk]),
+            {self.profile2.pk, user3.profile.pk}
+        )
+        self.assertEqual(self.profile.unfollow_many([self.profile2.pk, user3.profile.pk]), set())
+
+        self.profile.refresh_from_db()
+        self.profile2.refresh_from_db()
+        user3.profile.refresh_from_db()
+
+        self.assertEqual(self.profile.following_count, 0)
+        self.assertEqual(self.profile2.followers_count, 0)
+        self.assertEqual(user3.profile.followers_count, 0)
+        self.assertFalse(Follow.objects.exists())
+
+    def test_deleting_an_user_updates_the_counters_of_the_other_side(self) -> None:
+        """Test that deleting an user discounts its follow edges from the profiles on the other side."""
+
+        user3 = User.objects.create_user(
+            username='luis',
+            password='idkskere',
+            email='luis@fake.com'
+        )
+
+        self.profile.follow(self.profile2)
+        self.profile2.follow(self.profile)
+        user3.profile.follow(self.profile2)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.user2.delete()
+
+        # One DELETE per side of the edges and one UPDATE per side of the counters.
+        self.assertEqual(len([query for query in queries if 'RETURNING' in query['sql']]), 2)
+        self.assertEqual(len([query for query in queries if query['sql'].startswith('UPDATE')]), 2)
+
+        self.profile.refresh_from_db()
+        user3.profile.refresh_from_db()
+
+        self.assertEqual(self.profile.following_count, 0)
+        self.assertEqual(self.profile.followers_count, 0)
+        self.assertEqual(user3.profile.following_count, 0)
+        self.assertFalse(Follow.objects.exists())
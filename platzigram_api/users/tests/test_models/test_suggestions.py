@@ -0,0 +1,128 @@
+"""Follow Suggestion Model related tests."""
+
+# Django
+from django.test import TestCase
+from django.core.management import call_command
+
+# Utilities
+from io import StringIO
+
+# Models
+from platzigram_api.users.models import (
+    User,
+    FollowSuggestion,
+    FollowSuggestionChange
+)
+
+
+class FollowSuggestionModelTestCase(TestCase):
+    """Tests that the suggestions are kept up to date when follows change."""
+
+    def setUp(self) -> None:
+        """Creates some profiles following each other."""
+
+        self.profiles = {
+            username: User.objects.create_user(
+                username=username,
+                password='idkskere',
+                email=f'{username}@fake.com'
+            ).profile
+            for username in ['cheke', 'eli', 'luis', 'pablo', 'maria']
+        }
+
+        self.profiles['eli'].follow(self.profiles['luis'])
+        self.profiles['eli'].follow(self.profiles['pablo'])
+        self.profiles['maria'].follow(self.profiles['cheke'])
+        self.profiles['maria'].follow(self.profiles['luis'])
+
+    def get_suggestions(self, top_k=FollowSuggestion.objects.TOP_K) -> 'dict':
+        """Applies the queued follow changes and returns the stored suggestions as a dict of scores."""
+
+        call_command('refresh_follow_suggestions', top_k=top_k, stdout=StringIO())
+
+        return {
+            (suggestion.profile.user.username, suggestion.candidate.user.username): suggestion.score
+            for suggestion in FollowSuggestion.objects.select_related('profile__user', 'candidate__user')
+        }
+
+    def test_following_adds_suggestions(self) -> None:
+        """Checks that following a profile suggests its followings and suggests it to the followers."""
+
+        self.profiles['cheke'].follow(self.profiles['eli'])
+
+        self.assertEqual(
+            self.get_suggestions(),
+            {
+                ('cheke', 'luis'): 1,
+                ('cheke', 'pablo'): 1,
+                ('maria', 'eli'): 1,
+            }
+        )
+
+    def test_following_queues_the_changes(self) -> None:
+        """Checks that following a profile only queues the change until the worker applies it."""
+
+        self.get_suggestions()
+        FollowSuggestion.objects.all().delete()
+
+        self.profiles['cheke'].follow(self.profiles['eli'])
+
+        self.assertFalse(FollowSuggestion.objects.exists())
+        self.assertEqual(FollowSuggestionChange.objects.count(), 1)
+
+        self.assertEqual(len(self.get_suggestions()), 3)
+        self.assertFalse(FollowSuggestionChange.objects.exists())
+
+    def test_refresh_keeps_the_top_k_suggestions(self) -> None:
+        """Checks that the worker keeps the same top K suggestions the batch build keeps."""
+
+        self.profiles['cheke'].follow(self.profiles['eli'])
+
+        incremental_suggestions = self.get_suggestions(top_k=1)
+
+        self.assertEqual(
+            incremental_suggestions,
+            {
+                ('cheke', 'pablo'): 1,
+                ('maria', 'eli'): 1,
+            }
+        )
+
+        call_command('build_follow_suggestions', top_k=1, stdout=StringIO())
+
+        self.assertEqual(incremental_suggestions, self.get_suggestions(top_k=1))
+
+    def test_unfollowing_removes_suggestions(self) -> None:
+        """Checks that unfollowing a profile takes back the suggestions it added."""
+
+        self.profiles['cheke'].follow(self.profiles['eli'])
+        self.profiles['cheke'].unfollow(self.profiles['eli'])
+
+        self.assertEqual(self.get_suggestions(), {})
+
+    def test_unfollowing_restores_the_suggestion_of_the_unfollowed_profile(self) -> None:
+        """Checks that an unfollowed profile is suggested again through the remaining followings."""
+
+        self.profiles['eli'].follow(self.profiles['maria'])
+        self.profiles['eli'].follow(self.profiles['cheke'])
+
+        self.assertNotIn(('eli', 'cheke'), self.get_suggestions())
+
+        self.profiles['eli'].unfollow(self.profiles['cheke'])
+
+        self.assertEqual(self.get_suggestions()[('eli', 'cheke')], 1)
+
+    def test_incremental_updates_match_the_batch_build(self) -> None:
+        """Checks that the incremental suggestions equal the ones built by the command."""
+
+        self.profiles['cheke'].follow(self.profiles['eli'])
+        self.profiles['cheke'].follow_many([self.profiles['maria'].pk, self.profiles['luis'].pk])
+        self.profiles['pablo'].follow(self.profiles['maria'])
+        self.profiles['eli'].follow_many([self.profiles['maria'].pk, self.profiles['cheke'].pk])
+        self.profiles['eli'].unfollow_many([self.profiles['maria'].pk, self.profiles['cheke'].pk])
+
+        incremental_suggestions = self.get_suggestions()
+
+        call_command('build_follow_suggestions', batch_size=2, stdout=StringIO())
+
+        self.assertEqual(incremental_suggestions, self.get_suggestions())
@@ -10,6 +10,9 @@ from platzigram_api.users.models import (
     Profile
 )
 
+# Utilities
+from platzigram_api.utils.cache import user_cache
+
 
 class UserModelTestCase(TestCase):
     """User Model Test Case defines all the tests related with the user model."""
@@ -56,3 +59,37 @@ class UserModelTestCase(TestCase):
         """Checks that when we create a new user is not verified by default and need to confirm its email."""
 
         self.assertFalse(self.user.is_email_verified)
+
+    def test_saving_user_does_not_touch_the_profile(self) -> None:
+        """Checks that saving an existing user only runs its UPDATE."""
+
+        self.user.first_name = 'Pablo'
+
+        with self.assertNumQueries(1):
+            self.user.save()
+
+    def test_missing_profile_is_created_on_access(self) -> None:
+        """Checks that get_profile creates the profile of an user that has none."""
+
+        Profile.objects.filter(user=self.user).delete()
+        user = User.objects.get(pk=self.user.pk)
+
+        profile = user.get_profile()
+
+        self.assertEqual(profile.user_id, user.pk)
+        self.assertTrue(Profile.objects.filter(user=user).exists())
+
+        with self.assertNumQueries(0):
+            self.assertEqual(user.get_profile(), profile)
+
+    def test_cached_users_are_copies(self) -> None:
+        """Checks that every read of the user cache returns a new copy, so changes are not shared."""
+
+        user = user_cache.get(self.user.pk)
+        user.first_name = 'Pablo'
+
+        with self.assertNumQueries(0):
+            cached_user = user_cache.get(self.user.pk)
+
+        self.assertIsNot(cached_user, user)
+        self.assertEqual(cached_user.first_name, 'Francisco Ezequiel')
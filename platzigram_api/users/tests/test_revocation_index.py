@@ -0,0 +1,133 @@
+"""Refresh token revocation index related tests."""
+
+# Django
+from django.core.cache import cache
+from django.test import TestCase
+
+# Django REST Framework Simple JWT
+from rest_framework_simplejwt.exceptions import TokenError
+
+# Models
+from platzigram_api.users.models import User
+
+# Utilities
+from platzigram_api.utils.bloom import BloomFilter
+from platzigram_api.utils.cache import user_cache
+from platzigram_api.utils.jwt import (
+    RevocableRefreshToken,
+    RevocationIndex,
+    blacklist_token,
+    revocation_index
+)
+import uuid
+
+
+class BloomFilterTestCase(TestCase):
+    """Tests related to the bloom filter."""
+
+    def test_added_values_are_always_found(self) -> None:
+        """Checks that the filter has no false negatives and few false positives."""
+
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        values = [uuid.uuid4().hex for _ in range(1000)]
+
+        for value in values:
+            bloom.add(value)
+
+        self.assertTrue(all(value in bloom for value in values))
+
+        false_positives = sum(uuid.uuid4().hex in bloom for _ in range(10000))
+        self.assertLess(false_positives, 300)
+
+
+class RevocationIndexTestCase(TestCase):
+    """Tests related to the refresh token revocation index."""
+
+    def setUp(self) -> None:
+        """Creates an user and issues it a refresh token."""
+
+        self.user = User.objects.create_user(
+            username='luis',
+            password='luis1234',
+            email='luis@gmail.com'
+        )
+        self.token = str(RevocableRefreshToken.for_user(self.user))
+
+    def test_valid_tokens_do_not_query_the_blacklist(self) -> None:
+        """Checks that once the index is built and the user cached, never blacklisted tokens skip the database."""
+
+        revocation_index.sync()
+        user_cache.get(self.user.pk)
+
+        with self.assertNumQueries(0):
+            RevocableRefreshToken(self.token)
+
+    def test_blacklisted_tokens_are_rejected_by_other_processes(self) -> None:
+        """Checks that a process whose index was built before a token was blacklisted picks it up from the cache."""
+
+        revocation_index.sync()
+        generation = revocation_index.generation
+
+        blacklist_token(self.token)
+
+        # Simulates another process, which filter does not have the token.
+        revocation_index.bloom = BloomFilter(revocation_index.capacity, revocation_index.error_rate)
+        revocation_index.generation = generation
+
+        with self.assertRaises(TokenError):
+            RevocableRefreshToken(self.token)
+
+        self.assertIn(RevocableRefreshToken(self.token, verify=False)['jti'], revocation_index.bloom)
+
+    def test_missing_deltas_do_not_hide_later_blacklisted_tokens(self) -> None:
+        """Checks that a jti missing from the cache makes the index fall back to the table and then rebuild."""
+
+        revocation_index.sync()
+        generation = revocation_index.generation
+
+        blacklist_token(self.token)
+        cache.delete(revocation_index.DELTA_KEY.format(generation + 1))
+
+        token = str(RevocableRefreshToken.for_user(self.user))
+        blacklist_token(token)
+
+        # Simulates another process, which filter does not have the tokens.
+        revocation_index.bloom = BloomFilter(revocation_index.capacity, revocation_index.error_rate)
+        revocation_index.generation = generation
+
+        with self.assertRaises(TokenError):
+            RevocableRefreshToken(token)
+
+        self.assertEqual(revocation_index.generation, generation)
+
+        revocation_index.GAP_TIMEOUT = 0
+        try:
+            with self.assertRaises(TokenError):
+                RevocableRefreshToken(token)
+        finally:
+            del revocation_index.GAP_TIMEOUT
+
+        self.assertEqual(revocation_index.generation, generation + 2)
+        self.assertIn(RevocableRefreshToken(self.token, verify=False)['jti'], revocation_index.bloom)
+        self.assertIn(RevocableRefreshToken(token, verify=False)['jti'], revocation_index.bloom)
+
+    def test_processes_load_the_published_snapshot(self) -> None:
+        """Checks that once a process builds the index the others load it from the cache without reading the table."""
+
+        revocation_index.build()
+        blacklist_token(self.token)
+
+        # Simulates another process starting.
+        index = RevocationIndex(
+            capacity=revocation_index.capacity,
+            error_rate=revocation_index.error_rate,
+            max_deltas=revocation_index.max_deltas,
+            delta_timeout=revocation_index.delta_timeout,
+            background_rebuild=False
+        )
+
+        with self.assertNumQueries(0):
+            self.assertTrue(index.sync())
+
+        self.assertEqual(index.generation, revocation_index.get_generation())
+        self.assertIn(RevocableRefreshToken(self.token, verify=False)['jti'], index.bloom)
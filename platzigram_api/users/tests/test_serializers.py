@@ -0,0 +1,72 @@
+"""Compiled read serializers related tests."""
+
+# Django
+from django.test import TestCase
+
+# Django REST Framework
+from rest_framework.test import APIRequestFactory
+
+# Models
+from platzigram_api.users.models import (
+    Profile,
+    User
+)
+
+# Serializers
+from platzigram_api.users.serializers import (
+    ProfileSummarySerializer,
+    UserModelSerializer
+)
+
+# Utilities
+from platzigram_api.utils.serializers import compile_read_serializer
+
+
+class CompiledReadSerializerTestCase(TestCase):
+    """Tests that compiled serializers represent objects like the serializers they come from."""
+
+    def setUp(self) -> None:
+        """Creates an user with a profile picture."""
+
+        self.user = User.objects.create_user(
+            username='cheke',
+            password='idkskere',
+            email='chekelosos@gmail.com',
+            first_name='Francisco Ezequiel',
+            last_name='Banos Ramirez',
+            phone_number='+52 9581006329'
+        )
+
+        Profile.objects.filter(user=self.user).update(picture='users/pictures/cheke.png', website='https://cheke.com')
+        self.profile = Profile.objects.select_related('user').get(user=self.user)
+
+    def test_user_representation(self) -> None:
+        """Checks that the compiled user serializer output matches the serializer one without write only fields."""
+
+        represent = compile_read_serializer(UserModelSerializer)
+        data = represent(self.user)
+
+        self.assertEqual(data, UserModelSerializer(self.user).data)
+        self.assertNotIn('password', data)
+        self.assertNotIn('refresh_token', data)
+
+    def test_profile_representation(self) -> None:
+        """Checks that the compiled profile serializer output matches the serializer one from objects and values."""
+
+        request = APIRequestFactory().get('/')
+        expected = ProfileSummarySerializer(self.profile, context={'request': request}).data
+
+        represent = compile_read_serializer(ProfileSummarySerializer)
+        self.assertEqual(represent(self.profile, request), expected)
+
+        represent = compile_read_serializer(ProfileSummarySerializer, from_values=True)
+        row = Profile.objects.values(*represent.source_paths).get(pk=self.profile.pk)
+        self.assertEqual(represent(row, request), expected)
+
+    def test_fields_subset(self) -> None:
+        """Checks that only the requested fields are represented and compiled functions are reused."""
+
+        represent = compile_read_serializer(UserModelSerializer, fields=['username', 'email'])
+
+        self.assertEqual(represent(self.user), {'username': 'cheke', 'email': 'chekelosos@gmail.com'})
+        self.assertIs(represent, compile_read_serializer(UserModelSerializer, fields=('email', 'username')))
@@ -10,7 +10,7 @@ from rest_framework.routers import SimpleRouter
 from .views import UserModelViewset
 
 # Views
-from rest_framework_simplejwt.views import (
+from .views import (
     TokenObtainPairView,
     TokenRefreshView
 )
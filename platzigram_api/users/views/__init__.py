@@ -3,3 +3,7 @@
 from .users import (
     UserModelViewset
 )
+from .tokens import (
+    TokenObtainPairView,
+    TokenRefreshView
+)
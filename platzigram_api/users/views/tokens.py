@@ -0,0 +1,31 @@
+"""JWT related views."""
+
+# Django REST Framework Simple JWT
+from rest_framework_simplejwt import views as jwt_views
+
+# Serializers
+from platzigram_api.users.serializers import (
+    TokenObtainPairSerializer,
+    TokenRefreshSerializer
+)
+
+
+class TokenObtainPairView(jwt_views.TokenObtainPairView):
+    """Token Obtain Pair View
+
+    Returns a refresh and an access token for valid
+    credentials, carrying the token version of the user.
+    """
+
+    serializer_class = TokenObtainPairSerializer
+
+
+class TokenRefreshView(jwt_views.TokenRefreshView):
+    """Token Refresh View
+
+    Returns a new access token for a valid refresh token,
+    checking the blacklist through the revocation index
+    and the token version.
+    """
+
+    serializer_class = TokenRefreshSerializer
@@ -1,21 +1,47 @@
 """User model related views."""
 
+# Python
+import copy
+
+# Django
+from django.http import (
+    HttpResponse,
+    StreamingHttpResponse
+)
+from django.shortcuts import get_object_or_404
+from django.utils.cache import get_conditional_response
+from django.utils.http import (
+    http_date,
+    quote_etag
+)
+
 # Django REST Framework
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 
 # Status
 from rest_framework.status import (
     HTTP_200_OK,
-    HTTP_201_CREATED
+    HTTP_201_CREATED,
+    HTTP_204_NO_CONTENT
 )
 
 # Serializers
 from platzigram_api.users.serializers import (
     UserModelSerializer,
     UserSignupSerializer,
-    VerifyUserSerializer
+    VerifyUserSerializer,
+    FollowerSerializer,
+    FollowingSerializer,
+    BulkFollowSerializer,
+    RelationshipsSerializer,
+    FollowSuggestionSerializer,
+    ProfileSummarySerializer,
+    ProfileBatchSerializer,
+    UserExportSerializer
 )
 
 # Mixins
@@ -26,15 +52,30 @@ from rest_framework.mixins import (
 )
 
 # Models
-from platzigram_api.users.models import User
+from platzigram_api.users.models import (
+    Follow,
+    Profile,
+    User
+)
 
 # Permissions
 from rest_framework.permissions import (
     AllowAny,
+    IsAdminUser,
     IsAuthenticated,
 )
 from platzigram_api.users.permissions import IsAccountOwner
 
+# Pagination
+from platzigram_api.utils.pagination import CreatedCursorPagination
+
+# Follow graph
+from platzigram_api.users.graph import follow_graph
+
+# Utilities
+from platzigram_api.utils.cache import response_cache
+from platzigram_api.utils.serializers import compile_read_serializer
+
 
 class UserModelViewset(RetrieveModelMixin, UpdateModelMixin, DestroyModelMixin, GenericViewSet):
     """User Model Viewset
@@ -44,6 +85,101 @@ class UserModelViewset(RetrieveModelMixin, UpdateModelMixin, DestroyModelMixin,
 
     queryset = User.objects.all()
     lookup_field = 'username'
+    pagination_class = CreatedCursorPagination
+
+    SUGGESTIONS_LIMIT = 50
+
+    def retrieve(self, request, *args, **kwargs):
+        """Extends the normal functionality to:
+
+        Answer conditional requests from the updated date of the user,
+        and of its profile if profile fields are represented, which are
+        the only thing read when the client copy is still fresh.
+
+        Serve JSON responses from the response cache, a hit does not
+        touch the database nor the serializer.
+
+        Read and represent only the fields given on the fields
+        query parameter, all of them by default.
+        """
+
+        username = self.kwargs[self.lookup_field]
+        fields = self.get_requested_fields(UserModelSerializer)
+        represent = compile_read_serializer(UserModelSerializer, fields=fields, from_values=True)
+        cache_key = username if fields is None else f"{username}:{','.join(sorted(fields))}"
+
+        # The version is read before the database, so a response built
+        # from data that changes meanwhile is stored under a stale version.
+        version = response_cache.get_version(username) if request.accepted_renderer.format == 'json' else None
+        entry = response_cache.get_entry('retrieve', cache_key, version) if version else None
+
+        if entry is None:
+            # Follows bump the updated date of the profile, it only counts if the body has profile fields.
+            updated_paths = ['updated']
+            if any(path.startswith('profile__') for path in represent.source_paths):
+                updated_paths.append('profile__updated')
+
+            row = get_object_or_404(
+                User.objects.values('id', *updated_paths, *represent.source_paths),
+                username=username
+            )
+            pk = row['id']
+            etag, last_modified = self.get_validators(row, fields)
+        else:
+            pk, etag, last_modified = entry['pk'], entry['etag'], entry['last_modified']
+
+        self.check_object_permissions(request, User(pk=pk))
+
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+
+        if response is None and entry is not None:
+            response = HttpResponse(entry['body'], content_type=request.accepted_renderer.media_type)
+
+        if response is None:
+            response = Response(data=represent(row, request), status=HTTP_200_OK)
+
+            if version:
+                response_cache.set_entry('retrieve', cache_key, version, {
+                    'pk': pk,
+                    'etag': etag,
+                    'last_modified': last_modified,
+                    'body': JSONRenderer().render(response.data)
+                })
+
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+
+        return response
+
+    @action(detail=False, methods=['get', 'put', 'patch'])
+    def me(self, request, *args, **kwargs):
+        """Me endpoint retrieves and updates the requesting user.
+
+        The user loaded by the authentication is used as it is, so
+        there is no lookup nor account owner check. GET honors the
+        fields query parameter.
+        """
+
+        if request.method == 'GET':
+
+            fields = self.get_requested_fields(UserModelSerializer)
+            data = compile_read_serializer(UserModelSerializer, fields=fields)(request.user, request)
+
+            return Response(data=data, status=HTTP_200_OK)
+
+        # The authenticated user may be shared with other requests
+        # through the user cache, so the update works on a copy.
+        serializer = self.get_serializer(
+            copy.copy(request.user),
+            data=request.data,
+            partial=request.method == 'PATCH'
+        )
+
+        if serializer.is_valid(raise_exception=True):
+
+            serializer.save()
+
+            return Response(data=serializer.data, status=HTTP_200_OK)
 
     @action(detail=False, methods=['post'])
     def signup(self, request, *args, **kwargs):
@@ -61,7 +197,7 @@ class UserModelViewset(RetrieveModelMixin, UpdateModelMixin, DestroyModelMixin,
         if serializer.is_valid(raise_exception=True):
 
             user = serializer.save()
-            data = UserModelSerializer(user).data
+            data = compile_read_serializer(UserModelSerializer)(user, request)
 
             return Response(data=data, status=HTTP_201_CREATED)
 
@@ -82,10 +218,252 @@ class UserModelViewset(RetrieveModelMixin, UpdateModelMixin, DestroyModelMixin,
         if serializer.is_valid(raise_exception=True):
 
             user = serializer.save()
-            data = UserModelSerializer(user).data
+            data = compile_read_serializer(UserModelSerializer)(user, request)
+
+            return Response(data=data, status=HTTP_200_OK)
+
+    @action(detail=True, methods=['get'])
+    def followers(self, request, *args, **kwargs):
+        """Followers endpoint lists the profiles following an user.
+
+        Newest followers come first and the list is paginated
+        with a cursor over the follow date.
+        """
+
+        profile = self.get_profile()
+
+        queryset = Follow.objects.filter(
+            followee=profile
+        ).select_related('follower__user').only(
+            'created', *self.get_profile_columns('follower', self.get_requested_fields(ProfileSummarySerializer))
+        )
+
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page, many=True)
+
+        return self.get_paginated_response(serializer.data)
+
+    @action(detail=True, methods=['get'])
+    def following(self, request, *args, **kwargs):
+        """Following endpoint lists the profiles an user follows.
+
+        Newest followings come first and the list is paginated
+        with a cursor over the follow date.
+        """
+
+        profile = self.get_profile()
+
+        queryset = Follow.objects.filter(
+            follower=profile
+        ).select_related('followee__user').only(
+            'created', *self.get_profile_columns('followee', self.get_requested_fields(ProfileSummarySerializer))
+        )
+
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page, many=True)
+
+        return self.get_paginated_response(serializer.data)
+
+    @action(detail=True, methods=['post', 'delete'])
+    def follow(self, request, *args, **kwargs):
+        """Follow endpoint makes the requesting user follow or unfollow an user.
+
+        POST follows and DELETE unfollows, both are idempotent so
+        repeating them does not write anything. Following answers
+        if the user follows back from the follow graph.
+        """
+
+        profile = self.get_profile()
+        requesting_profile = request.user.get_profile()
+
+        if profile == requesting_profile:
+            raise ValidationError('You can not follow yourself.')
+
+        if request.method == 'DELETE':
+            requesting_profile.unfollow(profile)
+
+            return Response(status=HTTP_204_NO_CONTENT)
+
+        created = requesting_profile.follow(profile)
+        data = {
+            'username': self.kwargs[self.lookup_field],
+            'is_following': True,
+            'followed_by': follow_graph.is_following(profile, requesting_profile)
+        }
+
+        return Response(data=data, status=HTTP_201_CREATED if created else HTTP_200_OK)
+
+    @action(detail=False, methods=['post', 'delete'], url_path='bulk-follow')
+    def bulk_follow(self, request, *args, **kwargs):
+        """Bulk follow endpoint follows or unfollows a list of users at once.
+
+        POST follows and DELETE unfollows every given username,
+        the response contains the result for each one of them.
+        """
+
+        serializer_class = self.get_serializer_class()
+        serializer = serializer_class(
+            data=request.data,
+            context=self.get_serializer_context()
+        )
+
+        if serializer.is_valid(raise_exception=True):
+
+            results = serializer.save(unfollow=request.method == 'DELETE')
+
+            return Response(data={'results': results}, status=HTTP_200_OK)
+
+    @action(detail=False, methods=['get'])
+    def relationships(self, request, *args, **kwargs):
+        """Relationships endpoint tells if the requesting user follows some users and if they follow it back.
+
+        Usernames are given as a comma separated list on
+        the usernames query parameter.
+        """
+
+        usernames = request.query_params.get('usernames', '')
+
+        serializer_class = self.get_serializer_class()
+        serializer = serializer_class(
+            data={'usernames': [username for username in usernames.split(',') if username]},
+            context=self.get_serializer_context()
+        )
+
+        if serializer.is_valid(raise_exception=True):
+
+            data = serializer.save()
+
+            return Response(data=data, status=HTTP_200_OK)
+
+    @action(detail=False, methods=['get'])
+    def batch(self, request, *args, **kwargs):
+        """Batch endpoint returns the profile cards of several users at once.
+
+        Usernames are given as a comma separated list on the
+        usernames query parameter, the users not found are
+        listed on missing.
+        """
+
+        usernames = request.query_params.get('usernames', '')
+
+        serializer_class = self.get_serializer_class()
+        serializer = serializer_class(
+            data={'usernames': [username for username in usernames.split(',') if username]},
+            context=self.get_serializer_context()
+        )
+
+        if serializer.is_valid(raise_exception=True):
+
+            data = serializer.save()
 
             return Response(data=data, status=HTTP_200_OK)
 
+    @action(detail=False, methods=['get'])
+    def suggestions(self, request, *args, **kwargs):
+        """Suggestions endpoint lists the profiles the requesting user may want to follow.
+
+        Suggestions are precomputed so this only reads the
+        best scored ones.
+        """
+
+        queryset = request.user.get_profile().suggestions.select_related(
+            'candidate__user'
+        ).only(
+            'score', *self.get_profile_columns('candidate', self.get_requested_fields(ProfileSummarySerializer))
+        ).order_by('-score')[:self.SUGGESTIONS_LIMIT]
+
+        serializer = self.get_serializer(queryset, many=True)
+
+        return Response(data=serializer.data, status=HTTP_200_OK)
+
+    @action(detail=False, methods=['get'])
+    def export(self, request, *args, **kwargs):
+        """Export endpoint streams every user with its profile as JSON lines.
+
+        Only available to admins, the since query parameter
+        limits the export to the users updated since then.
+        """
+
+        serializer_class = self.get_serializer_class()
+        serializer = serializer_class(
+            data=request.query_params,
+            context=self.get_serializer_context()
+        )
+
+        if serializer.is_valid(raise_exception=True):
+
+            response = StreamingHttpResponse(serializer.save(), content_type='application/x-ndjson')
+            response['Content-Disposition'] = 'attachment; filename="users.ndjson"'
+
+            return response
+
+    @staticmethod
+    def get_validators(row, fields=None) -> 'tuple':
+        """Returns the ETag and the Last-Modified timestamp of an user from its updated dates.
+
+        The updated date of the profile only counts if row has it.
+        Every set of fields gets its own ETag, as its body differs.
+        """
+
+        updated = max(date for date in [row['updated'], row.get('profile__updated')] if date is not None)
+
+        etag = f"{row['id']}-{int(updated.timestamp() * 10 ** 6)}"
+        if fields is not None:
+            etag = f"{etag}-{','.join(sorted(fields))}"
+
+        etag = quote_etag(etag)
+
+        return etag, int(updated.timestamp())
+
+    def get_requested_fields(self, serializer_class):
+        """Returns the fields given on the fields query parameter or None if there are not.
+
+        Only the readable fields of serializer_class can be requested.
+        """
+
+        fields = [field for field in self.request.query_params.get('fields', '').split(',') if field]
+
+        if not fields:
+            return None
+
+        allowed_fields = compile_read_serializer(serializer_class).field_names
+        unknown_fields = [field for field in fields if field not in allowed_fields]
+
+        if unknown_fields:
+            raise ValidationError({
+                'fields': [
+                    f"Unknown fields: {', '.join(unknown_fields)}. "
+                    f"Allowed fields are: {', '.join(allowed_fields)}."
+                ]
+            })
+
+        return fields
+
+    def get_profile_columns(self, prefix, fields) -> 'list':
+        """Returns the only() paths that read the requested fields of the profiles related through prefix."""
+
+        source_paths = compile_read_serializer(ProfileSummarySerializer, fields=fields).source_paths
+
+        return [prefix, f'{prefix}__user'] + [f'{prefix}__{path}' for path in source_paths]
+
+    def get_serializer_context(self):
+        """Adds the fields requested to the profiles, if there are, to the context."""
+
+        context = super(UserModelViewset, self).get_serializer_context()
+
+        if self.action in ['followers', 'following', 'suggestions', 'batch']:
+            context['fields'] = self.get_requested_fields(ProfileSummarySerializer)
+
+        return context
+
+    def get_profile(self):
+        """Returns the profile of the user on the url without loading the user."""
+
+        return get_object_or_404(
+            Profile.objects.only('pk'),
+            user__username=self.kwargs[self.lookup_field]
+        )
+
     def get_serializer_class(self):
         """Returns serializers based on action"""
 
@@ -95,6 +473,27 @@ class UserModelViewset(RetrieveModelMixin, UpdateModelMixin, DestroyModelMixin,
         if self.action == 'verify':
             return VerifyUserSerializer
 
+        if self.action == 'followers':
+            return FollowerSerializer
+
+        if self.action == 'following':
+            return FollowingSerializer
+
+        if self.action == 'bulk_follow':
+            return BulkFollowSerializer
+
+        if self.action == 'relationships':
+            return RelationshipsSerializer
+
+        if self.action == 'suggestions':
+            return FollowSuggestionSerializer
+
+        if self.action == 'export':
+            return UserExportSerializer
+
+        if self.action == 'batch':
+            return ProfileBatchSerializer
+
         else:
             return UserModelSerializer
 
@@ -107,4 +506,13 @@ class UserModelViewset(RetrieveModelMixin, UpdateModelMixin, DestroyModelMixin,
         if self.action in ['destroy', 'retrieve', 'update', 'partial_update']:
             return [IsAuthenticated(), IsAccountOwner()]
 
+        if self.action in [
+            'followers', 'following', 'follow', 'bulk_follow',
+            'relationships', 'suggestions', 'batch', 'me'
+        ]:
+            return [IsAuthenticated()]
+
+        if self.action == 'export':
+            return [IsAdminUser()]
+
         return super(UserModelViewset, self).get_permissions()
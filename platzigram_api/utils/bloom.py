@@ -0,0 +1,59 @@
+"""Bloom filter.
+
+Probabilistic set that answers if a value may be in it or
+is certainly not in it, using a fixed amount of memory.
+"""
+
+# Utilities
+import hashlib
+import math
+
+
+class BloomFilter:
+    """Bloom filter over strings.
+
+    Sized to keep the false positive rate under error_rate while
+    holding up to capacity values. There are no false negatives.
+    """
+
+    def __init__(self, capacity, error_rate, bits=None):
+        """Allocates the bits needed for the given capacity and error rate.
+
+        The bits of a filter built with the same capacity and error
+        rate can be given instead, raises ValueError if their size
+        does not match.
+        """
+
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+
+        if bits is None:
+            self.bits = bytearray((self.size + 7) // 8)
+        elif len(bits) == (self.size + 7) // 8:
+            self.bits = bytearray(bits)
+        else:
+            raise ValueError('The bits do not match the capacity and error rate of the filter.')
+
+    def _positions(self, value):
+        """Yields the bits of a value using double hashing over a single digest."""
+
+        digest = hashlib.blake2b(value.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+
+        for index in range(self.hash_count):
+            yield (first + index * second) % self.size
+
+    def add(self, value) -> 'None':
+        """Adds a value to the filter."""
+
+        for position in self._positions(value):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, value) -> 'bool':
+        """Returns False if the value was never added and True if it probably was."""
+
+        return all(
+            self.bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(value)
+        )
@@ -0,0 +1,231 @@
+"""Utilities related to the cache.
+
+Helpers to keep objects on the cache under a version that is
+replaced every time the object changes, so stale copies are
+never read again and do not need to be deleted.
+"""
+
+# Django
+from django.conf import settings
+from django.core.cache import cache
+
+# Utilities
+from collections import OrderedDict
+import pickle
+import threading
+import uuid
+
+
+class LRUCache:
+    """Least recently used cache living on the memory of the current process."""
+
+    def __init__(self, max_size):
+        """Sets the max number of entries kept."""
+
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Returns the value stored on key or None."""
+
+        with self._lock:
+            value = self._entries.get(key)
+
+            if value is not None:
+                self._entries.move_to_end(key)
+
+        return value
+
+    def set(self, key, value) -> 'None':
+        """Stores a value dropping the least recently used one if the cache is full."""
+
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+
+            if len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> 'None':
+        """Drops every entry."""
+
+        with self._lock:
+            self._entries.clear()
+
+
+class ObjectVersions:
+    """Per object versions stored on the shared cache."""
+
+    def __init__(self, prefix):
+        """Sets how the versions are named."""
+
+        self.prefix = prefix
+
+    def key(self, pk):
+        """Returns the cache key of the version of an object."""
+
+        return f'{self.prefix}-version:{pk}'
+
+    def get(self, pk):
+        """Returns the current version of an object or None if the cache is unavailable."""
+
+        key = self.key(pk)
+        version = cache.get(key)
+
+        if version is None:
+            cache.add(key, uuid.uuid4().hex, None)
+            version = cache.get(key)
+
+        return version
+
+    def invalidate(self, pk) -> 'None':
+        """Replaces the version of an object."""
+
+        cache.set(self.key(pk), uuid.uuid4().hex, None)
+
+
+class VersionedCache:
+    """Objects cached under a per object version.
+
+    Reading an object costs a single cache get for its version,
+    the object itself is looked up on a per process LRU, then on
+    the shared cache and only then loaded with loader. Invalidating
+    an object just replaces its version.
+
+    Objects are kept pickled and every get returns a new copy, so
+    changes made to it by one request never reach another one.
+    """
+
+    def __init__(self, prefix, loader, timeout, lru_size):
+        """Sets how objects are named, loaded and for how long they are kept."""
+
+        self.prefix = prefix
+        self.loader = loader
+        self.timeout = timeout
+        self.lru = LRUCache(lru_size)
+        self.versions = ObjectVersions(prefix)
+
+    def get_version(self, pk):
+        """Returns the current version of an object or None if the cache is unavailable."""
+
+        return self.versions.get(pk)
+
+    def get(self, pk):
+        """Returns an object from the cache or from loader when it is not cached."""
+
+        version = self.get_version(pk)
+
+        if version is None:
+            return self.loader(pk)
+
+        key = f'{self.prefix}-pickled:{pk}:{version}'
+
+        data = self.lru.get(key)
+
+        if data is None:
+            data = cache.get(key)
+
+            if data is None:
+                data = pickle.dumps(self.loader(pk), pickle.HIGHEST_PROTOCOL)
+                cache.set(key, data, self.timeout)
+
+            self.lru.set(key, data)
+
+        return pickle.loads(data)
+
+    def invalidate(self, pk) -> 'None':
+        """Replaces the version of an object so its cached copies are no longer read."""
+
+        self.versions.invalidate(pk)
+
+
+class ResponseCache:
+    """Rendered responses cached under a per object version.
+
+    Entries are stored per endpoint and object key under the
+    version of the object, so invalidating the object drops
+    the responses of every endpoint at once. Hits and misses
+    are counted per endpoint on the shared cache.
+    """
+
+    def __init__(self, prefix, timeout):
+        """Sets how responses are named and for how long they are kept."""
+
+        self.prefix = prefix
+        self.timeout = timeout
+        self.versions = ObjectVersions(prefix)
+
+    def get_version(self, key):
+        """Returns the current version of the responses of an object or None if the cache is unavailable."""
+
+        return self.versions.get(key)
+
+    def invalidate(self, key) -> 'None':
+        """Replaces the version of the responses of an object so they are no longer read."""
+
+        self.versions.invalidate(key)
+
+    def entry_key(self, endpoint, key, version):
+        """Returns the cache key of a response."""
+
+        return f'{self.prefix}:{endpoint}:{key}:{version}'
+
+    def get_entry(self, endpoint, key, version):
+        """Returns the response of an endpoint stored under version or None, counting the hit or miss."""
+
+        entry = cache.get(self.entry_key(endpoint, key, version))
+
+        self.count(endpoint, 'hits' if entry is not None else 'misses')
+
+        return entry
+
+    def set_entry(self, endpoint, key, version, entry) -> 'None':
+        """Stores the response of an endpoint under the version it was read with."""
+
+        cache.set(self.entry_key(endpoint, key, version), entry, self.timeout)
+
+    def count(self, endpoint, counter) -> 'None':
+        """Increments a counter of an endpoint."""
+
+        key = f'{self.prefix}-{counter}:{endpoint}'
+
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, 0, None)
+            cache.incr(key)
+
+    def get_stats(self, endpoint) -> 'dict':
+        """Returns the hits and misses of an endpoint."""
+
+        counters = cache.get_many([f'{self.prefix}-hits:{endpoint}', f'{self.prefix}-misses:{endpoint}'])
+
+        return {
+            'hits': counters.get(f'{self.prefix}-hits:{endpoint}', 0),
+            'misses': counters.get(f'{self.prefix}-misses:{endpoint}', 0)
+        }
+
+
+def load_user(pk):
+    """Returns the user with the given pk from the database."""
+
+    # The user model can't be imported at the top, this module is
+    # imported by the user model module.
+    from django.contrib.auth import get_user_model
+
+    return get_user_model()._default_manager.get(pk=pk)
+
+
+user_cache = VersionedCache(
+    prefix='user',
+    loader=load_user,
+    timeout=settings.USER_CACHE['TIMEOUT'],
+    lru_size=settings.USER_CACHE['LRU_SIZE']
+)
+
+
+response_cache = ResponseCache(
+    prefix='response',
+    timeout=settings.RESPONSE_CACHE['TIMEOUT']
+)
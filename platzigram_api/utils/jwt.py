@@ -1,11 +1,377 @@
 """Utilities related to the jwt technologies"""
 
+# Django
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.utils.translation import ugettext_lazy as _
+
 # Django REST Framework Simple JWT
 from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import (
+    AuthenticationFailed,
+    InvalidToken,
+    TokenError
+)
+from rest_framework_simplejwt.settings import api_settings
+
+# Models
+from django.contrib.auth import get_user_model
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+# Utilities
+from platzigram_api.utils.bloom import BloomFilter
+from platzigram_api.utils.cache import user_cache
+import threading
+import time
+
+# Claim holding the token version of the user the token was issued to.
+TOKEN_VERSION_CLAIM = 'token_version'
+
+
+def check_token_version(token, user):
+    """Raises TokenError if the token was issued before the user token version changed.
+
+    Tokens issued before token versions existed count as version 0.
+    """
+
+    if token.payload.get(TOKEN_VERSION_CLAIM, 0) != user.token_version:
+        raise TokenError(_('Token has been revoked'))
+
+
+class RevocationIndex:
+    """Per process Bloom filter of the blacklisted jtis.
+
+    The filter is built from the blacklist table and kept up to date
+    with the jtis other processes publish on the cache, each one under
+    its own generation number. The table is only queried when the
+    filter says a jti may be blacklisted, or when the filter can not
+    be trusted: before it is built, while a rebuild is running and
+    while a published jti is missing from the cache.
+
+    Only one process reads the whole table: the filter it builds is
+    published on the cache as a snapshot that the rest load, either
+    from the build_revocation_index command or from the process that
+    takes the build lock when the snapshot is missing or too old.
+    Rebuilds run on a background thread unless background_rebuild is
+    unset, and never hold the lock.
+    """
+
+    GENERATION_KEY = 'jwt-revocation:generation'
+    DELTA_KEY = 'jwt-revocation:delta:{}'
+    SNAPSHOT_KEY = 'jwt-revocation:snapshot'
+    SNAPSHOT_GENERATION_KEY = 'jwt-revocation:snapshot-generation'
+    BUILD_LOCK_KEY = 'jwt-revocation:building'
+
+    # Seconds a missing delta is waited for before rebuilding the filter.
+    GAP_TIMEOUT = 5
+
+    # Seconds a process may take building the snapshot before another one can.
+    BUILD_TIMEOUT = 60 * 10
+
+    def __init__(self, capacity, error_rate, max_deltas, delta_timeout, background_rebuild=True):
+        """Sets the filter size, how published jtis are read and how the filter is rebuilt."""
+
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.max_deltas = max_deltas
+        self.delta_timeout = delta_timeout
+        self.background_rebuild = background_rebuild
+
+        self.bloom = None
+        self.generation = None
+        self.gap = None
+        self.rebuilding = False
+        self._lock = threading.Lock()
+
+    def get_generation(self):
+        """Returns the generation of the last published jti or None if the cache is unavailable."""
+
+        generation = cache.get(self.GENERATION_KEY)
+
+        if generation is None:
+            cache.add(self.GENERATION_KEY, 0, None)
+            generation = cache.get(self.GENERATION_KEY)
+
+        return generation
+
+    def build(self) -> 'None':
+        """Builds a new filter from the blacklist table, publishes it as the snapshot and swaps it in.
+
+        The generation is read before the table and the jtis published
+        up to it that are still on the cache are added too, so jtis
+        blacklisted while the table is read are not lost. Later ones
+        are replayed on the next sync.
+        """
+
+        generation = self.get_generation()
+        if generation is None:
+            return
+
+        bloom = BloomFilter(self.capacity, self.error_rate)
+
+        jtis = BlacklistedToken.objects.values_list('token__jti', flat=True).iterator(chunk_size=10000)
+        for jti in jtis:
+            bloom.add(jti)
+
+        keys = [
+            self.DELTA_KEY.format(number)
+            for number in range(max(generation - self.max_deltas, 0) + 1, generation + 1)
+        ]
+        for jti in cache.get_many(keys).values():
+            bloom.add(jti)
+
+        cache.set(self.SNAPSHOT_KEY, (generation, bytes(bloom.bits)), None)
+        cache.set(self.SNAPSHOT_GENERATION_KEY, generation, None)
+
+        with self._lock:
+            self.bloom = bloom
+            self.generation = generation
+            self.gap = None
+
+    def rebuild(self, min_generation=0) -> 'None':
+        """Swaps in the published snapshot, building it first if needed.
+
+        The snapshot is loaded if it holds the jtis up to min_generation
+        and the ones after it can still be replayed from the cache.
+        Otherwise the process that takes the build lock builds a new
+        one, and the rest keep their filter until it is published.
+        """
+
+        generation = self.get_generation()
+        if generation is None:
+            return
+
+        def is_loadable(snapshot_generation):
+            return min_generation <= snapshot_generation and 0 <= generation - snapshot_generation <= self.max_deltas
+
+        # The generation is read on its own first so old snapshots are not fetched.
+        snapshot_generation = cache.get(self.SNAPSHOT_GENERATION_KEY)
+        snapshot = None
+
+        if snapshot_generation is not None and is_loadable(snapshot_generation):
+            snapshot = cache.get(self.SNAPSHOT_KEY)
+
+        if snapshot is not None and is_loadable(snapshot[0]):
+            try:
+                bloom = BloomFilter(self.capacity, self.error_rate, snapshot[1])
+            except ValueError:
+                pass
+            else:
+                with self._lock:
+                    self.bloom = bloom
+                    self.generation = snapshot[0]
+                    self.gap = None
+
+                return
+
+        if cache.add(self.BUILD_LOCK_KEY, 1, self.BUILD_TIMEOUT):
+            try:
+                self.build()
+            finally:
+                cache.delete(self.BUILD_LOCK_KEY)
+
+    def schedule_rebuild(self, min_generation=0) -> 'None':
+        """Rebuilds the filter on a background thread unless a rebuild is already running."""
+
+        with self._lock:
+            if self.rebuilding:
+                return
+
+            self.rebuilding = True
+
+        if self.background_rebuild:
+            threading.Thread(target=self._rebuild, args=(min_generation,), daemon=True).start()
+        else:
+            self._rebuild(min_generation)
+
+    def _rebuild(self, min_generation) -> 'None':
+        """Runs a scheduled rebuild, closing the connection of its thread when done."""
+
+        try:
+            self.rebuild(min_generation)
+        finally:
+            with self._lock:
+                self.rebuilding = False
+
+            if self.background_rebuild:
+                connection.close()
+
+    def sync(self) -> 'bool':
+        """Adds the jtis published since the last sync to the filter.
+
+        Returns whether the filter can be trusted. It can not if the
+        cache is unavailable, if it is not built yet or is too far
+        behind, in which case a rebuild is scheduled, or if the next
+        published jti is missing from the cache. The jti may be about
+        to be published, so a rebuild is only scheduled once it has
+        been missing for GAP_TIMEOUT seconds.
+        """
+
+        generation = self.get_generation()
+        if generation is None:
+            return False
+
+        with self._lock:
+            stale = self.bloom is None or not 0 <= generation - self.generation <= self.max_deltas
+
+        if stale:
+            self.schedule_rebuild()
+
+        with self._lock:
+            if self.bloom is None or not 0 <= generation - self.generation <= self.max_deltas:
+                return False
+
+            if generation > self.generation:
+                keys = [self.DELTA_KEY.format(number) for number in range(self.generation + 1, generation + 1)]
+                deltas = cache.get_many(keys)
+
+                for key in keys:
+                    if key not in deltas:
+                        break
+
+                    self.bloom.add(deltas[key])
+                    self.generation += 1
+
+            if self.generation == generation:
+                self.gap = None
+                return True
+
+            now = time.monotonic()
+            if self.gap is None or self.gap[0] != self.generation:
+                self.gap = (self.generation, now)
+
+            stale = now - self.gap[1] >= self.GAP_TIMEOUT
+            missing_generation = self.generation + 1
+
+        if stale:
+            self.schedule_rebuild(missing_generation)
+
+        return False
+
+    def publish(self, jti) -> 'None':
+        """Adds a blacklisted jti to the filter of every process."""
+
+        cache.add(self.GENERATION_KEY, 0, None)
+
+        try:
+            generation = cache.incr(self.GENERATION_KEY)
+        except ValueError:
+            return
+
+        cache.set(self.DELTA_KEY.format(generation), jti, self.delta_timeout)
+
+        with self._lock:
+            if self.bloom is not None:
+                self.bloom.add(jti)
+
+    def is_revoked(self, jti) -> 'bool':
+        """Returns if a jti is blacklisted, querying the table on probable hits or an untrusted filter."""
+
+        if self.sync() and jti not in self.bloom:
+            return False
+
+        return BlacklistedToken.objects.filter(token__jti=jti).exists()
+
+
+revocation_index = RevocationIndex(
+    capacity=settings.JWT_REVOCATION_INDEX['CAPACITY'],
+    error_rate=settings.JWT_REVOCATION_INDEX['ERROR_RATE'],
+    max_deltas=settings.JWT_REVOCATION_INDEX['MAX_DELTAS'],
+    delta_timeout=settings.JWT_REVOCATION_INDEX['DELTA_TIMEOUT'],
+    background_rebuild=settings.JWT_REVOCATION_INDEX['BACKGROUND_REBUILD']
+)
+
+
+class RevocableRefreshToken(RefreshToken):
+    """Refresh token whose blacklist check goes through the revocation index.
+
+    It carries the token version of its user and is no longer
+    valid once the version of the user changes.
+    """
+
+    @classmethod
+    def for_user(cls, user):
+        """Returns a token for the user including its token version.
+
+        The outstanding token row keeps the token before the version
+        claim is added, only its jti is used.
+        """
+
+        token = super(RevocableRefreshToken, cls).for_user(user)
+        token[TOKEN_VERSION_CLAIM] = user.token_version
+
+        return token
+
+    def verify(self, *args, **kwargs):
+        """Validates the token and checks its token version."""
+
+        super(RevocableRefreshToken, self).verify(*args, **kwargs)
+
+        try:
+            user = user_cache.get(self.payload[api_settings.USER_ID_CLAIM])
+        except (KeyError, get_user_model().DoesNotExist):
+            raise TokenError(_('Token contained no recognizable user identification'))
+
+        check_token_version(self, user)
+
+    def check_blacklist(self):
+        """Raises TokenError if the token is blacklisted."""
+
+        if revocation_index.is_revoked(self.payload[api_settings.JTI_CLAIM]):
+            raise TokenError(_('Token is blacklisted'))
+
+    def blacklist(self):
+        """Blacklists the token and publishes its jti to the revocation index."""
+
+        blacklisted_token = super(RevocableRefreshToken, self).blacklist()
+        revocation_index.publish(self.payload[api_settings.JTI_CLAIM])
+
+        return blacklisted_token
 
 
 def blacklist_token(token):
-    """Handles blacklisting a token so that it can not be used again"""
+    """Handles blacklisting a token so that it can not be used again
+
+    Accepts the encoded token or an already parsed one, which is
+    not decoded and verified again.
+    """
+
+    if not isinstance(token, RevocableRefreshToken):
+        token = RevocableRefreshToken(token)
+
+    token.blacklist()
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWT authentication that reads the user from the cache.
+
+    The token is validated as usual but the user is taken from the
+    versioned user cache, so the database is only queried when the
+    user is not cached or changed since it was cached. Tokens issued
+    before the token version of the user changed are rejected.
+    """
+
+    def get_user(self, validated_token):
+        """Returns the user of the token from the user cache."""
+
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_('Token contained no recognizable user identification'))
+
+        try:
+            user = user_cache.get(user_id)
+        except get_user_model().DoesNotExist:
+            raise AuthenticationFailed(_('User not found'), code='user_not_found')
+
+        if not user.is_active:
+            raise AuthenticationFailed(_('User is inactive'), code='user_inactive')
+
+        try:
+            check_token_version(validated_token, user)
+        except TokenError as e:
+            raise AuthenticationFailed(e.args[0], code='token_revoked')
 
-    refresh_token = RefreshToken(token)
-    refresh_token.blacklist()
+        return user
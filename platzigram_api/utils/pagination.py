@@ -0,0 +1,21 @@
+"""Utils pagination.
+
+Pagination classes shared by the viewsets of platzigram api.
+"""
+
+# Django REST Framework
+from rest_framework.pagination import CursorPagination
+
+
+class CreatedCursorPagination(CursorPagination):
+    """Keyset pagination over the created field of the models.
+
+    Pages are fetched with a WHERE created < cursor clause instead
+    of an OFFSET, so deep pages cost the same as the first one when
+    created is indexed.
+    """
+
+    ordering = '-created'
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
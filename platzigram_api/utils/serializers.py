@@ -0,0 +1,124 @@
+"""Utilities related to the serializers.
+
+Read only fast path for serializers whose output is a flat mapping
+of model attributes: the field list of the serializer is turned
+once into a plain function, skipping the generic field machinery
+of Django REST Framework on every object.
+"""
+
+# Django
+from django.core.files.storage import default_storage
+
+# Django REST Framework
+from rest_framework import (
+    relations,
+    serializers
+)
+
+# Utilities
+import functools
+
+
+def file_url(value, request=None):
+    """Returns the url of a file or of a stored file name like FileField does."""
+
+    if not value:
+        return None
+
+    url = value.url if hasattr(value, 'url') else default_storage.url(value)
+
+    if request is not None:
+        return request.build_absolute_uri(url)
+
+    return url
+
+
+class SparseFieldsMixin:
+    """Serializer mixin limiting the fields to the ones on the fields key of the context.
+
+    Nested serializers share the context of its root, so the
+    fields requested to a list reach the serializer of its items.
+    """
+
+    def get_fields(self):
+        """Returns the fields of the serializer that were requested."""
+
+        fields = super(SparseFieldsMixin, self).get_fields()
+        requested_fields = self.context.get('fields')
+
+        if requested_fields is not None:
+            for field_name in list(fields):
+                if field_name not in requested_fields:
+                    fields.pop(field_name)
+
+        return fields
+
+
+def compile_read_serializer(serializer_class, fields=None, from_values=False):
+    """Returns a function representing objects like the given serializer does.
+
+    The function takes a model instance, or a values() dict whose
+    keys are the source paths joined by __ if from_values is set,
+    and an optional request used to build absolute file urls.
+    Only the readable fields are represented, limited to fields if
+    given. Functions are compiled once per arguments.
+
+    The function exposes the represented field_names and the
+    source_paths to read, usable with only() and values().
+    """
+
+    return _compile_read_serializer(
+        serializer_class,
+        None if fields is None else frozenset(fields),
+        from_values
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _compile_read_serializer(serializer_class, fields, from_values):
+    """Generates the source of the function of compile_read_serializer and compiles it."""
+
+    if serializer_class.to_representation is not serializers.Serializer.to_representation:
+        raise TypeError(f'{serializer_class.__name__} overrides to_representation and can not be compiled.')
+
+    readable_fields = [
+        field for field in serializer_class()._readable_fields
+        if fields is None or field.field_name in fields
+    ]
+
+    namespace = {'file_url': file_url}
+    lines = ['def represent(instance, request=None):']
+    items = []
+
+    for index, field in enumerate(readable_fields):
+        if field.source == '*' or isinstance(
+            field,
+            (serializers.BaseSerializer, relations.RelatedField, relations.ManyRelatedField)
+        ):
+            raise TypeError(f'Field {field.field_name} of {serializer_class.__name__} can not be compiled.')
+
+        value = f'value_{index}'
+
+        if from_values:
+            lines.append(f"    {value} = instance[{'__'.join(field.source_attrs)!r}]")
+        else:
+            lines.append(f"    {value} = instance.{'.'.join(field.source_attrs)}")
+
+        # Model values of these fields are already what the field would return.
+        if isinstance(field, serializers.FileField):
+            items.append(f'{field.field_name!r}: file_url({value}, request)')
+        elif isinstance(field, (serializers.CharField, serializers.IntegerField, serializers.BooleanField)):
+            items.append(f'{field.field_name!r}: {value}')
+        else:
+            namespace[f'to_representation_{index}'] = field.to_representation
+            items.append(f'{field.field_name!r}: None if {value} is None else to_representation_{index}({value})')
+
+    lines.append('    return {' + ', '.join(items) + '}')
+
+    exec(compile('\n'.join(lines), f'<compiled {serializer_class.__name__}>', 'exec'), namespace)
+
+    represent = namespace['represent']
+    represent.field_names = [field.field_name for field in readable_fields]
+    represent.source_paths = ['__'.join(field.source_attrs) for field in readable_fields]
+
+    return represent